@@ -1,6 +1,8 @@
 import sqlite3
 from flask import (
+    Blueprint,
     Flask,
+    current_app,
     render_template,
     request,
     redirect,
@@ -9,122 +11,1521 @@ from flask import (
     flash,
     abort,
     jsonify,
+    stream_template,
+    get_flashed_messages,
+    Response,
+    has_request_context,
+    session,
+    stream_with_context,
 )
 import click
-from datetime import datetime
+from markupsafe import Markup
+from datetime import datetime, timedelta, timezone, tzinfo
+import base64
+import functools
+import hashlib
+import hmac
+import io
+import json
 import os
-from dotenv import load_dotenv
-from typing import Optional, Any, Union
-import pytz
-from pytz import timezone
+import re
+import secrets
+import tempfile
+import threading
+import time
+from typing import Optional, Any, Callable, Union, Iterable, Iterator, Sequence
+from werkzeug.security import safe_join
+from archive import archive_jobs, maintain
+from caching import LRUCache
+from compression import choose_encoding, compress, is_compressible
+from db import get_pool
+from metrics import Metrics
+from read_model import ReadModel
+from repository import JobRepository
+from write_queue import Operation, WriteQueueFull, submit_write
+from jobs_io import (
+    JOB_STATUSES,
+    IMPORT_FORMATS,
+    EXPORT_FORMATS,
+    EXPORT_COLUMNS,
+    EXPORT_MIMETYPES,
+    import_jobs,
+    read_records,
+    write_records,
+)
+
+# Routes, hooks and CLI commands are recorded on the blueprint at import time
+# but only compiled when create_app registers it, so importing this module is
+# cheap and every app gets its own configuration, pools, metrics and caches.
+bp = Blueprint("jobs", __name__, cli_group=None)
+
+SORTABLE_COLUMNS = ["id", "company", "position", "status", "last_modified"]
+LIST_COLUMNS = ["id", "company", "position", "status", "last_modified"]
+SEARCH_RANK = "rank"
+# What the unicode61 tokenizer keeps of a search: runs of letters and digits.
+FTS_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+# Percentiles of time spent in a stage reported by /analytics.
+STAGE_PERCENTILES = [50, 90, 95]
+TENANT_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+# Endpoints that never touch a tenant's jobs and so need no tenant.
+TENANTLESS_ENDPOINTS = {"static", "jobs.export_metrics", "jobs.login", "jobs.logout"}
+# How often a long-polling /changes request looks for new changes.
+CHANGES_POLL_INTERVAL = 0.25
+
+
+def load_config() -> dict[str, Any]:
+    """Read the app configuration from the environment."""
+    return {
+        "SECRET_KEY": os.getenv("SECRET_KEY"),
+        "DATABASE": "database.db",
+        "APP_TIMEZONE": os.getenv("FLASK_APP_TIMEZONE", "UTC"),
+        "DB_POOL_SIZE": int(os.getenv("DB_POOL_SIZE", "5")),
+        "DB_BUSY_TIMEOUT": int(os.getenv("DB_BUSY_TIMEOUT", "5000")),
+        "DB_CACHE_SIZE": int(os.getenv("DB_CACHE_SIZE", "-16000")),
+        "DB_MMAP_SIZE": int(os.getenv("DB_MMAP_SIZE", str(64 * 1024 * 1024))),
+        "PAGE_SIZE": int(os.getenv("PAGE_SIZE", "50")),
+        "MAX_PAGE_SIZE": int(os.getenv("MAX_PAGE_SIZE", "500")),
+        "IMPORT_BATCH_SIZE": int(os.getenv("IMPORT_BATCH_SIZE", "5000")),
+        "MAX_BATCH_UPDATES": int(os.getenv("MAX_BATCH_UPDATES", "1000")),
+        "STREAM_INDEX": os.getenv("STREAM_INDEX", "0") == "1",
+        "STREAM_CHUNK_SIZE": int(os.getenv("STREAM_CHUNK_SIZE", "16384")),
+        "SLOW_QUERY_MS": float(os.getenv("SLOW_QUERY_MS", "100")),
+        "INDEX_CACHE_SIZE": int(os.getenv("INDEX_CACHE_SIZE", "128")),
+        "INDEX_CACHE_BYTES": int(os.getenv("INDEX_CACHE_BYTES", str(16 * 1024 * 1024))),
+        "ROW_CACHE_SIZE": int(os.getenv("ROW_CACHE_SIZE", "10000")),
+        "FORMAT_CACHE_SIZE": int(os.getenv("FORMAT_CACHE_SIZE", "4096")),
+        "CHANGES_MAX_WAIT": float(os.getenv("CHANGES_MAX_WAIT", "25")),
+        "TENANT_DB_DIR": os.getenv("TENANT_DB_DIR", ""),
+        "DB_MAX_POOLS": int(os.getenv("DB_MAX_POOLS", "64")),
+        # The session names the tenant in multi-tenant mode; Lax keeps other
+        # sites from posting to it with the user's cookie.
+        "SESSION_COOKIE_SAMESITE": os.getenv("SESSION_COOKIE_SAMESITE", "Lax"),
+        "READ_MODEL": os.getenv("READ_MODEL", "0") == "1",
+        "WRITE_QUEUE": os.getenv("WRITE_QUEUE", "0") == "1",
+        "WRITE_QUEUE_SIZE": int(os.getenv("WRITE_QUEUE_SIZE", "1000")),
+        "WRITE_BATCH_SIZE": int(os.getenv("WRITE_BATCH_SIZE", "100")),
+        "WRITE_BATCH_DELAY_MS": float(os.getenv("WRITE_BATCH_DELAY_MS", "2")),
+        "WRITE_RETRY_AFTER": int(os.getenv("WRITE_RETRY_AFTER", "1")),
+        "COMPRESS_LEVEL": int(os.getenv("COMPRESS_LEVEL", "3")),
+        "COMPRESS_MIN_SIZE": int(os.getenv("COMPRESS_MIN_SIZE", "1024")),
+        "STATIC_MAX_AGE": int(os.getenv("STATIC_MAX_AGE", str(365 * 24 * 3600))),
+    }
+
+
+def create_app(config: Optional[dict[str, Any]] = None) -> Flask:
+    """Create and configure an instance of the app.
+
+    Settings come from the environment and ``.env``; ``config`` overrides them.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    app = Flask(__name__)
+    app.config.from_mapping(load_config())
+    if config:
+        app.config.update(config)
+    if not app.config["SECRET_KEY"]:
+        raise RuntimeError("SECRET_KEY not set in .env file")
+
+    # Read from app.config, after .env is loaded, rather than at import.
+    set_format_cache_size(app.config["FORMAT_CACHE_SIZE"])
+    app.extensions["metrics"] = Metrics(slow_query_ms=app.config["SLOW_QUERY_MS"])
+    # Rendered index pages, keyed by database and query parameters and tagged
+    # with the database change token they were rendered at. Pages run to
+    # MAX_PAGE_SIZE rows, so their total length is bounded as well as their
+    # number; the markup is nearly all ASCII, so characters stand in for bytes.
+    app.extensions["index_cache"] = LRUCache(
+        app.config["INDEX_CACHE_SIZE"],
+        maxbytes=app.config["INDEX_CACHE_BYTES"],
+        sizeof=lambda entry: len(entry[1]),
+    )
+    # Rendered index rows, keyed by everything the row markup depends on.
+    app.extensions["row_cache"] = LRUCache(app.config["ROW_CACHE_SIZE"])
+    # In-memory read models, one per database file, built on first use.
+    app.extensions["read_models"] = {}
+    # Content hashes of static files, keyed by filename and checked against
+    # the file's mtime and size, and their compressed bodies per encoding.
+    app.extensions["static_versions"] = {}
+    app.extensions["static_compressed"] = LRUCache(64)
+    app.teardown_appcontext(close_db)
+    app.register_blueprint(bp)
+    return app
+
+
+_default_app: Optional[Flask] = None
+
+
+def __getattr__(name: str) -> Any:
+    """Create the module-level ``app`` on first access.
 
-app = Flask(__name__)
+    Keeps ``flask --app app``, ``app:app`` for WSGI servers and
+    ``from app import app`` working without building an app at import time.
+    """
+    global _default_app
+    if name == "app":
+        if _default_app is None:
+            _default_app = create_app()
+        return _default_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-load_dotenv()
-app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
-if not app.config["SECRET_KEY"]:
-    raise RuntimeError("SECRET_KEY not set in .env file")
 
-app.config["DATABASE"] = "database.db"
+@functools.lru_cache(maxsize=None)
+def get_timezone(name: str) -> Optional[tzinfo]:
+    """Resolve a timezone name once, returning None if it is unknown."""
+    # pytz loads its zone index on import, so it is only imported once a
+    # timestamp actually needs converting.
+    import pytz
 
-APP_TIMEZONE = os.getenv("FLASK_APP_TIMEZONE", "UTC")
+    try:
+        return pytz.timezone(name)
+    except pytz.exceptions.UnknownTimeZoneError:
+        return None
 
 
-@app.template_filter("format_datetime")
+def _format_timestamp(timestamp: str, tz_name: str) -> str:
+    """Format a UTC database timestamp in the named timezone."""
+    utc_dt = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
+    local_tz = get_timezone(tz_name)
+    if local_tz is None:
+        return utc_dt.strftime(f"%Y/%m/%d %H:%M:%S UTC")
+    return utc_dt.astimezone(local_tz).strftime(f"%Y/%m/%d %H:%M:%S %Z%z")
+
+
+# Shared by every app in the process; create_app sizes it from FORMAT_CACHE_SIZE.
+_format_cached = functools.lru_cache(maxsize=4096)(_format_timestamp)
+
+
+def set_format_cache_size(size: int) -> None:
+    """Resize the timestamp formatting cache, emptying it if the size changes."""
+    global _format_cached
+    if _format_cached.cache_info().maxsize != size:
+        _format_cached = functools.lru_cache(maxsize=size)(_format_timestamp)
+
+
+def clear_format_cache() -> None:
+    """Forget every memoised formatted timestamp."""
+    _format_cached.cache_clear()
+
+
+def format_timestamp(timestamp: str, tz_name: str) -> str:
+    """Format a UTC database timestamp in the named timezone (memoised)."""
+    return _format_cached(timestamp, tz_name)
+
+
+@bp.app_template_filter("format_datetime")
 def format_datetime_filter(timestamp: Optional[str]) -> str:
     """Format UTC datetime to a configurable local timezone."""
     if timestamp:
-        utc_dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-        utc_dt = pytz.utc.localize(utc_dt)
-        try:
-            local_tz = timezone(APP_TIMEZONE)
-            local_dt = utc_dt.astimezone(local_tz)
-            return local_dt.strftime(f"%Y/%m/%d %H:%M:%S %Z%z")
-        except pytz.exceptions.UnknownTimeZoneError:
-            return utc_dt.strftime(f"%Y/%m/%d %H:%M:%S UTC")
+        return _format_cached(timestamp, current_app.config["APP_TIMEZONE"])
     return ""
 
 
-def get_db() -> sqlite3.Connection:
-    """Connect to the database."""
-    if not app.config["DATABASE"]:
+def is_archived(job: Any) -> bool:
+    """Return whether a listed job comes from jobs_archive.
+
+    Only listings with ``include_archived`` carry the ``archived`` column.
+    """
+    return "archived" in job.keys() and bool(job["archived"])
+
+
+def job_row_key(app: Flask, job: Any) -> tuple:
+    """Return the row cache key of a job.
+
+    The key is every column the row shows rather than just ``(id,
+    last_modified)``: last_modified only has one-second resolution, so two
+    edits within a second would share a key, and imports or direct SQL can
+    change a row without touching it. The timezone and script root, which
+    the formatted time and links depend on, complete the key.
+    """
+    return (
+        job["id"],
+        job["company"],
+        job["position"],
+        job["status"],
+        job["last_modified"],
+        is_archived(job),
+        app.config["APP_TIMEZONE"],
+        request.script_root if has_request_context() else "",
+    )
+
+
+@bp.app_template_global("job_row")
+def render_job_row(job: Any, formatted_times: Optional[dict[str, str]] = None) -> Markup:
+    """Render one index row, reusing the markup of an unchanged row."""
+    app = current_app._get_current_object()
+    key = job_row_key(app, job)
+    cache = app.extensions["row_cache"]
+    html = cache.get(key)
+    app.extensions["metrics"].observe_cache("row", html is not None)
+    if html is None:
+        template = app.jinja_env.get_template("_job_row.html")
+        html = Markup(
+            template.render(job=job, archived=is_archived(job), formatted_times=formatted_times)
+        )
+        cache.set(key, html)
+    return html
+
+
+def format_datetimes(
+    timestamps: Iterable[Optional[str]], tz_name: Optional[str] = None
+) -> dict[str, str]:
+    """Format a whole column of timestamps at once, keyed by the raw value.
+
+    Offsets are resolved once per UTC day: if a day starts and ends with the
+    same offset it is applied to every timestamp that day with plain datetime
+    arithmetic, and only days containing a DST change fall back to a full pytz
+    conversion per timestamp.
+    """
+    if tz_name is None:
+        tz_name = current_app.config["APP_TIMEZONE"]
+    formatted: dict[str, str] = {}
+    local_tz = get_timezone(tz_name)
+    offsets: dict[str, Optional[tuple[timedelta, str]]] = {}
+    for timestamp in timestamps:
+        if not timestamp or timestamp in formatted:
+            continue
+        day = timestamp[:10]
+        if day not in offsets:
+            offsets[day] = _day_offset(day, local_tz)
+        offset = offsets[day]
+        if offset is None:
+            formatted[timestamp] = format_timestamp(timestamp, tz_name)
+        else:
+            local_dt = datetime.fromisoformat(timestamp) + offset[0]
+            formatted[timestamp] = local_dt.strftime("%Y/%m/%d %H:%M:%S") + offset[1]
+    return formatted
+
+
+def _day_offset(day: str, local_tz: Optional[tzinfo]) -> Optional[tuple[timedelta, str]]:
+    """Return the (offset, suffix) in force for a whole UTC day, or None if it varies."""
+    if local_tz is None:
+        return None
+    start = datetime.fromisoformat(day).replace(tzinfo=timezone.utc)
+    first = start.astimezone(local_tz)
+    last = (start + timedelta(days=1, seconds=-1)).astimezone(local_tz)
+    if first.utcoffset() != last.utcoffset() or first.tzname() != last.tzname():
+        return None
+    return first.utcoffset(), first.strftime(" %Z%z")
+
+
+def create_tenant_database(path: str) -> None:
+    """Create a tenant's database from schema.sql unless it already exists.
+
+    The schema is applied to a temporary file that is then hard-linked into
+    place, so a concurrent provisioning (from any process) cannot clobber a
+    database another one already created and started writing to.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        db = sqlite3.connect(tmp)
+        with current_app.open_resource("schema.sql") as f:
+            db.executescript(f.read().decode("utf8"))
+        db.commit()
+        db.close()
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+    finally:
+        os.unlink(tmp)
+
+
+def tenant_path(tenant: str, suffix: str = ".db") -> str:
+    """Return the path of a tenant's database, or of its key file with ``suffix=".key"``."""
+    return os.path.join(current_app.config["TENANT_DB_DIR"], tenant + suffix)
+
+
+def hash_tenant_key(key: str) -> str:
+    """Hash an access key for storage; keys are random, so a fast hash is enough."""
+    return hashlib.sha256(key.encode("utf8")).hexdigest()
+
+
+def read_tenant_key_hash(tenant: str) -> Optional[str]:
+    """Return the stored hash of a tenant's access key, or None if it has none."""
+    try:
+        with open(tenant_path(tenant, ".key"), encoding="utf8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def provision_tenant(tenant: str, rotate_key: bool = False) -> str:
+    """Create a tenant's database and access key, returning the new key.
+
+    Only the key's hash is stored, in ``<TENANT_DB_DIR>/<tenant>.key``. With
+    ``rotate_key`` an existing tenant gets a new key, which also signs out
+    every session opened with the old one.
+    """
+    os.makedirs(current_app.config["TENANT_DB_DIR"], exist_ok=True)
+    path = tenant_path(tenant)
+    if os.path.exists(path) and not rotate_key:
+        raise click.ClickException(f"Tenant {tenant} already exists; use --rotate-key.")
+    if not os.path.exists(path) and rotate_key:
+        raise click.ClickException(f"Tenant {tenant} does not exist.")
+    if not rotate_key:
+        create_tenant_database(path)
+    key = secrets.token_urlsafe(24)
+    key_path = tenant_path(tenant, ".key")
+    tmp = key_path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf8") as f:
+        f.write(hash_tenant_key(key) + "\n")
+    os.replace(tmp, key_path)
+    return key
+
+
+def get_database() -> str:
+    """Return the database file for the current request.
+
+    That is the tenant's own file in multi-tenant mode and ``DATABASE``
+    otherwise, including for CLI commands.
+    """
+    return g.get("database") or current_app.config["DATABASE"]
+
+
+def get_db(readonly: Optional[bool] = None) -> sqlite3.Connection:
+    """Connect to the database.
+
+    Connections come from a per-process pool. GET and HEAD requests get a
+    read-only connection unless ``readonly`` says otherwise.
+    """
+    database = get_database()
+    if not database:
         raise RuntimeError("Database not configured")
-    if not hasattr(app, "config"):
+    if not hasattr(current_app, "config"):
         raise RuntimeError("App configuration not found")
     if "db" not in g:
-        g.db = sqlite3.connect(app.config["DATABASE"])
-        g.db.row_factory = sqlite3.Row
+        if readonly is None:
+            readonly = has_request_context() and request.method in ("GET", "HEAD")
+        pool = get_pool(current_app, database, readonly)
+        g.db = pool.acquire()
+        g.db_pool = pool
     return g.db
 
 
-@app.teardown_appcontext
 def close_db(e: Optional[Any] = None) -> None:
-    """Close the database connection."""
+    """Return the database connection to its pool."""
     db = g.pop("db", None)
+    pool = g.pop("db_pool", None)
     if db is not None:
-        db.close()
+        pool.release(db)
 
 
-@app.cli.command("init-db")
+@bp.before_app_request
+def start_request_timer() -> None:
+    """Start timing the request and counting its SQL statements."""
+    g.request_start = time.perf_counter()
+    g.query_count = 0
+
+
+@bp.before_app_request
+def resolve_tenant() -> Optional[tuple[Any, int]]:
+    """In multi-tenant mode, point the request at its tenant's database.
+
+    Each tenant's jobs live in ``<TENANT_DB_DIR>/<tenant>.db``, so tenants
+    never wait on each other's write lock. The tenant comes from the signed
+    session opened by ``/login``, which stays valid only while the tenant's
+    key is unchanged. Databases are only created by ``flask create-tenant``.
+    """
+    if not current_app.config["TENANT_DB_DIR"] or request.endpoint in TENANTLESS_ENDPOINTS:
+        return None
+    tenant = session.get("tenant")
+    key_hash = read_tenant_key_hash(tenant) if tenant else None
+    if (
+        key_hash is None
+        or not hmac.compare_digest(key_hash, session.get("tenant_key", ""))
+        or not os.path.exists(tenant_path(tenant))
+    ):
+        session.pop("tenant", None)
+        session.pop("tenant_key", None)
+        if request.method == "GET" and request.accept_mimetypes.accept_html:
+            return redirect(url_for("jobs.login"))
+        return jsonify({"error": "Log in to a tenant first"}), 401
+    g.database = tenant_path(tenant)
+    return None
+
+
+@bp.route("/login", methods=["GET", "POST"])
+def login() -> Any:
+    """Open a session for a tenant, given its access key, in multi-tenant mode.
+
+    Accepts a form or a JSON body with ``tenant`` and ``key``.
+    """
+    if not current_app.config["TENANT_DB_DIR"]:
+        abort(404)
+    if request.method == "GET":
+        return render_template("login.html")
+    data = request.get_json(silent=True) if request.is_json else request.form
+    tenant = str((data or {}).get("tenant", "")).strip()
+    key = str((data or {}).get("key", "")).strip()
+    key_hash = read_tenant_key_hash(tenant) if TENANT_ID_PATTERN.fullmatch(tenant) else None
+    if key_hash is None or not hmac.compare_digest(key_hash, hash_tenant_key(key)):
+        if request.is_json:
+            return jsonify({"error": "Unknown tenant or wrong key"}), 401
+        flash("Unknown tenant or wrong key!")
+        return render_template("login.html"), 401
+    session.clear()
+    session["tenant"] = tenant
+    session["tenant_key"] = key_hash
+    if request.is_json:
+        return jsonify({"tenant": tenant})
+    return redirect(url_for("jobs.index"))
+
+
+@bp.route("/logout", methods=["POST"])
+def logout() -> Any:
+    """Close the tenant session."""
+    session.clear()
+    if request.is_json:
+        return jsonify({"tenant": None})
+    return redirect(url_for("jobs.login"))
+
+
+@bp.cli.command("create-tenant")
+@click.argument("tenant")
+@click.option("--rotate-key", is_flag=True, help="Give an existing tenant a new key.")
+def create_tenant(tenant: str, rotate_key: bool) -> None:
+    """CLI to provision a tenant's database and print its access key."""
+    if not current_app.config["TENANT_DB_DIR"]:
+        raise click.ClickException("TENANT_DB_DIR is not set.")
+    if not TENANT_ID_PATTERN.fullmatch(tenant):
+        raise click.ClickException("Tenant ids are letters, digits, - and _, up to 64.")
+    key = provision_tenant(tenant, rotate_key=rotate_key)
+    click.echo(f"Tenant {tenant} key: {key}")
+
+
+@bp.after_app_request
+def remember_response_status(response: Response) -> Response:
+    """Keep the status code for the request metrics recorded at teardown."""
+    g.response_status = response.status_code
+    return response
+
+
+def static_version(filename: str) -> Optional[str]:
+    """Return a hash of a static file's content, or None if there is no such file.
+
+    The hash is recomputed whenever the file's mtime or size changes, so an
+    edited asset gets a new URL without a restart.
+    """
+    app = current_app._get_current_object()
+    path = safe_join(app.static_folder, filename)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+        cached = app.extensions["static_versions"].get(filename)
+        if cached is None or cached[0] != (stat.st_mtime_ns, stat.st_size):
+            with open(path, "rb") as f:
+                cached = ((stat.st_mtime_ns, stat.st_size), hashlib.sha1(f.read()).hexdigest()[:12])
+            app.extensions["static_versions"][filename] = cached
+    except OSError:
+        return None
+    return cached[1]
+
+
+@bp.app_url_defaults
+def add_static_version(endpoint: str, values: dict[str, Any]) -> None:
+    """Fingerprint static URLs with their content hash, e.g. ``style.css?v=1a2b3c``."""
+    if endpoint == "static" and "v" not in values and "filename" in values:
+        version = static_version(values["filename"])
+        if version is not None:
+            values["v"] = version
+
+
+def compressed_static(filename: str, encoding: str) -> Optional[bytes]:
+    """Return a static file compressed with ``encoding``, compressing each version once."""
+    version = static_version(filename)
+    if version is None:
+        return None
+    cache = current_app.extensions["static_compressed"]
+    key = (filename, version, encoding)
+    body = cache.get(key)
+    if body is None:
+        with open(safe_join(current_app.static_folder, filename), "rb") as f:
+            body = compress(f.read(), encoding, 0, static=True)
+        cache.set(key, body)
+    return body
+
+
+@bp.after_app_request
+def cache_static_files(response: Response) -> Response:
+    """Let browsers keep fingerprinted static files without revalidating them.
+
+    Only a URL whose ``v`` matches the file's current hash is immutable; any
+    other URL keeps the default of revalidating on every use.
+    """
+    if request.endpoint != "static" or response.status_code not in (200, 304):
+        return response
+    version = request.args.get("v")
+    if version and version == static_version(request.view_args["filename"]):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config["STATIC_MAX_AGE"]
+        response.cache_control.immutable = True
+    return response
+
+
+@bp.after_app_request
+def compress_response(response: Response) -> Response:
+    """Compress HTML, JSON and CSS responses for clients that accept gzip or brotli.
+
+    Streamed responses are sent as they are, since buffering them to compress
+    would hold back the first byte; static files are compressed once per
+    version. A compressed response's ETag is made weak, as its bytes differ
+    from the identity response's.
+    """
+    level = current_app.config["COMPRESS_LEVEL"]
+    if (
+        level <= 0
+        or response.status_code != 200
+        or not is_compressible(response.mimetype)
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    if (response.content_length or 0) < current_app.config["COMPRESS_MIN_SIZE"]:
+        # Streamed bodies have no length and are skipped here too.
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    if request.endpoint == "static" and response.direct_passthrough:
+        body = compressed_static(request.view_args["filename"], encoding)
+        if body is None:
+            return response
+        if hasattr(response.response, "close"):
+            response.response.close()
+        response.direct_passthrough = False
+    elif response.is_streamed:
+        return response
+    else:
+        body = compress(response.get_data(), encoding, level)
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+@bp.teardown_app_request
+def observe_request(e: Optional[BaseException] = None) -> None:
+    """Record the request's duration and statement count.
+
+    Teardown runs after a streamed body has been sent, so streamed responses
+    are timed in full.
+    """
+    start = g.pop("request_start", None)
+    if start is None:
+        return
+    current_app.extensions["metrics"].observe_request(
+        request.endpoint or "none",
+        request.method,
+        g.pop("response_status", 500),
+        time.perf_counter() - start,
+        g.pop("query_count", 0),
+    )
+
+
+@bp.cli.command("init-db")
 def init_db() -> None:
     """CLI to initialise the database based upon /schema.sql."""
-    db = get_db()
-    with app.open_resource("schema.sql") as f:
+    db = get_db(readonly=False)
+    with current_app.open_resource("schema.sql") as f:
         db.executescript(f.read().decode("utf8"))
     db.commit()
+    if db.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        # A file already in WAL mode ignores the schema's auto_vacuum pragma
+        # until it is vacuumed, which is instant while it is empty.
+        db.execute("VACUUM")
+    current_app.extensions["index_cache"].clear()
     click.echo("Initialised the database.")
 
 
-def get_jobs(
-    status: Optional[str] = None, sort_by: str = "id", order: str = "asc"
-) -> list[sqlite3.Row]:
-    """Fetch job applications with optional filtering and sorting."""
+@bp.cli.command("rebuild-status-counts")
+def rebuild_status_counts() -> None:
+    """CLI to check the status counters against jobs and rebuild them from scratch."""
+    db = get_db(readonly=False)
+    stored = {
+        row["status"]: row["count"]
+        for row in db.execute("SELECT status, count FROM job_status_counts")
+    }
+    actual = {
+        row["status"]: row["count"]
+        for row in db.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")
+    }
+    drifted = False
+    for status in JOB_STATUSES:
+        if stored.get(status, 0) != actual.get(status, 0):
+            drifted = True
+            click.echo(
+                f"{status}: stored {stored.get(status, 0)}, actual {actual.get(status, 0)}"
+            )
+    with db:
+        db.execute("DELETE FROM job_status_counts")
+        db.executemany(
+            "INSERT INTO job_status_counts (status, count) VALUES (?, ?)",
+            [(status, actual.get(status, 0)) for status in JOB_STATUSES],
+        )
+    click.echo("Rebuilt status counts." if drifted else "Status counts were consistent.")
+
+
+@bp.cli.command("rebuild-analytics")
+def rebuild_analytics() -> None:
+    """CLI to rebuild the analytics rollups from the status history."""
+    db = get_db(readonly=False)
+    with db:
+        db.execute("DELETE FROM job_transitions_daily")
+        db.execute("DELETE FROM job_stage_durations")
+        db.execute(
+            "INSERT INTO job_transitions_daily (day, from_status, to_status, count)"
+            " SELECT date(changed_at), COALESCE(from_status, ''), to_status, COUNT(*)"
+            " FROM job_status_history GROUP BY 1, 2, 3"
+        )
+        db.execute(
+            "INSERT INTO job_stage_durations (from_status, to_status, days, count)"
+            " SELECT from_status, to_status, MIN(stage_seconds / 86400, 365), COUNT(*)"
+            " FROM job_status_history WHERE stage_seconds IS NOT NULL GROUP BY 1, 2, 3"
+        )
+    click.echo("Rebuilt analytics rollups.")
+
+
+def iter_query_shapes() -> Iterator[tuple[str, str, list[Any]]]:
+    """Yield (label, sql, params) for every listing query get_jobs can generate.
+
+    Covers each status filter, sort column and order, for the first page and
+    for pages reached through ``after`` and ``before`` cursors.
+    """
+    for status in ["All", JOB_STATUSES[0]]:
+        for sort_by in SORTABLE_COLUMNS:
+            sample = {"id": 1, sort_by: "x" if sort_by != "id" else 1}
+            cursor = encode_cursor(sample, sort_by)
+            for order in ["asc", "desc"]:
+                for page, after, before in [
+                    ("first", None, None),
+                    ("after", cursor, None),
+                    ("before", None, cursor),
+                ]:
+                    query, params, _ = build_jobs_query(
+                        status, sort_by, order, after, before, current_app.config["PAGE_SIZE"] + 1
+                    )
+                    yield f"status={status} sort={sort_by} order={order} page={page}", query, params
+
+
+def check_query_plan(label: str, plan: list[str]) -> Optional[str]:
+    """Return why a listing query plan is unacceptable, or None if it is fine."""
+    if any("USE TEMP B-TREE" in step for step in plan):
+        return "sorts in a temp B-tree"
+    filtered = "status=All" not in label
+    first_page = "page=first" in label
+    for step in plan:
+        # An ordered walk that stops at LIMIT is fine for an unfiltered first
+        # page; anything else must seek through an index.
+        if step.startswith("SCAN") and (filtered or not first_page):
+            return f"scans instead of seeking ({step})"
+    return None
+
+
+@bp.cli.command("explain-queries")
+@click.option("--verbose", is_flag=True, help="Print the plan of every query shape.")
+def explain_queries(verbose: bool) -> None:
+    """CLI to EXPLAIN QUERY PLAN every listing query and fail on scans or temp sorts."""
     db = get_db()
-    query = "SELECT id, company, position, status, last_modified FROM jobs"
-    params = []
+    failures = 0
+    for label, query, params in iter_query_shapes():
+        plan = [row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+        problem = check_query_plan(label, plan)
+        if problem is not None:
+            failures += 1
+            click.echo(f"FAIL {label}: {problem}")
+        elif verbose:
+            click.echo(f"ok   {label}")
+        if verbose or problem is not None:
+            for step in plan:
+                click.echo(f"       {step}")
+    if failures:
+        raise click.ClickException(f"{failures} query shapes need a better index.")
+    click.echo("All listing queries use an index.")
+
+
+@bp.cli.command("import-jobs")
+@click.argument("source", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(IMPORT_FORMATS),
+    default=None,
+    help="Input format, guessed from the file extension if omitted.",
+)
+@click.option("--batch-size", type=int, default=None, help="Rows per transaction.")
+def import_jobs_command(source: io.TextIOBase, fmt: Optional[str], batch_size: Optional[int]) -> None:
+    """CLI to bulk import jobs from a CSV or JSON Lines file ('-' for stdin)."""
+    fmt = fmt or guess_import_format(getattr(source, "name", ""))
+    if fmt is None:
+        raise click.UsageError("Could not guess the input format, pass --format.")
+    result = import_jobs(
+        get_db(readonly=False),
+        read_records(source, fmt),
+        batch_size=batch_size or current_app.config["IMPORT_BATCH_SIZE"],
+    )
+    for error in result["errors"]:
+        click.echo(f"Line {error['line']}: {error['error']}", err=True)
+    click.echo(f"Imported {result['inserted']} jobs, {result['failed']} failed.")
+
+
+@bp.cli.command("export-jobs")
+@click.option(
+    "--format", "fmt", type=click.Choice(EXPORT_FORMATS), default="csv", help="Output format."
+)
+@click.option(
+    "--output", "-o", type=click.File("w", encoding="utf-8"), default="-", help="Output file."
+)
+@click.option("--status", default="All", help="Only export jobs with this status.")
+@click.option("--sort", "sort_by", default="id", help="Column to sort by.")
+@click.option("--order", type=click.Choice(["asc", "desc"]), default="asc")
+@click.option("--q", default="", help="Only export jobs matching this search.")
+@click.option("--include-archived", is_flag=True, help="Export archived jobs too.")
+def export_jobs_command(
+    fmt: str,
+    output: io.TextIOBase,
+    status: str,
+    sort_by: str,
+    order: str,
+    q: str,
+    include_archived: bool,
+) -> None:
+    """CLI to export jobs as CSV or NDJSON ('-' for stdout)."""
+    get_db(readonly=True)
+    rows = iter_jobs(
+        status, sort_by, order, q=q, columns=EXPORT_COLUMNS, include_archived=include_archived
+    )
+    for chunk in buffer_chunks(write_records(rows, fmt), current_app.config["STREAM_CHUNK_SIZE"]):
+        output.write(chunk)
+
+
+@bp.cli.command("archive-jobs")
+@click.option(
+    "--older-than",
+    "older_than",
+    type=click.IntRange(min=0),
+    required=True,
+    help="Archive closed jobs not modified for this many days.",
+)
+@click.option("--batch-size", type=click.IntRange(min=1), default=1000, help="Jobs per transaction.")
+def archive_jobs_command(older_than: int, batch_size: int) -> None:
+    """CLI to move long-closed (Declined or Accepted) jobs into the archive table."""
+    archived = archive_jobs(get_db(readonly=False), older_than, batch_size)
+    click.echo(f"Archived {archived} jobs.")
+
+
+@bp.cli.command("maintain-db")
+@click.option("--vacuum", is_flag=True, help="Run a full VACUUM first (locks the database).")
+def maintain_db(vacuum: bool) -> None:
+    """CLI to ANALYZE, optimize and incrementally vacuum the database."""
+    result = maintain(get_db(readonly=False), vacuum=vacuum)
+    click.echo(f"Freed {result['freed_bytes'] / 2**20:.1f}MiB.")
+    if not result["auto_vacuum"]:
+        click.echo(
+            f"{result['free_pages']} free pages remain: incremental vacuum is off for this"
+            " database, run once with --vacuum to enable it."
+        )
+
+
+def guess_import_format(name: Optional[str], mimetype: Optional[str] = None) -> Optional[str]:
+    """Guess the import format from a file name or content type."""
+    if mimetype in ("text/csv", "application/csv"):
+        return "csv"
+    if mimetype in ("application/x-ndjson", "application/jsonl", "application/x-jsonlines"):
+        return "jsonl"
+    name = (name or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def build_fts_query(q: Optional[str]) -> Optional[str]:
+    """Translate a user search into an FTS5 MATCH expression.
+
+    Double-quoted parts become phrase searches and every other word becomes a
+    prefix search; all terms must match. Each part is reduced to the letters
+    and digits the unicode61 tokenizer indexes, so punctuation and control
+    characters (a NUL ends the MATCH string early) never reach the query
+    syntax. Returns None if nothing is searchable.
+    """
+    if not q:
+        return None
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', q):
+        tokens = " ".join(FTS_TOKEN_PATTERN.findall(phrase or word))
+        if tokens and phrase:
+            terms.append('"' + tokens + '"')
+        elif tokens:
+            # A multi-token word like "data-analyst" is a phrase whose last token is a prefix.
+            terms.append('"' + tokens + '"*')
+    return " ".join(terms) or None
+
+
+def normalise_sort(sort_by: str, searching: bool = False) -> str:
+    """Return a valid sort column, allowing relevance only when searching.
+
+    Searches default to id order like any listing: ranking has to score
+    every match before the first row comes back, so it is only done when
+    asked for with ``sort=rank``.
+    """
+    if sort_by in SORTABLE_COLUMNS or (searching and sort_by == SEARCH_RANK):
+        return sort_by
+    return "id"
+
+
+def encode_cursor(job: sqlite3.Row, sort_by: str) -> str:
+    """Encode the sort key of a row as an opaque pagination cursor."""
+    key = [job["id"]] if sort_by == "id" else [job[sort_by], job["id"]]
+    raw = json.dumps(key, separators=(",", ":")).encode("utf8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort_by: str) -> Optional[list[Any]]:
+    """Decode a pagination cursor, returning None if it is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    expected = 1 if sort_by == "id" else 2
+    if not isinstance(key, list) or len(key) != expected:
+        return None
+    if not isinstance(key[-1], int):
+        return None
+    return key
+
+
+def build_jobs_query(
+    status: Optional[str] = None,
+    sort_by: str = "id",
+    order: str = "asc",
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: Optional[int] = None,
+    q: Optional[str] = None,
+    columns: Sequence[str] = LIST_COLUMNS,
+    include_archived: bool = False,
+) -> tuple[str, list[Any], bool]:
+    """Build the SQL for a filtered, sorted and optionally paged job listing.
+
+    Returns the query, its parameters and whether the rows come back in
+    reverse display order (when seeking backwards from a ``before`` cursor).
+    With ``include_archived`` the listing covers jobs_archive too, and every
+    row gains an ``archived`` flag; archived jobs are not in the search index,
+    so searches never return them.
+    """
+    match = build_fts_query(q)
+    sort_by = normalise_sort(sort_by, match is not None)
+    column_list = ", ".join(columns)
+    source = "jobs"
+    if include_archived:
+        # SQLite pushes the filters down into both halves of the union.
+        source = (
+            f"(SELECT {column_list}, 0 AS archived FROM jobs"
+            f" UNION ALL SELECT {column_list}, 1 AS archived FROM jobs_archive) AS jobs"
+        )
+        column_list += ", archived"
+    select = f"SELECT {column_list} FROM {source}"
+    select_params: list[Any] = []
+    id_column = "id"
+    clauses = []
+    params: list[Any] = []
+
+    if match is not None and sort_by == SEARCH_RANK:
+        # Relevance needs the score of every match, so join the search results.
+        select = (
+            f"SELECT {column_list}, search.rank AS rank"
+            f" FROM {source} JOIN (SELECT rowid, rank FROM jobs_fts WHERE jobs_fts MATCH ?)"
+            " AS search ON search.rowid = jobs.id"
+        )
+        select_params.append(match)
+    elif match is not None and sort_by == "id":
+        # FTS5 returns matches in rowid order and can seek on a rowid bound, so
+        # driving the join from the index reads only one page of matches.
+        # Archived jobs are not indexed, so jobs is joined even with
+        # include_archived.
+        select = (
+            f"SELECT {', '.join(columns)}{', 0 AS archived' if include_archived else ''}"
+            " FROM (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)"
+            " AS search CROSS JOIN jobs ON jobs.id = search.rowid"
+        )
+        select_params.append(match)
+        id_column = "search.rowid"
+    elif match is not None:
+        # Otherwise the matching ids are a plain filter, which lets SQLite walk
+        # jobs in the requested order and stop as soon as the page is full.
+        clauses.append("id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+        params.append(match)
 
     if status and status != "All":
-        query += " WHERE status = ?"
+        clauses.append("status = ?")
         params.append(status)
 
-    if sort_by not in ["id", "company", "position", "status", "last_modified"]:
-        sort_by = "id"
     if order not in ["asc", "desc"]:
         order = "asc"
 
-    query += f" ORDER BY {sort_by} {order}"
-    cur = db.execute(query, params)
-    return cur.fetchall()
+    def where(extra: list[str]) -> str:
+        conditions = clauses + extra
+        return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    backwards = False
+    key = decode_cursor(after, sort_by)
+    if key is None:
+        key = decode_cursor(before, sort_by)
+        backwards = key is not None
+    if key is None:
+        query = select + where([])
+        params = select_params + params
+    else:
+        op = ">" if (order == "asc") != backwards else "<"
+        if sort_by == "id":
+            query = select + where([f"{id_column} {op} ?"])
+            params = select_params + params + key
+        elif sort_by == "status" and status and status != "All":
+            # Every row shares the filtered status, so only the id tiebreaker moves.
+            query = select + where([f"id {op} ?"])
+            params = select_params + params + key[1:]
+        elif match is not None:
+            query = select + where([f"({sort_by}, id) {op} (?, ?)"])
+            params = select_params + params + key
+        else:
+            # SQLite only seeks on the first column of a row-value comparison,
+            # so (col, id) > (?, ?) would rescan every row sharing the cursor's
+            # value. Two index seeks merged by UNION ALL keep deep pages cheap.
+            query = (
+                select
+                + where([f"{sort_by} = ?", f"id {op} ?"])
+                + " UNION ALL "
+                + select
+                + where([f"{sort_by} {op} ?"])
+            )
+            params = select_params + params + key + select_params + params + key[:1]
+
+    direction = order
+    if backwards:
+        direction = "desc" if order == "asc" else "asc"
+    if sort_by == "id":
+        query += f" ORDER BY {id_column} {direction}"
+    else:
+        query += f" ORDER BY {sort_by} {direction}, id {direction}"
+
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return query, params, backwards
+
+
+def get_jobs(
+    status: Optional[str] = None,
+    sort_by: str = "id",
+    order: str = "asc",
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: Optional[int] = None,
+    q: Optional[str] = None,
+    include_archived: bool = False,
+) -> list[sqlite3.Row]:
+    """Fetch job applications with optional filtering, searching, sorting and keyset paging.
+
+    ``after`` and ``before`` are cursors produced by ``encode_cursor``. Rows are
+    located by seeking on ``(sort_by, id)`` rather than with OFFSET, so the cost
+    of a page does not depend on how deep into the listing it is. ``q`` limits
+    the listing to full-text matches on company and position, and
+    ``include_archived`` adds the archived jobs.
+    """
+    model = get_read_model()
+    if model is not None and not include_archived and build_fts_query(q) is None:
+        sort_by = normalise_sort(sort_by)
+        key = decode_cursor(after, sort_by)
+        backwards = key is None and decode_cursor(before, sort_by) is not None
+        if backwards:
+            key = decode_cursor(before, sort_by)
+        jobs = model.page(status, sort_by, order, key, backwards, limit)
+        if jobs is not None:
+            return jobs
+
+    query, params, backwards = build_jobs_query(
+        status, sort_by, order, after, before, limit, q, include_archived=include_archived
+    )
+    jobs = get_db().execute(query, params).fetchall()
+    if backwards:
+        jobs.reverse()
+    return jobs
+
+
+def iter_jobs(
+    status: Optional[str] = None,
+    sort_by: str = "id",
+    order: str = "asc",
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    batch_size: int = 500,
+    q: Optional[str] = None,
+    columns: Sequence[str] = LIST_COLUMNS,
+    include_archived: bool = False,
+) -> Iterator[sqlite3.Row]:
+    """Lazily yield job applications, reading the cursor in batches."""
+    query, params, _ = build_jobs_query(
+        status, sort_by, order, after, None, limit, q, columns, include_archived
+    )
+    cur = get_db().execute(query, params)
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
+
+_read_models_lock = threading.Lock()
+
+
+def get_read_model() -> Optional[ReadModel]:
+    """Return the in-memory read model of the database, if ``READ_MODEL`` is on.
+
+    Tenant databases are always read through SQL, so memory stays bounded
+    however many tenants there are.
+    """
+    if not current_app.config["READ_MODEL"] or g.get("database"):
+        return None
+    database = current_app.config["DATABASE"]
+    models: dict[str, ReadModel] = current_app.extensions["read_models"]
+    model = models.get(database)
+    if model is None:
+        with _read_models_lock:
+            model = models.setdefault(database, ReadModel(database))
+    return model
+
+
+def get_db_version() -> int:
+    """Return the database change token, bumped by triggers on every write to jobs."""
+    return get_db().execute("SELECT version FROM db_version WHERE id = 0").fetchone()[0]
+
+
+def get_changes_seq() -> tuple[int, int]:
+    """Return the change feed's (horizon, latest) sequence numbers.
+
+    Clients that last synced before the horizon may have missed a pruned
+    tombstone and must reload.
+    """
+    return get_db().execute(
+        "SELECT seq, COALESCE((SELECT MAX(seq) FROM job_changes), seq)"
+        " FROM job_changes_horizon WHERE id = 0"
+    ).fetchone()
+
+
+def get_changes(since: int, limit: int) -> list[sqlite3.Row]:
+    """Return up to ``limit`` change log entries after ``since``, joined to their jobs."""
+    return get_db().execute(
+        "SELECT c.seq, c.job_id, c.deleted, j.id, j.company, j.position, j.status, j.last_modified"
+        " FROM job_changes c LEFT JOIN jobs j ON j.id = c.job_id"
+        " WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+        (since, limit),
+    ).fetchall()
+
+
+def get_status_counts() -> dict[str, int]:
+    """Return the number of jobs per status plus an "All" total.
 
+    Reads the trigger-maintained job_status_counts table, so the cost does not
+    depend on the size of jobs.
+    """
+    counts = {status: 0 for status in JOB_STATUSES}
+    for row in get_db().execute("SELECT status, count FROM job_status_counts"):
+        counts[row["status"]] = row["count"]
+    counts["All"] = sum(counts.values())
+    return counts
 
-@app.route("/")
-def index() -> str:
-    """Display all job applications with optional sorting and status filtering."""
+
+def histogram_percentiles(
+    buckets: Sequence[tuple[int, int]], percentiles: Sequence[int]
+) -> dict[int, int]:
+    """Return the bucket holding each percentile of a (value, count) histogram."""
+    buckets = sorted(buckets)
+    total = sum(count for _, count in buckets)
+    result = {}
+    for percentile in percentiles:
+        # Nearest-rank: the smallest value with at least percentile% of samples at or below it.
+        rank = max(1, -(-percentile * total // 100))
+        seen = 0
+        for value, count in buckets:
+            seen += count
+            if seen >= rank:
+                result[percentile] = value
+                break
+    return result
+
+
+def get_page_size(per_page: Optional[int]) -> int:
+    """Clamp a requested page size to the configured limits."""
+    if not per_page or per_page < 1:
+        return current_app.config["PAGE_SIZE"]
+    return min(per_page, current_app.config["MAX_PAGE_SIZE"])
+
+
+def get_jobs_page(
+    status: Optional[str] = None,
+    sort_by: str = "id",
+    order: str = "asc",
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    per_page: Optional[int] = None,
+    q: Optional[str] = None,
+    include_archived: bool = False,
+) -> tuple[list[sqlite3.Row], Optional[str], Optional[str]]:
+    """Fetch one page of jobs along with the cursors for the next and previous pages."""
+    sort_by = normalise_sort(sort_by, build_fts_query(q) is not None)
+    per_page = get_page_size(per_page)
+    if decode_cursor(after, sort_by) is None:
+        after = None
+    if after is not None or decode_cursor(before, sort_by) is None:
+        before = None
+
+    # One extra row tells us whether there is anything beyond this page.
+    jobs = get_jobs(status, sort_by, order, after, before, per_page + 1, q, include_archived)
+    if before is not None:
+        has_prev = len(jobs) > per_page
+        has_next = True
+        jobs = jobs[-per_page:]
+    else:
+        has_prev = after is not None
+        has_next = len(jobs) > per_page
+        jobs = jobs[:per_page]
+
+    next_cursor = encode_cursor(jobs[-1], sort_by) if jobs and has_next else None
+    prev_cursor = encode_cursor(jobs[0], sort_by) if jobs and has_prev else None
+    return jobs, next_cursor, prev_cursor
+
+
+def buffer_chunks(chunks: Iterable[str], size: int) -> Iterator[str]:
+    """Coalesce small template chunks into pieces of roughly ``size`` characters."""
+    buffer: list[str] = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+@bp.route("/")
+def index() -> Union[str, Response]:
+    """Display a page of job applications with optional sorting and status filtering.
+
+    With ``?stream=1`` (or ``STREAM_INDEX`` enabled) every matching job is
+    streamed instead, reading rows lazily while the template renders.
+    Otherwise rendered pages are cached until the database change token moves,
+    which also catches writes made by other processes.
+    """
     status = request.args.get("status", "All")
-    sort_by = request.args.get("sort", "id")
+    q = request.args.get("q", "").strip()
+    sort_by = normalise_sort(request.args.get("sort", ""), build_fts_query(q) is not None)
     order = request.args.get("order", "asc")
+    per_page = request.args.get("per_page", type=int)
+    include_archived = bool(request.args.get("include_archived", type=int))
+    stream = request.args.get("stream", type=int, default=current_app.config["STREAM_INDEX"])
 
-    jobs = get_jobs(status, sort_by, order)
-    return render_template(
-        "index.html", jobs=jobs, current_status=status, sort_by=sort_by, order=order
+    if stream:
+        # Flashes must be consumed before the session cookie goes out with the headers.
+        get_flashed_messages()
+        changes_seq = get_changes_seq()[1]
+        jobs = iter_jobs(
+            status,
+            sort_by,
+            order,
+            after=request.args.get("after"),
+            q=q,
+            include_archived=include_archived,
+        )
+        chunks = stream_template(
+            "index.html",
+            jobs=jobs,
+            changes_seq=changes_seq,
+            current_status=status,
+            status_counts=get_status_counts(),
+            q=q,
+            sort_by=sort_by,
+            order=order,
+            per_page=per_page,
+            include_archived=include_archived,
+            next_cursor=None,
+            prev_cursor=None,
+            formatted_times=None,
+        )
+        return Response(
+            buffer_chunks(chunks, current_app.config["STREAM_CHUNK_SIZE"]), mimetype="text/html"
+        )
+
+    after = request.args.get("after")
+    before = request.args.get("before")
+    # Pages showing a flashed message are one-offs and never cached.
+    cacheable = current_app.config["INDEX_CACHE_SIZE"] > 0 and not session.get("_flashes")
+    if cacheable:
+        # The token is read before the rows, so a concurrent write can only
+        # make a cached page look older than it is, never newer.
+        version = get_db_version()
+        key = (
+            get_database(),
+            status,
+            q,
+            sort_by,
+            order,
+            per_page,
+            include_archived,
+            after,
+            before,
+        )
+        cache = current_app.extensions["index_cache"]
+        cached = cache.get(key)
+        hit = cached is not None and cached[0] == version
+        current_app.extensions["metrics"].observe_cache("index", hit)
+        if hit:
+            return cached[1]
+
+    # Read before the rows, so the page's changes poll can only replay a
+    # change it already shows, never miss one.
+    changes_seq = get_changes_seq()[1]
+    jobs, next_cursor, prev_cursor = get_jobs_page(
+        status,
+        sort_by,
+        order,
+        after=after,
+        before=before,
+        per_page=per_page,
+        q=q,
+        include_archived=include_archived,
+    )
+    page = render_template(
+        "index.html",
+        jobs=jobs,
+        changes_seq=changes_seq,
+        current_status=status,
+        status_counts=get_status_counts(),
+        q=q,
+        sort_by=sort_by,
+        order=order,
+        per_page=per_page,
+        include_archived=include_archived,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        # Only rows missing from the row cache are rendered, so only their
+        # timestamps are formatted in bulk; a row evicted while the page
+        # renders falls back to the format_datetime filter.
+        formatted_times=format_datetimes(
+            job["last_modified"]
+            for job in jobs
+            if job_row_key(current_app, job) not in current_app.extensions["row_cache"]
+        ),
     )
+    if cacheable:
+        cache.set(key, (version, page))
+    return page
 
 
-@app.route("/job/<int:job_id>")
-def get_job(job_id: int) -> Any:
-    """Fetch a single job application by id."""
+@bp.route("/jobs")
+def list_jobs() -> Response:
+    """Return a page of job applications as JSON, honouring conditional GETs.
+
+    The ETag is derived from the database change token, so a poll with a
+    matching If-None-Match is answered with 304 before any rows are queried.
+    """
+    # The token is read before the rows, so a write in between only makes the
+    # ETag older than the data and costs the client one extra full response.
+    digest = hashlib.sha1(request.query_string).hexdigest()[:12]
+    etag = f"jobs-{get_db_version()}-{digest}"
+    # Weak comparison, so the weak ETag of a compressed response still matches.
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        jobs, next_cursor, prev_cursor = get_jobs_page(
+            request.args.get("status", "All"),
+            request.args.get("sort", ""),
+            request.args.get("order", "asc"),
+            after=request.args.get("after"),
+            before=request.args.get("before"),
+            per_page=request.args.get("per_page", type=int),
+            q=request.args.get("q"),
+            include_archived=bool(request.args.get("include_archived", type=int)),
+        )
+        response = jsonify(
+            {
+                "jobs": [dict(job) for job in jobs],
+                "next_cursor": next_cursor,
+                "prev_cursor": prev_cursor,
+            }
+        )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@bp.route("/stats")
+def stats() -> Response:
+    """Return the number of job applications per status."""
+    return jsonify(get_status_counts())
+
+
+@bp.route("/analytics")
+def analytics() -> Union[Response, tuple[Any, int]]:
+    """Return pipeline analytics from the trigger-maintained rollups.
+
+    ``transitions`` counts status changes per day over the last ``days``
+    days (default 30); ``time_in_stage`` gives, for every transition ever
+    made, percentiles of the whole days spent in the earlier status. Neither
+    reads jobs or the status history, so the cost does not grow with them.
+    """
+    days = request.args.get("days", 30, type=int)
+    if not 1 <= days <= 3660:
+        return jsonify({"error": "days must be between 1 and 3660"}), 400
     db = get_db()
-    cur = db.execute(
-        "SELECT id, company, position, status, last_modified FROM jobs WHERE id = ?",
-        (job_id,),
+    since = db.execute("SELECT date('now', ?)", (f"-{days - 1} days",)).fetchone()[0]
+    transitions = [
+        {
+            "day": row["day"],
+            "from": row["from_status"] or None,
+            "to": row["to_status"],
+            "count": row["count"],
+        }
+        for row in db.execute(
+            "SELECT day, from_status, to_status, count FROM job_transitions_daily"
+            " WHERE day >= ? ORDER BY day, from_status, to_status",
+            (since,),
+        )
+    ]
+
+    histograms: dict[tuple[str, str], list[tuple[int, int]]] = {}
+    for row in db.execute("SELECT from_status, to_status, days, count FROM job_stage_durations"):
+        histograms.setdefault((row["from_status"], row["to_status"]), []).append(
+            (row["days"], row["count"])
+        )
+    time_in_stage = []
+    for (from_status, to_status), buckets in sorted(histograms.items()):
+        entry: dict[str, Any] = {
+            "from": from_status,
+            "to": to_status,
+            "count": sum(count for _, count in buckets),
+        }
+        for percentile, value in histogram_percentiles(buckets, STAGE_PERCENTILES).items():
+            entry[f"p{percentile}_days"] = value
+        time_in_stage.append(entry)
+    return jsonify(
+        {"days": days, "since": since, "transitions": transitions, "time_in_stage": time_in_stage}
     )
-    job = cur.fetchone()
+
+
+@bp.route("/metrics")
+def export_metrics() -> Response:
+    """Expose request, query, connection and commit metrics for Prometheus."""
+    metrics = current_app.extensions["metrics"]
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@bp.route("/changes")
+def list_changes() -> Union[Response, tuple[Any, int]]:
+    """Return the jobs changed since ``since``, oldest change first.
+
+    The log keeps one entry per job, so a client that falls behind only
+    fetches each job's latest state. Deleted jobs come back as tombstones.
+    With ``wait`` (seconds, capped by ``CHANGES_MAX_WAIT``) the request is
+    held open until something changes, and with ``html=1`` every live job
+    carries its rendered index row. Without ``since`` only the latest
+    sequence number is returned, to start from. A ``since`` older than the
+    tombstone horizon, or newer than the log (a re-initialised database),
+    is answered with 410 and the client must reload.
+    """
+    since = request.args.get("since", type=int)
+    horizon, latest = get_changes_seq()
+    if since is None:
+        return jsonify({"changes": [], "seq": latest, "more": False})
+    if since < horizon or since > latest:
+        return jsonify({"error": "Change feed reset, reload", "seq": latest}), 410
+
+    limit = get_page_size(request.args.get("limit", type=int))
+    wait = min(request.args.get("wait", 0.0, type=float), current_app.config["CHANGES_MAX_WAIT"])
+    deadline = time.monotonic() + wait
+    changes = get_changes(since, limit + 1)
+    while not changes and time.monotonic() < deadline:
+        # Give the pooled connection back while idle, so waiting clients do
+        # not starve the rest of the app.
+        close_db()
+        time.sleep(CHANGES_POLL_INTERVAL)
+        changes = get_changes(since, limit + 1)
+
+    more = len(changes) > limit
+    changes = changes[:limit]
+    html = request.args.get("html", type=int)
+    live = [change for change in changes if not change["deleted"]]
+    formatted_times = format_datetimes(change["last_modified"] for change in live) if html else None
+    entries = []
+    for change in changes:
+        entry: dict[str, Any] = {
+            "seq": change["seq"],
+            "id": change["job_id"],
+            "deleted": bool(change["deleted"]),
+            "job": None,
+        }
+        if not change["deleted"]:
+            job = {column: change[column] for column in LIST_COLUMNS}
+            entry["job"] = job
+            if html:
+                entry["html"] = str(render_job_row(job, formatted_times))
+        entries.append(entry)
+    seq = changes[-1]["seq"] if changes else since
+    return jsonify({"changes": entries, "seq": seq, "more": more})
+
+
+def get_repository() -> JobRepository:
+    """Return a job repository on the request's database connection."""
+    return JobRepository(get_db())
+
+
+def run_write(operation: Operation) -> Any:
+    """Apply a write to the request's database, committed, and return its result.
+
+    With ``WRITE_QUEUE`` enabled the write is handed to the database's
+    writer thread and committed together with other requests' writes;
+    otherwise it runs and commits on the request's own connection.
+    """
+    if not current_app.config["WRITE_QUEUE"]:
+        result = operation(get_repository())
+        get_db().commit()
+        return result
+    return submit_write(current_app, get_database(), operation)
+
+
+def queued_import_write(apply: Callable[[sqlite3.Connection], Any]) -> Any:
+    """Apply one import batch on the write queue's connection and commit it."""
+    return run_write(lambda repository: apply(repository.db))
+
+
+def fetch_job(job_id: int) -> sqlite3.Row:
+    """Fetch a single job application by id, aborting with 404 if it does not exist."""
+    job = get_repository().get(job_id)
     if job is None:
         abort(404)
     return job
 
 
-@app.route("/add", methods=["GET", "POST"])
+@bp.route("/job/<int:job_id>")
+def get_job(job_id: int) -> Any:
+    """Return a single job application as JSON."""
+    return jsonify(dict(fetch_job(job_id)))
+
+
+@bp.route("/add", methods=["GET", "POST"])
 def add_job() -> Union[str, redirect]:
     """Add a new job application."""
     if request.method == "POST":
@@ -133,81 +1534,163 @@ def add_job() -> Union[str, redirect]:
         status = request.form["status"].strip()
         if not company or not position:
             flash("Company and position are required!")
-        elif status not in ["Applied", "Interviewed", "Accepted", "Declined"]:
+        elif status not in JOB_STATUSES:
             flash("Invalid status!")
         else:
-            db = get_db()
-            db.execute(
-                "INSERT INTO jobs (company, position, status) VALUES (?, ?, ?)",
-                (company, position, status),
-            )
-            db.commit()
+            run_write(lambda jobs: jobs.add(company, position, status))
             flash("Job application added successfully!")
-            return redirect(url_for("index"))
+            return redirect(url_for("jobs.index"))
     return render_template("add.html")
 
 
-@app.route("/<int:id>/edit", methods=["GET", "POST"])
+@bp.route("/jobs/bulk", methods=["POST"])
+def bulk_import_jobs() -> tuple[Any, int]:
+    """Bulk import jobs from a CSV or JSON Lines request body or uploaded file."""
+    upload = request.files.get("file")
+    if upload is not None:
+        stream = upload.stream
+        fmt = guess_import_format(upload.filename, upload.mimetype)
+    else:
+        stream = request.stream
+        fmt = guess_import_format(None, request.mimetype)
+    fmt = request.args.get("format", fmt)
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"error": "Unsupported format, use csv or jsonl"}), 400
+
+    # Bytes that are not UTF-8 end the import with an error for their line;
+    # the batches before it stay committed and are counted in the result.
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="strict", newline="")
+    # Each batch goes through the writer thread like any other write, so an
+    # import never competes with it for the write lock.
+    queued = current_app.config["WRITE_QUEUE"]
+    result = import_jobs(
+        None if queued else get_db(),
+        read_records(text, fmt),
+        batch_size=current_app.config["IMPORT_BATCH_SIZE"],
+        write=queued_import_write if queued else None,
+    )
+    return jsonify(result), 200
+
+
+@bp.route("/jobs/export")
+def export_jobs() -> Union[Response, tuple[Any, int]]:
+    """Stream every matching job as CSV or NDJSON.
+
+    Accepts the same ``status``, ``q``, ``sort``, ``order`` and
+    ``include_archived`` parameters as the index page. Rows are read from the cursor in batches while the
+    response is sent, so memory use does not grow with the number of jobs.
+    """
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": "Unsupported format, use csv or ndjson"}), 400
+    rows = iter_jobs(
+        request.args.get("status", "All"),
+        request.args.get("sort", ""),
+        request.args.get("order", "asc"),
+        q=request.args.get("q", "").strip(),
+        columns=EXPORT_COLUMNS,
+        include_archived=bool(request.args.get("include_archived", type=int)),
+    )
+    chunks = buffer_chunks(write_records(rows, fmt), current_app.config["STREAM_CHUNK_SIZE"])
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="jobs.{fmt}"'
+    return response
+
+
+@bp.route("/<int:id>/edit", methods=["GET", "POST"])
 def edit_job(id: int) -> str:
-    """Edit an exisiting job application."""
-    job = get_job(id)
-    if job is None:
-        abort(404)
+    """Edit an exisiting job application.
 
+    A valid submission is a single UPDATE ... RETURNING; the job is only read
+    separately to render the form.
+    """
     if request.method == "POST":
         company = request.form["company"].strip()
         position = request.form["position"].strip()
         status = request.form["status"].strip()
         if not company or not position:
             flash("Company and position are required!")
-        elif status not in ["Applied", "Interviewed", "Accepted", "Declined"]:
+        elif status not in JOB_STATUSES:
             flash("Invalid status!")
         else:
-            db = get_db()
-            db.execute(
-                "UPDATE jobs SET company = ?, position = ?, status = ?, last_modified = CURRENT_TIMESTAMP WHERE id = ?",
-                (company, position, status, id),
-            )
-            db.commit()
+            if run_write(lambda jobs: jobs.update(id, company, position, status)) is None:
+                abort(404)
             flash("Job application updated successfully!")
-            return redirect(url_for("index"))
-    return render_template("edit.html", job=job)
+            return redirect(url_for("jobs.index"))
+    return render_template("edit.html", job=fetch_job(id))
 
 
-@app.route("/<int:id>/delete", methods=["POST"])
+@bp.route("/<int:id>/delete", methods=["POST"])
 def delete_job(id: int) -> str:
     """Delete a job application."""
-    job = get_job(id)
-    if job is None:
+    if not run_write(lambda jobs: jobs.delete(id)):
         abort(404)
-
-    db = get_db()
-    db.execute("DELETE FROM jobs WHERE id = ?", (id,))
-    db.commit()
     flash("Job application deleted successfully!")
-    return redirect(url_for("index"))
+    return redirect(url_for("jobs.index"))
 
 
-@app.route("/update_status/<int:id>", methods=["POST"])
+@bp.route("/update_status/<int:id>", methods=["POST"])
 def update_status(id: int) -> tuple[Any, int] | Any:
     """Update the status of a job application."""
-    job = get_job(id)
-    if job is None:
-        abort(404)
-
     new_status = request.json.get("status")
-    if new_status not in ["Applied", "Interviewed", "Accepted", "Declined"]:
+    if new_status not in JOB_STATUSES:
         return jsonify({"error": "Invalid status"}), 400
 
-    db = get_db()
-    db.execute(
-        "UPDATE jobs SET status = ?, last_modified = CURRENT_TIMESTAMP WHERE id = ?",
-        (new_status, id),
-    )
-    db.commit()
+    if run_write(lambda jobs: jobs.update_status(id, new_status)) is None:
+        abort(404)
     return jsonify({"message": "Status updated successfully"}), 200
 
 
-@app.errorhandler(404)
+@bp.route("/update_status/batch", methods=["POST"])
+def update_status_batch() -> tuple[Any, int]:
+    """Update the status of many job applications in a single transaction.
+
+    Accepts a JSON list of ``{"id": ..., "status": ...}`` objects (or an object
+    with an ``updates`` list) and returns a result for every entry. Invalid
+    entries and unknown ids are reported without blocking the valid ones.
+    """
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("updates")
+    if not isinstance(payload, list):
+        return jsonify({"error": "Expected a list of updates"}), 400
+    if len(payload) > current_app.config["MAX_BATCH_UPDATES"]:
+        return jsonify({"error": "Too many updates"}), 400
+
+    results: list[dict[str, Any]] = []
+    valid: dict[int, str] = {}
+    for entry in payload:
+        job_id = entry.get("id") if isinstance(entry, dict) else None
+        status = entry.get("status") if isinstance(entry, dict) else None
+        if not isinstance(job_id, int) or isinstance(job_id, bool):
+            results.append({"id": job_id, "error": "Invalid id"})
+        elif status not in JOB_STATUSES:
+            results.append({"id": job_id, "error": "Invalid status"})
+        else:
+            # Later entries for the same id win, as if sent one by one.
+            valid[job_id] = status
+            results.append({"id": job_id, "status": status})
+
+    existing = run_write(lambda jobs: jobs.update_statuses(valid))
+
+    for result in results:
+        if "error" in result:
+            continue
+        if result["id"] in existing:
+            result["message"] = "Status updated successfully"
+        else:
+            del result["status"]
+            result["error"] = "Not found"
+    return jsonify({"results": results, "updated": len(existing)}), 200
+
+
+@bp.app_errorhandler(WriteQueueFull)
+def write_queue_full(error: WriteQueueFull) -> tuple[Any, int, dict[str, str]]:
+    """Ask the client to retry a write the write queue had no room for."""
+    headers = {"Retry-After": str(current_app.config["WRITE_RETRY_AFTER"])}
+    return jsonify({"error": "Too many pending writes, retry later"}), 503, headers
+
+
+@bp.app_errorhandler(404)
 def not_found(error: Any) -> tuple[str, int]:
     return render_template("404.html"), 404
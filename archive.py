@@ -0,0 +1,72 @@
+import json
+import sqlite3
+from typing import Any
+
+# Statuses after which a job no longer changes and may be archived.
+CLOSED_STATUSES: list[str] = ["Declined", "Accepted"]
+ARCHIVE_COLUMNS: list[str] = ["id", "company", "position", "status", "created_at", "last_modified"]
+
+# Served by idx_jobs_status_last_modified: one range seek per closed status.
+SELECT_STALE_SQL = (
+    "SELECT id FROM jobs WHERE status IN (SELECT value FROM json_each(?))"
+    " AND last_modified < datetime('now', ?) LIMIT ?"
+)
+COPY_TO_ARCHIVE_SQL = (
+    f"INSERT INTO jobs_archive ({', '.join(ARCHIVE_COLUMNS)})"
+    f" SELECT {', '.join(ARCHIVE_COLUMNS)} FROM jobs WHERE id IN (SELECT value FROM json_each(?))"
+)
+DELETE_ARCHIVED_SQL = "DELETE FROM jobs WHERE id IN (SELECT value FROM json_each(?))"
+
+
+def archive_jobs(db: sqlite3.Connection, older_than_days: int, batch_size: int = 1000) -> int:
+    """Move closed jobs untouched for ``older_than_days`` days into jobs_archive.
+
+    Each batch is copied and deleted in its own transaction, so other writers
+    get the lock between batches. The delete fires the usual triggers: the
+    rows leave the search index and the status counts, and the change feed
+    reports them as deleted. Returns the number of jobs archived.
+    """
+    statuses = json.dumps(CLOSED_STATUSES)
+    cutoff = f"-{int(older_than_days)} days"
+    archived = 0
+    while True:
+        with db:
+            ids = [
+                row[0] for row in db.execute(SELECT_STALE_SQL, (statuses, cutoff, batch_size))
+            ]
+            if not ids:
+                break
+            batch = json.dumps(ids)
+            db.execute(COPY_TO_ARCHIVE_SQL, (batch,))
+            db.execute(DELETE_ARCHIVED_SQL, (batch,))
+        archived += len(ids)
+    return archived
+
+
+def maintain(db: sqlite3.Connection, vacuum: bool = False) -> dict[str, Any]:
+    """Refresh planner statistics and give free pages back to the filesystem.
+
+    Runs ANALYZE and ``PRAGMA optimize``, then an incremental vacuum and a
+    WAL checkpoint so the file actually shrinks. With ``vacuum`` a full
+    VACUUM runs first, which also switches a database created before
+    auto_vacuum was enabled to incremental mode.
+    """
+    page_size = db.execute("PRAGMA page_size").fetchone()[0]
+    before = db.execute("PRAGMA page_count").fetchone()[0]
+    if vacuum:
+        db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        db.execute("VACUUM")
+    db.execute("ANALYZE")
+    db.execute("PRAGMA optimize")
+    db.commit()
+    # Every freed page is returned as one result row; stepping through them
+    # all is what performs the vacuum.
+    db.execute("PRAGMA incremental_vacuum").fetchall()
+    db.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+    after = db.execute("PRAGMA page_count").fetchone()[0]
+    return {
+        "auto_vacuum": db.execute("PRAGMA auto_vacuum").fetchone()[0] == 2,
+        # ANALYZE can add pages (a new sqlite_stat1, say), so the file may grow.
+        "freed_bytes": max(before - after, 0) * page_size,
+        "free_pages": db.execute("PRAGMA freelist_count").fetchone()[0],
+    }
@@ -0,0 +1 @@
+"""Benchmarks for the Job Tracker app. Run modules with ``python -m benchmarks.<name>``."""
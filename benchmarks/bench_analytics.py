@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import time
+
+from app import app, histogram_percentiles, STAGE_PERCENTILES
+from benchmarks.dataset import STATUSES, create_database
+from db import close_pools
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def add_transitions(path: str, changes: int, seed: int = 0) -> float:
+    """Change the status of random jobs, returning the seconds taken."""
+    rng = random.Random(seed)
+    db = sqlite3.connect(path)
+    rows = db.execute("SELECT MAX(id) FROM jobs").fetchone()[0]
+    start = time.perf_counter()
+    with db:
+        db.executemany(
+            "UPDATE jobs SET status = ?, last_modified = CURRENT_TIMESTAMP WHERE id = ?",
+            ((rng.choice(STATUSES), rng.randint(1, rows)) for _ in range(changes)),
+        )
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def ad_hoc(db: sqlite3.Connection, days: int) -> None:
+    """The alternative to rollups: aggregate the status history on every request."""
+    db.execute(
+        "SELECT date(changed_at), from_status, to_status, COUNT(*) FROM job_status_history"
+        " WHERE changed_at >= date('now', ?) GROUP BY 1, 2, 3",
+        (f"-{days - 1} days",),
+    ).fetchall()
+    histograms: dict = {}
+    for from_status, to_status, days_in_stage, count in db.execute(
+        "SELECT from_status, to_status, MIN(stage_seconds / 86400, 365), COUNT(*)"
+        " FROM job_status_history WHERE stage_seconds IS NOT NULL GROUP BY 1, 2, 3"
+    ):
+        histograms.setdefault((from_status, to_status), []).append((days_in_stage, count))
+    for buckets in histograms.values():
+        histogram_percentiles(buckets, STAGE_PERCENTILES)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/analytics from rollups versus ad hoc aggregation.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--changes", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = create_database(args.rows)
+    print(f"Seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+    elapsed = add_transitions(path, args.changes)
+    print(f"Applied {args.changes} status changes in {elapsed:.1f}s")
+    try:
+        client = app.test_client()
+        url = f"/analytics?days={args.days}"
+        rollup = median_ms(lambda: client.get(url), args.repeat)
+        db = sqlite3.connect(path)
+        history = db.execute("SELECT COUNT(*) FROM job_status_history").fetchone()[0]
+        scan = median_ms(lambda: ad_hoc(db, args.days), max(1, args.repeat // 5))
+        db.close()
+        print(f"history rows {history}")
+        print(f"{'rollups (GET /analytics)':<28}{rollup:>10.2f}ms")
+        print(f"{'ad hoc over history':<28}{scan:>10.2f}ms")
+    finally:
+        close_pools(app)
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import statistics
+import time
+
+from app import app
+from benchmarks.dataset import create_database
+from compression import _brotli
+
+URLS: list[str] = [
+    "/",
+    "/?per_page=500",
+    "/jobs",
+    "/jobs?per_page=500",
+]
+
+
+def measure(url: str, encoding: str, repeat: int) -> tuple[int, float]:
+    """Return the body size of GET ``url`` and its median latency in milliseconds."""
+    client = app.test_client(use_cookies=False)
+    headers = {"Accept-Encoding": encoding}
+    size = len(client.get(url, headers=headers).data)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(url, headers=headers).close()
+        samples.append((time.perf_counter() - start) * 1000)
+    return size, statistics.median(samples)
+
+
+def static_view(fingerprinted: bool) -> int:
+    """Return the bytes a repeat page view spends on style.css.
+
+    Without a fingerprint the browser revalidates and gets a bodiless 304;
+    a fingerprinted URL marked immutable is not requested at all.
+    """
+    if fingerprinted:
+        return 0
+    client = app.test_client(use_cookies=False)
+    first = client.get("/static/style.css")
+    etag = first.headers["ETag"]
+    first.close()
+    response = client.get("/static/style.css", headers={"If-None-Match": etag})
+    head = sum(len(name) + len(value) + 4 for name, value in response.headers.items())
+    return len(response.data) + head
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bytes on the wire with and without compression.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    encodings = ["identity", "gzip"] + (["br"] if _brotli() is not None else [])
+    path = create_database(args.rows)
+    try:
+        header = "".join(f"{name:>22}" for name in encodings)
+        print(f"{'url':<26}{header}")
+        for url in URLS + ["/static/style.css"]:
+            cells = []
+            for encoding in encodings:
+                size, latency = measure(url, encoding, args.repeat)
+                cells.append(f"{size:>11}B {latency:>7.2f}ms")
+            print(f"{url:<26}{''.join(cells)}")
+        print(
+            f"repeat view of style.css: {static_view(False)}B revalidated,"
+            f" {static_view(True)}B fingerprinted"
+        )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
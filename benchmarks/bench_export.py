@@ -0,0 +1,25 @@
+import argparse
+import os
+
+from benchmarks.bench_streaming import measure
+from benchmarks.dataset import create_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming export latency and memory.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'format':<8}{'ttfb':>10}{'total':>12}{'peak':>11}")
+    for rows in args.rows:
+        path = create_database(rows)
+        try:
+            for fmt in ("csv", "ndjson"):
+                ttfb, total, peak = measure(f"/jobs/export?format={fmt}")
+                print(f"{rows:>9} {fmt:<8}{ttfb:>8.1f}ms{total:>10.1f}ms{peak:>8.1f}MiB")
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
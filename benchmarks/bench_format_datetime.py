@@ -0,0 +1,67 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytz
+from pytz import timezone
+
+from app import app, clear_format_cache, format_datetime_filter, format_datetimes
+
+
+def legacy_format(timestamp: Optional[str], tz_name: str) -> str:
+    """The original per-row implementation, kept here as the baseline."""
+    if timestamp:
+        utc_dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+        utc_dt = pytz.utc.localize(utc_dt)
+        try:
+            local_tz = timezone(tz_name)
+            local_dt = utc_dt.astimezone(local_tz)
+            return local_dt.strftime("%Y/%m/%d %H:%M:%S %Z%z")
+        except pytz.exceptions.UnknownTimeZoneError:
+            return utc_dt.strftime("%Y/%m/%d %H:%M:%S UTC")
+    return ""
+
+
+def make_column(rows: int, distinct: int) -> list[str]:
+    """Build ``rows`` timestamps drawn from ``distinct`` different values."""
+    start = datetime(2024, 1, 1)
+    step = 2 * 365 * 86400 // distinct
+    return [
+        (start + timedelta(seconds=step * (i % distinct))).strftime("%Y-%m-%d %H:%M:%S")
+        for i in range(rows)
+    ]
+
+
+def timed(label: str, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    print(f"  {label:<24}{(time.perf_counter() - start) * 1000:>10.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="format_datetime throughput.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--timezone", default="Australia/Adelaide")
+    args = parser.parse_args()
+    app.config["APP_TIMEZONE"] = args.timezone
+
+    with app.app_context():
+        run(args.rows, args.timezone)
+
+
+def run(rows: int, tz_name: str) -> None:
+    """Time each formatter on ``rows`` timestamps, all distinct and then mostly repeated."""
+    for distinct in (rows, 1_000):
+        column = make_column(rows, distinct)
+        print(f"{rows} rows, {distinct} distinct timestamps")
+        timed("legacy per-row", lambda: [legacy_format(ts, tz_name) for ts in column])
+        clear_format_cache()
+        timed("cached per-row (cold)", lambda: [format_datetime_filter(ts) for ts in column])
+        timed("cached per-row (warm)", lambda: [format_datetime_filter(ts) for ts in column])
+        clear_format_cache()
+        timed("bulk column", lambda: format_datetimes(column))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import csv
+import os
+import sqlite3
+import tempfile
+import time
+
+from app import app, get_db
+from benchmarks.dataset import create_database, generate_jobs
+from db import close_pools
+from jobs_io import INSERT_JOB_SQL, import_jobs, read_records
+
+
+def write_csv(rows: int) -> str:
+    """Write ``rows`` synthetic jobs to a temporary CSV file."""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["company", "position", "status", "created_at", "last_modified"])
+        writer.writerows(generate_jobs(rows))
+    return path
+
+
+def fresh_db() -> tuple[str, sqlite3.Connection]:
+    """Initialise an empty database and return its path and a pooled write connection."""
+    path = create_database(0)
+    return path, get_db(readonly=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import throughput.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--baseline-rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    source = write_csv(args.rows)
+    paths = []
+    try:
+        with app.app_context():
+            path, db = fresh_db()
+            paths.append(path)
+            start = time.perf_counter()
+            for params in generate_jobs(args.baseline_rows, seed=1):
+                db.execute(INSERT_JOB_SQL, params)
+                db.commit()
+            per_row = (time.perf_counter() - start) / args.baseline_rows
+            print(f"one commit per row: {1 / per_row:>10.0f} rows/s "
+                  f"(~{per_row * args.rows:.0f}s for {args.rows} rows)")
+        close_pools(app)
+
+        # The same rows in the same batches, with every per-row trigger running,
+        # into an empty database of its own.
+        with app.app_context():
+            path, db = fresh_db()
+            paths.append(path)
+            rows = list(generate_jobs(args.rows))
+            start = time.perf_counter()
+            for i in range(0, len(rows), args.batch_size):
+                with db:
+                    db.executemany(INSERT_JOB_SQL, rows[i : i + args.batch_size])
+            elapsed = time.perf_counter() - start
+            print(f"per-row triggers:   {len(rows) / elapsed:>10.0f} rows/s "
+                  f"({len(rows)} rows in {elapsed:.1f}s)")
+            del rows
+        close_pools(app)
+
+        with app.app_context():
+            path, db = fresh_db()
+            paths.append(path)
+            start = time.perf_counter()
+            with open(source, newline="", encoding="utf-8") as f:
+                result = import_jobs(db, read_records(f, "csv"), batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"import_jobs:        {result['inserted'] / elapsed:>10.0f} rows/s "
+                  f"({result['inserted']} rows in {elapsed:.1f}s)")
+    finally:
+        close_pools(app)
+        os.unlink(source)
+        for path in paths:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
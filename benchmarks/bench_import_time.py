@@ -0,0 +1,113 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules that must stay out of ``import app``; they are imported lazily when
+# an app is created or a timestamp is first formatted.
+LAZY_MODULES: list[str] = ["brotli", "dotenv", "pytz"]
+# The project's own modules, whose import time counts against the app.
+PROJECT_MODULES: list[str] = [
+    "app",
+    "archive",
+    "caching",
+    "compression",
+    "db",
+    "jobs_io",
+    "metrics",
+    "read_model",
+    "repository",
+    "write_queue",
+]
+
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+app.test_client().get("/stats")
+served = time.perf_counter()
+print(imported - start, created - imported, served - created)
+"""
+
+
+def import_times(module: str) -> list[tuple[int, str, int]]:
+    """Return (depth, module, cumulative us) in ``python -X importtime`` order.
+
+    Each import is reported after the imports it triggered, one level deeper.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append((depth, name.strip(), int(cumulative_us)))
+    return times
+
+
+def split_app_time(times: list[tuple[int, str, int]]) -> tuple[float, float]:
+    """Return (total ms, ms spent in app and its own modules) for ``import app``."""
+    third_party = 0
+    for depth, name, cumulative in times:
+        if depth == 0 and name != "app":
+            third_party = 0
+        elif depth == 1 and name not in PROJECT_MODULES:
+            third_party += cumulative
+        elif depth == 0:
+            return cumulative / 1000, (cumulative - third_party) / 1000
+    raise RuntimeError("app was not imported")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold start cost of importing and creating the app.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="fail if app and its own modules take longer than this to import",
+    )
+    args = parser.parse_args()
+    os.environ.setdefault("SECRET_KEY", "import-time-check")
+
+    runs = [import_times("app") for _ in range(args.repeat)]
+    total = statistics.median(split_app_time(run)[0] for run in runs)
+    own = statistics.median(split_app_time(run)[1] for run in runs)
+    print(f"import app (cumulative)     {total:>8.1f}ms")
+    print(f"  app and its own modules   {own:>8.1f}ms")
+    print(f"  third-party imports       {total - own:>8.1f}ms")
+
+    startup = []
+    for _ in range(args.repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, text=True, check=True
+        )
+        startup.append([float(value) * 1000 for value in result.stdout.split()])
+    for label, index in (("import", 0), ("create_app()", 1), ("first request", 2)):
+        print(f"{label:<28}{statistics.median(run[index] for run in startup):>8.1f}ms")
+
+    failures = [
+        f"{name} is imported by 'import app'"
+        for name in LAZY_MODULES
+        if any(name == imported for run in runs for _, imported, _ in run)
+    ]
+    if args.budget_ms is not None and own > args.budget_ms:
+        failures.append(f"app import costs {own:.1f}ms, budget is {args.budget_ms:.1f}ms")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import statistics
+import time
+
+from app import app
+from benchmarks.dataset import create_database
+
+URLS: list[str] = [
+    "/",
+    "/?status=Applied&sort=company&order=desc",
+    "/?status=Declined&sort=last_modified",
+    "/?q=engineer",
+]
+
+
+def time_requests(url: str, repeat: int) -> float:
+    """Return the median latency of GET ``url`` in milliseconds."""
+    client = app.test_client(use_cookies=False)
+    client.get(url)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index page latency with and without the page cache.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    path = create_database(args.rows)
+    try:
+        print(f"{'url':<45}{'uncached':>12}{'cached':>12}")
+        cache_size = app.config["INDEX_CACHE_SIZE"]
+        for url in URLS:
+            app.config["INDEX_CACHE_SIZE"] = 0
+            uncached = time_requests(url, args.repeat)
+            app.config["INDEX_CACHE_SIZE"] = cache_size
+            cached = time_requests(url, args.repeat)
+            print(f"{url:<45}{uncached:>10.2f}ms{cached:>10.2f}ms")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import os
+import statistics
+import time
+
+from app import app, get_jobs, get_jobs_page
+from benchmarks.dataset import create_database
+
+SHAPES: list[tuple[str, str, str]] = [
+    ("All", "id", "asc"),
+    ("All", "company", "asc"),
+    ("All", "last_modified", "desc"),
+    ("Applied", "id", "desc"),
+    ("Interviewed", "position", "asc"),
+    ("All", "status", "asc"),
+    ("Declined", "last_modified", "desc"),
+]
+
+
+def time_call(fn, repeat: int) -> float:
+    """Return the median wall time of ``fn`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Keyset pagination latency by page depth.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = create_database(args.rows)
+    print(f"Seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+    try:
+        with app.app_context():
+            print(f"{'shape':<36}{'page 1':>10}{f'page {args.page}':>12}{'full list':>12}")
+            for status, sort_by, order in SHAPES:
+                cursor = None
+                for _ in range(args.page - 1):
+                    _, cursor, _ = get_jobs_page(
+                        status, sort_by, order, after=cursor, per_page=args.per_page
+                    )
+                first = time_call(
+                    lambda: get_jobs_page(status, sort_by, order, per_page=args.per_page),
+                    args.repeat,
+                )
+                deep = time_call(
+                    lambda: get_jobs_page(
+                        status, sort_by, order, after=cursor, per_page=args.per_page
+                    ),
+                    args.repeat,
+                )
+                offset = (args.page - 1) * args.per_page
+                legacy = time_call(
+                    lambda: get_jobs(status, sort_by, order)[offset : offset + args.per_page],
+                    max(1, args.repeat // 10),
+                )
+                label = f"{status}/{sort_by}/{order}"
+                print(f"{label:<36}{first:>8.2f}ms{deep:>10.2f}ms{legacy:>10.2f}ms")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
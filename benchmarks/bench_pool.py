@@ -0,0 +1,67 @@
+import argparse
+import os
+import threading
+import time
+
+from app import app
+from benchmarks.dataset import create_database
+from db import close_pools
+
+
+def run_load(threads: int, duration: float, write_ratio: int) -> float:
+    """Drive the app from ``threads`` clients and return requests per second."""
+    count = [0] * threads
+    errors = [0] * threads
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        client = app.test_client()
+        n = 0
+        while time.perf_counter() < deadline:
+            if write_ratio and n % write_ratio == 0:
+                response = client.post(
+                    f"/update_status/{n % 1000 + 1}", json={"status": "Interviewed"}
+                )
+            else:
+                response = client.get("/?per_page=20")
+            if response.status_code >= 500:
+                errors[index] += 1
+            n += 1
+        count[index] = n
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if sum(errors):
+        print(f"  {sum(errors)} requests failed")
+    return sum(count) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Requests/sec with and without pooling.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--write-ratio", type=int, default=10, help="one write every N requests")
+    args = parser.parse_args()
+
+    path = create_database(args.rows)
+    app.config["TESTING"] = True
+    try:
+        for label, size in (("unpooled", 0), ("pooled", args.pool_size)):
+            close_pools(app)
+            app.config["DB_POOL_SIZE"] = size
+            rps = run_load(args.threads, args.duration, args.write_ratio)
+            print(f"{label:<10} pool_size={size:<3} {rps:>8.1f} req/s")
+    finally:
+        close_pools(app)
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import time
+import tracemalloc
+
+from app import app, encode_cursor, get_jobs, get_read_model
+from benchmarks.dataset import create_database
+from db import close_pools
+from read_model import ReadModel
+
+SHAPES: list[tuple[str, str, str]] = [
+    ("All", "id", "asc"),
+    ("All", "company", "desc"),
+    ("Applied", "last_modified", "desc"),
+    ("Declined", "position", "asc"),
+]
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-memory read model versus SQL listings.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--changes", type=int, default=1000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = create_database(args.rows)
+    print(f"Seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+    try:
+        with app.test_request_context("/"):
+            app.config["READ_MODEL"] = True
+            model = get_read_model()
+            start = time.perf_counter()
+            model.refresh()
+            load = time.perf_counter() - start
+            # Measured on a second copy: tracing allocations slows the load down.
+            tracemalloc.start()
+            copy = ReadModel(path)
+            copy.refresh()
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            copy.close()
+            print(f"load {load:.2f}s, {memory / 2**20:.1f}MiB, {memory / len(model):.0f} bytes/row")
+
+            print(f"{'listing':<42}{'page':<7}{'sql':>10}{'model':>10}")
+            for status, sort_by, order in SHAPES:
+                app.config["READ_MODEL"] = False
+                middle = get_jobs(status, sort_by, order, limit=args.rows // 8)[-1]
+                cursor = encode_cursor(middle, sort_by)
+                for label, after in (("first", None), ("deep", cursor)):
+                    timings = []
+                    for enabled in (False, True):
+                        app.config["READ_MODEL"] = enabled
+                        timings.append(
+                            median_ms(
+                                lambda: get_jobs(
+                                    status, sort_by, order, after=after, limit=args.per_page
+                                ),
+                                args.repeat,
+                            )
+                        )
+                    shape = f"status={status} sort={sort_by} {order}"
+                    print(f"{shape:<42}{label:<7}{timings[0]:>8.2f}ms{timings[1]:>8.2f}ms")
+
+            db = sqlite3.connect(path)
+            with db:
+                db.executemany(
+                    "UPDATE jobs SET status = 'Interviewed', last_modified = CURRENT_TIMESTAMP"
+                    " WHERE id = ?",
+                    [(job_id * 97 % args.rows + 1,) for job_id in range(args.changes)],
+                )
+            db.close()
+            start = time.perf_counter()
+            model.refresh()
+            refresh = time.perf_counter() - start
+            print(
+                f"refresh after {args.changes} changes: {refresh * 1000:.1f}ms"
+                f" ({refresh / args.changes * 1e6:.0f}us per change, full loads {model.loads})"
+            )
+    finally:
+        close_pools(app)
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import statistics
+import time
+
+from flask import render_template
+
+from app import app, format_datetimes, get_jobs, get_status_counts, job_row_key
+from benchmarks.dataset import create_database
+from caching import LRUCache
+from db import close_pools
+
+
+def render(jobs: list, cache: LRUCache, clear: bool) -> float:
+    """Render the index page for ``jobs`` and return the time taken in milliseconds."""
+    if clear:
+        cache.clear()
+    start = time.perf_counter()
+    render_template(
+        "index.html",
+        jobs=jobs,
+        changes_seq=0,
+        current_status="All",
+        status_counts=get_status_counts(),
+        q="",
+        sort_by="id",
+        order="asc",
+        per_page=None,
+        include_archived=False,
+        next_cursor=None,
+        prev_cursor=None,
+        formatted_times=format_datetimes(
+            job["last_modified"] for job in jobs if job_row_key(app, job) not in cache
+        ),
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index rendering with a cold and warm row cache.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    path = create_database(args.rows)
+    try:
+        with app.test_request_context("/"):
+            jobs = get_jobs(limit=args.rows)
+            cases = [
+                ("no cache", LRUCache(0), True),
+                ("cold cache", LRUCache(args.rows), True),
+                ("warm cache", LRUCache(args.rows), False),
+            ]
+            print(f"{'rows':>8}  {'case':<12}{'render':>12}")
+            for label, cache, clear in cases:
+                app.extensions["row_cache"] = cache
+                render(jobs, cache, clear)
+                timing = statistics.median(render(jobs, cache, clear) for _ in range(args.repeat))
+                print(f"{len(jobs):>8}  {label:<12}{timing:>10.1f}ms")
+    finally:
+        close_pools(app)
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
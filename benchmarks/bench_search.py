@@ -0,0 +1,62 @@
+import argparse
+import os
+import statistics
+import time
+
+from app import app, get_db, get_jobs_page
+from benchmarks.dataset import create_database
+from db import close_pools
+
+QUERIES: list[str] = ["goo 17", "canva 512", "\"data analyst\" 42", "reliab", "atlas"]
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def like_scan(q: str, per_page: int) -> list:
+    """The naive alternative: a substring scan over both columns."""
+    pattern = f"%{q.strip(chr(34))}%"
+    return get_db().execute(
+        "SELECT id, company, position, status, last_modified FROM jobs"
+        " WHERE company LIKE ? OR position LIKE ? ORDER BY id LIMIT ?",
+        (pattern, pattern, per_page),
+    ).fetchall()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FTS5 search versus LIKE scans.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = create_database(args.rows)
+    print(f"Seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+    try:
+        with app.app_context():
+            print(f"{'query':<20}{'fts (rank)':>12}{'fts (id)':>12}{'like':>12}")
+            for q in QUERIES:
+                ranked = median_ms(
+                    lambda: get_jobs_page(sort_by="rank", per_page=args.per_page, q=q),
+                    args.repeat,
+                )
+                by_id = median_ms(
+                    lambda: get_jobs_page(sort_by="id", per_page=args.per_page, q=q),
+                    args.repeat,
+                )
+                like = median_ms(lambda: like_scan(q, args.per_page), max(1, args.repeat // 5))
+                print(f"{q:<20}{ranked:>10.2f}ms{by_id:>10.2f}ms{like:>10.2f}ms")
+    finally:
+        close_pools(app)
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import time
+import tracemalloc
+
+from app import app
+from benchmarks.dataset import create_database
+
+
+def consume(url: str) -> tuple[float, float]:
+    """GET ``url`` and return (time to first byte, total time) in milliseconds."""
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    body = iter(response.response)
+    next(body)
+    first_byte = time.perf_counter() - start
+    for _ in body:
+        pass
+    total = time.perf_counter() - start
+    response.close()
+    return first_byte * 1000, total * 1000
+
+
+def measure(url: str) -> tuple[float, float, float]:
+    """Return (time to first byte ms, total ms, peak traced MiB) for a GET.
+
+    Memory is traced on a second request so tracing overhead does not skew timings.
+    """
+    ttfb, total = consume(url)
+    tracemalloc.start()
+    consume(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ttfb, total, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Buffered versus streamed index rendering.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'mode':<10}{'ttfb':>10}{'total':>12}{'peak':>11}")
+    for rows in args.rows:
+        path = create_database(rows)
+        try:
+            for mode, url in (
+                ("buffered", f"/?per_page={rows}"),
+                ("streamed", "/?stream=1"),
+            ):
+                app.config["MAX_PAGE_SIZE"] = rows
+                ttfb, total, peak = measure(url)
+                print(f"{rows:>8} {mode:<10}{ttfb:>8.1f}ms{total:>10.1f}ms{peak:>8.1f}MiB")
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import multiprocessing
+import shutil
+import statistics
+import tempfile
+import time
+
+from app import create_app, provision_tenant
+
+JOB: dict[str, str] = {"company": "Google", "position": "Software Engineer", "status": "Applied"}
+
+
+def writer(
+    tenant_dir: str, tenant: str, key: str, deadline: float
+) -> tuple[int, int, list[float]]:
+    """Add jobs as ``tenant`` until ``deadline``, in a process of its own.
+
+    Returns the number of writes, failed writes and latencies in milliseconds.
+    """
+    app = create_app({"TENANT_DB_DIR": tenant_dir, "TESTING": True, "SLOW_QUERY_MS": 0})
+    client = app.test_client()
+    client.post("/login", json={"tenant": tenant, "key": key})
+    client.get("/stats")  # open the tenant's pool outside the timing
+    latencies = []
+    errors = 0
+    while time.time() < deadline:
+        start = time.perf_counter()
+        response = client.post("/add", data=JOB)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+    return len(latencies), errors, latencies
+
+
+def run_writes(processes: int, tenants: int, duration: float) -> tuple[float, int, float]:
+    """Run ``processes`` writers spread over ``tenants`` tenants.
+
+    Returns writes per second, failed writes and the p99 latency in milliseconds.
+    """
+    tenant_dir = tempfile.mkdtemp()
+    app = create_app({"TENANT_DB_DIR": tenant_dir})
+    with app.app_context():
+        keys = [provision_tenant(f"tenant-{i}") for i in range(tenants)]
+    deadline = time.time() + duration + 1  # one second to start the workers
+    try:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(
+                writer,
+                [
+                    (tenant_dir, f"tenant-{i % tenants}", keys[i % tenants], deadline)
+                    for i in range(processes)
+                ],
+            )
+    finally:
+        shutil.rmtree(tenant_dir)
+    writes = sum(result[0] for result in results)
+    latencies = [latency for result in results for latency in result[2]]
+    p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else 0.0
+    return writes / duration, sum(result[1] for result in results), p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write throughput as writers spread over tenants.")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--tenants", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'tenants':>8}{'writers':>9}{'writes/s':>12}{'p99':>12}{'failed':>8}")
+    for tenants in args.tenants:
+        rate, failed, p99 = run_writes(args.processes, tenants, args.duration)
+        print(f"{tenants:>8}{args.processes:>9}{rate:>12.1f}{p99:>10.1f}ms{failed:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from app import create_app
+from db import close_pools
+from write_queue import close_write_queues
+
+JOB: dict[str, str] = {"company": "Google", "position": "Software Engineer", "status": "Applied"}
+
+
+def run_writes(
+    threads: int, duration: float, queued: bool, busy_timeout: int
+) -> tuple[float, int, int, float]:
+    """Run ``threads`` concurrent writers against a fresh database for ``duration`` seconds.
+
+    Returns writes per second, writes that failed with a server error (lock
+    timeouts), writes refused with 503 and the p99 latency in milliseconds.
+    """
+    fd, path = tempfile.mkstemp()
+    app = create_app(
+        {
+            "DATABASE": path,
+            "SLOW_QUERY_MS": 0,
+            "DB_BUSY_TIMEOUT": busy_timeout,
+            "WRITE_QUEUE": queued,
+        }
+    )
+    app.logger.disabled = True  # lock errors are counted, not logged
+    app.test_cli_runner().invoke(args=["init-db"])
+    deadline = time.perf_counter() + duration
+    results: list[tuple[int, int, list[float]]] = []
+
+    def writer() -> None:
+        client = app.test_client(use_cookies=False)
+        latencies, errors, rejected = [], 0, 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = client.post("/add", data=JOB).status_code
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status == 503:
+                rejected += 1
+            elif status >= 500:
+                errors += 1
+        results.append((errors, rejected, latencies))
+
+    workers = [threading.Thread(target=writer) for _ in range(threads)]
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        with app.app_context():
+            close_write_queues(app)
+            close_pools(app)
+    finally:
+        os.close(fd)
+        os.unlink(path)
+    latencies = [latency for result in results for latency in result[2]]
+    errors = sum(result[0] for result in results)
+    rejected = sum(result[1] for result in results)
+    p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else 0.0
+    return (len(latencies) - errors - rejected) / duration, errors, rejected, p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent writes with and without the write queue.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[8, 32, 64])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument(
+        "--busy-timeout", type=int, default=50, help="DB_BUSY_TIMEOUT in ms; lower means more lock errors"
+    )
+    args = parser.parse_args()
+
+    print(f"{'threads':>8}{'queue':>7}{'writes/s':>12}{'p99':>12}{'locked':>8}{'503':>6}")
+    for threads in args.threads:
+        for queued in (False, True):
+            rate, errors, rejected, p99 = run_writes(
+                threads, args.duration, queued, args.busy_timeout
+            )
+            mode = "on" if queued else "off"
+            print(f"{threads:>8}{mode:>7}{rate:>12.1f}{p99:>10.1f}ms{errors:>8}{rejected:>6}")
+
+
+if __name__ == "__main__":
+    main()
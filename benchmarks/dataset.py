@@ -0,0 +1,110 @@
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from app import app
+
+COMPANIES: list[str] = [
+    "Google",
+    "Amazon",
+    "Microsoft",
+    "Meta",
+    "Atlassian",
+    "Canva",
+    "Apple",
+    "Netflix",
+    "Stripe",
+    "Shopify",
+]
+POSITIONS: list[str] = [
+    "Software Engineer",
+    "Data Analyst",
+    "Full Stack Developer",
+    "Site Reliability Engineer",
+    "Product Manager",
+    "Test Engineer",
+]
+STATUSES: list[str] = ["Applied", "Interviewed", "Accepted", "Declined"]
+
+
+def parse_distribution(value: str) -> dict[str, float]:
+    """Parse 'Applied=0.6,Declined=0.4' into status weights."""
+    weights: dict[str, float] = {}
+    for part in value.split(","):
+        status, _, weight = part.partition("=")
+        if status.strip() not in STATUSES:
+            raise argparse.ArgumentTypeError(f"Unknown status: {status.strip()}")
+        weights[status.strip()] = float(weight)
+    return weights
+
+
+def generate_jobs(
+    rows: int, seed: int = 0, distribution: Optional[dict[str, float]] = None
+) -> Iterator[tuple[str, str, str, str, str]]:
+    """Yield synthetic (company, position, status, created_at, last_modified) rows.
+
+    ``distribution`` maps statuses to relative weights; statuses are uniform
+    when it is omitted.
+    """
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    statuses = list(distribution) if distribution else STATUSES
+    weights = list(distribution.values()) if distribution else None
+    for i in range(rows):
+        created = start + timedelta(seconds=rng.randrange(0, 2 * 365 * 86400))
+        modified = created + timedelta(seconds=rng.randrange(0, 60 * 86400))
+        yield (
+            f"{rng.choice(COMPANIES)} {i % 997}",
+            f"{rng.choice(POSITIONS)} {i % 89}",
+            rng.choices(statuses, weights)[0],
+            created.strftime("%Y-%m-%d %H:%M:%S"),
+            modified.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+
+def create_database(
+    rows: int,
+    seed: int = 0,
+    path: Optional[str] = None,
+    distribution: Optional[dict[str, float]] = None,
+) -> str:
+    """Initialise a database with ``init-db`` and fill it with synthetic jobs."""
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+    app.config["DATABASE"] = path
+    app.test_cli_runner().invoke(args=["init-db"])
+
+    db = sqlite3.connect(path)
+    with db:
+        db.executemany(
+            "INSERT INTO jobs (company, position, status, created_at, last_modified)"
+            " VALUES (?, ?, ?, ?, ?)",
+            generate_jobs(rows, seed, distribution),
+        )
+    db.close()
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create a database of synthetic jobs.")
+    parser.add_argument("path", help="database file to create (overwritten)")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--distribution",
+        type=parse_distribution,
+        default=None,
+        help="status weights, e.g. Applied=0.6,Interviewed=0.2,Accepted=0.05,Declined=0.15",
+    )
+    args = parser.parse_args()
+    create_database(args.rows, args.seed, args.path, args.distribution)
+    print(f"Created {args.path} with {args.rows} jobs.")
+
+
+if __name__ == "__main__":
+    main()
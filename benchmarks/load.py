@@ -0,0 +1,211 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from flask.testing import FlaskClient
+
+from app import app
+from benchmarks.dataset import create_database, parse_distribution
+from db import close_pools
+
+# A route scenario issues one request with the given client and returns its status code.
+Scenario = Callable[[FlaskClient, random.Random], int]
+
+
+def make_scenarios(rows: int) -> dict[str, Scenario]:
+    """Build one request scenario per route, against a database of ``rows`` jobs."""
+    # Deletes consume ids from the top of the table so they never collide with
+    # each other; the other scenarios stay below them.
+    delete_ids = itertools.count(rows, -1)
+    delete_lock = threading.Lock()
+    live_ids = max(rows // 2, 1)
+
+    def index(client: FlaskClient, rng: random.Random) -> int:
+        status = rng.choice(["All", "Applied", "Interviewed", "Accepted", "Declined"])
+        sort_by = rng.choice(["id", "company", "position", "status", "last_modified"])
+        return client.get(f"/?status={status}&sort={sort_by}").status_code
+
+    def get_job(client: FlaskClient, rng: random.Random) -> int:
+        return client.get(f"/job/{rng.randint(1, live_ids)}").status_code
+
+    def add_job(client: FlaskClient, rng: random.Random) -> int:
+        data = {"company": "Benchmark", "position": "Engineer", "status": "Applied"}
+        return client.post("/add", data=data).status_code
+
+    def edit_job(client: FlaskClient, rng: random.Random) -> int:
+        data = {"company": "Edited", "position": "Engineer", "status": "Interviewed"}
+        return client.post(f"/{rng.randint(1, live_ids)}/edit", data=data).status_code
+
+    def delete_job(client: FlaskClient, rng: random.Random) -> int:
+        with delete_lock:
+            job_id = next(delete_ids)
+        if job_id <= live_ids:
+            return 0
+        return client.post(f"/{job_id}/delete").status_code
+
+    def update_status(client: FlaskClient, rng: random.Random) -> int:
+        status = rng.choice(["Applied", "Interviewed", "Accepted", "Declined"])
+        return client.post(
+            f"/update_status/{rng.randint(1, live_ids)}", json={"status": status}
+        ).status_code
+
+    return {
+        "index": index,
+        "get_job": get_job,
+        "add_job": add_job,
+        "edit_job": edit_job,
+        "delete_job": delete_job,
+        "update_status": update_status,
+    }
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(samples))) - 1, 0)
+    return samples[min(rank, len(samples) - 1)]
+
+
+def drive(scenario: Scenario, threads: int, duration: float, seed: int) -> dict[str, Any]:
+    """Run ``scenario`` from ``threads`` clients for ``duration`` seconds."""
+    latencies: list[list[float]] = [[] for _ in range(threads)]
+    errors = [0] * threads
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        # Without cookies, flashed messages do not pile up in a session.
+        client = app.test_client(use_cookies=False)
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status_code = scenario(client, rng)
+            if status_code == 0:
+                break
+            latencies[index].append((time.perf_counter() - start) * 1000)
+            if status_code >= 400:
+                errors[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    samples = sorted(itertools.chain.from_iterable(latencies))
+    return {
+        "requests": len(samples),
+        "errors": sum(errors),
+        "rps": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return a description of every route that regressed beyond ``tolerance``."""
+    regressions = []
+    for route, current in results["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if previous is None:
+            continue
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{route}: throughput {current['rps']} req/s < baseline {previous['rps']}"
+            )
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{route}: p95 {current['p95_ms']}ms > baseline {previous['p95_ms']}ms"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(
+                f"{route}: {current['errors']} errors, baseline had {previous['errors']}"
+            )
+    return regressions
+
+
+def run(
+    rows: int,
+    threads: int,
+    duration: float,
+    routes: list[str],
+    distribution: Optional[dict[str, float]] = None,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Seed a temporary database and load test each route in turn."""
+    path = create_database(rows, seed, distribution=distribution)
+    scenarios = make_scenarios(rows)
+    results: dict[str, Any] = {
+        "meta": {
+            "rows": rows,
+            "threads": threads,
+            "duration": duration,
+            "distribution": distribution,
+            "python": sys.version.split()[0],
+        },
+        "routes": {},
+    }
+    try:
+        for route in routes:
+            results["routes"][route] = drive(scenarios[route], threads, duration, seed)
+    finally:
+        close_pools(app)
+        os.unlink(path)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-process load test of every route.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per route")
+    parser.add_argument("--routes", nargs="+", default=None, help="subset of routes to run")
+    parser.add_argument("--distribution", type=parse_distribution, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a saved results file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    routes = args.routes or list(make_scenarios(args.rows))
+    unknown = set(routes) - set(make_scenarios(args.rows))
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+
+    results = run(args.rows, args.threads, args.duration, routes, args.distribution, args.seed)
+
+    print(f"{'route':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for route, stats in results["routes"].items():
+        print(
+            f"{route:<16}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.1f}"
+            f"{stats['p50_ms']:>8.2f}ms{stats['p95_ms']:>8.2f}ms{stats['p99_ms']:>8.2f}ms"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """A thread-safe mapping bounded to ``maxsize`` entries, evicting the least recently used.
+
+    A ``maxsize`` of 0 disables the cache: nothing is stored and every lookup misses.
+    With ``maxbytes`` and ``sizeof`` the entries' total size is bounded too, and
+    a value larger than ``maxbytes`` on its own is not stored at all.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        maxbytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes if sizeof is not None else None
+        self.sizeof = sizeof
+        self.currbytes = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sizes: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key`` and mark it as recently used."""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full."""
+        if self.maxsize <= 0:
+            return
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        with self._lock:
+            self._discard(key)
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._data[key] = value
+            if self.maxbytes is not None:
+                self._sizes[key] = size
+                self.currbytes += size
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.currbytes > self.maxbytes
+            ):
+                self._discard(next(iter(self._data)))
+
+    def _discard(self, key: Hashable) -> None:
+        if self._data.pop(key, None) is not None:
+            self.currbytes -= self._sizes.pop(key, 0)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.currbytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return whether ``key`` is cached, without marking it as recently used."""
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,59 @@
+import functools
+import zlib
+from types import ModuleType
+from typing import Optional
+
+from werkzeug.datastructures import Accept
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/javascript",
+    "application/json",
+    "text/css",
+    "text/html",
+    "text/javascript",
+}
+# Dynamic responses are compressed on every request, so brotli uses a low
+# quality, like the default COMPRESS_LEVEL for gzip; static files are
+# compressed once per version and use the best settings of either.
+BROTLI_QUALITY = 4
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+
+@functools.cache
+def _brotli() -> Optional[ModuleType]:
+    """Return the optional brotli module, imported on first use."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def is_compressible(mimetype: Optional[str]) -> bool:
+    """Return whether responses of ``mimetype`` are worth compressing."""
+    return mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def choose_encoding(accept_encodings: Accept) -> Optional[str]:
+    """Return the best content coding the client accepts, or None for identity.
+
+    Brotli is preferred when the ``brotli`` package is installed and the
+    client rates it at least as highly as gzip.
+    """
+    offered = ["br", "gzip"] if _brotli() is not None else ["gzip"]
+    return accept_encodings.best_match(offered)
+
+
+def compress(data: bytes, encoding: str, level: int, static: bool = False) -> bytes:
+    """Compress ``data`` with ``encoding`` (``"br"`` or ``"gzip"``).
+
+    ``level`` is the gzip level for dynamic responses; ``static`` selects the
+    slowest, smallest settings for files that are compressed only once.
+    """
+    if encoding == "br":
+        quality = STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY
+        return _brotli().compress(data, quality=quality)
+    # wbits=31 writes a gzip header and trailer around the deflate stream.
+    compressor = zlib.compressobj(STATIC_GZIP_LEVEL if static else level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
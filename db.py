@@ -0,0 +1,145 @@
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import quote
+
+from flask import Flask
+
+from metrics import InstrumentedConnection, Metrics
+
+
+class ConnectionPool:
+    """A bounded pool of tuned SQLite connections to a single database file.
+
+    Idle connections are kept on a LIFO queue so the most recently used (and
+    therefore warmest) connection is handed out first. When the pool is empty a
+    new connection is opened, and when it is full a released connection is
+    closed instead of kept, so ``size`` bounds idle connections, not callers.
+    If ``metrics`` is given, connections time their statements and commits.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        size: int = 5,
+        readonly: bool = False,
+        busy_timeout: int = 5000,
+        cache_size: int = -16000,
+        mmap_size: int = 0,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        self.database = database
+        self.size = size
+        self.readonly = readonly
+        self.busy_timeout = busy_timeout
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.metrics = metrics
+        self.closed = False
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(
+            maxsize=max(size, 1)
+        )
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply the per-connection pragmas once."""
+        start = time.perf_counter()
+        if self.readonly and self.database != ":memory:":
+            conn = sqlite3.connect(
+                f"file:{quote(self.database)}?mode=ro",
+                uri=True,
+                timeout=self.busy_timeout / 1000,
+                check_same_thread=False,
+                factory=InstrumentedConnection,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.database,
+                timeout=self.busy_timeout / 1000,
+                check_same_thread=False,
+                factory=InstrumentedConnection,
+            )
+            conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.row_factory = sqlite3.Row
+        if self.metrics is not None:
+            conn.metrics = self.metrics
+            self.metrics.observe_connect(time.perf_counter() - start, self.readonly)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take an idle connection from the pool, opening one if none is idle."""
+        if self.size > 0:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+        return self.connect()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self.size > 0 and not self.closed:
+            try:
+                self._idle.put_nowait(conn)
+                return
+            except queue.Full:
+                pass
+        conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection, and any in use once it is released."""
+        self.closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools_lock = threading.Lock()
+
+
+def get_pool(app: Flask, database: str, readonly: bool = False) -> ConnectionPool:
+    """Return the app's pool for ``database``, creating it on first use.
+
+    At most ``DB_MAX_POOLS`` pools are kept open; with one database per
+    tenant, the least recently used pool is closed to make room.
+    """
+    pools: OrderedDict[tuple[str, bool], ConnectionPool] = app.extensions.setdefault(
+        "db_pools", OrderedDict()
+    )
+    key = (database, readonly)
+    with _pools_lock:
+        pool = pools.get(key)
+        if pool is not None:
+            pools.move_to_end(key)
+        else:
+            pool = ConnectionPool(
+                database,
+                size=app.config["DB_POOL_SIZE"],
+                readonly=readonly,
+                busy_timeout=app.config["DB_BUSY_TIMEOUT"],
+                cache_size=app.config["DB_CACHE_SIZE"],
+                mmap_size=app.config["DB_MMAP_SIZE"],
+                metrics=app.extensions.get("metrics"),
+            )
+            pools[key] = pool
+            while len(pools) > max(app.config["DB_MAX_POOLS"], 2):
+                pools.popitem(last=False)[1].close()
+    return pool
+
+
+def close_pools(app: Flask, database: Optional[str] = None) -> None:
+    """Close pooled connections, for one database or for all of them."""
+    pools: OrderedDict[tuple[str, bool], ConnectionPool] = app.extensions.get("db_pools", {})
+    with _pools_lock:
+        for key in list(pools):
+            if database is None or key[0] == database:
+                pools.pop(key).close()
@@ -0,0 +1,257 @@
+import csv
+import io
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
+
+JOB_STATUSES: list[str] = ["Applied", "Interviewed", "Accepted", "Declined"]
+IMPORT_FORMATS: list[str] = ["csv", "jsonl"]
+EXPORT_FORMATS: list[str] = ["csv", "ndjson"]
+EXPORT_COLUMNS: list[str] = ["id", "company", "position", "status", "created_at", "last_modified"]
+EXPORT_MIMETYPES: dict[str, str] = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+INSERT_JOB_SQL = (
+    "INSERT INTO jobs (company, position, status, created_at, last_modified)"
+    " VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))"
+)
+
+# Running a trigger costs more per row than the insert it follows, so
+# import_jobs drops these per-row insert triggers for the length of a batch, in
+# the batch's own transaction, and recreates them before it commits.
+BULK_SKIPPED_TRIGGERS: list[str] = [
+    "jobs_version_insert",
+    "jobs_fts_insert",
+    "jobs_counts_insert",
+    "jobs_changes_insert",
+    "jobs_history_insert",
+    "job_status_history_rollup",
+]
+SELECT_TRIGGERS_SQL = (
+    "SELECT name, sql FROM sqlite_master"
+    " WHERE type = 'trigger' AND name IN (SELECT value FROM json_each(?))"
+)
+# Meanwhile these statements do the triggers' work once for the batch: each
+# covers every job with an id above the parameter. New ids always exceed the
+# largest id in jobs (AUTOINCREMENT), so that is exactly the batch inserted.
+# NOT INDEXED keeps them on that rowid range: left to itself the planner may
+# group by status by scanning a whole status index, which grows with every batch.
+LAST_JOB_ID_SQL = "SELECT COALESCE(MAX(id), 0) FROM jobs"
+BUMP_VERSION_SQL = "UPDATE db_version SET version = version + 1 WHERE id = 0"
+CATCH_UP_SQL: list[str] = [
+    "INSERT INTO jobs_fts (rowid, company, position)"
+    " SELECT id, company, position FROM jobs NOT INDEXED WHERE id > ?",
+    "UPDATE job_status_counts SET count = job_status_counts.count + batch.count"
+    " FROM (SELECT status, COUNT(*) AS count FROM jobs NOT INDEXED WHERE id > ? GROUP BY status)"
+    " AS batch WHERE job_status_counts.status = batch.status",
+    "INSERT OR REPLACE INTO job_changes (job_id, deleted)"
+    " SELECT id, 0 FROM jobs NOT INDEXED WHERE id > ? ORDER BY id",
+    "INSERT INTO job_status_history (job_id, from_status, to_status, changed_at)"
+    " SELECT id, NULL, status, COALESCE(created_at, CURRENT_TIMESTAMP)"
+    " FROM jobs NOT INDEXED WHERE id > ? ORDER BY id",
+    "INSERT INTO job_transitions_daily (day, from_status, to_status, count)"
+    " SELECT date(COALESCE(created_at, CURRENT_TIMESTAMP)), '', status, COUNT(*)"
+    " FROM jobs NOT INDEXED WHERE id > ? GROUP BY 1, 3"
+    " ON CONFLICT (day, from_status, to_status) DO UPDATE SET count = count + excluded.count",
+]
+
+# A record as produced by the readers: (line number, parsed record, parse error).
+Record = tuple[int, Optional[dict[str, Any]], Optional[str]]
+# Text is decoded a chunk at a time, so undecodable bytes end the import at
+# the first line not yet read rather than at the exact line they are on.
+DECODE_ERROR = "Invalid UTF-8 ({}); this line and the rest of the input were not imported"
+# Runs a function of a connection in a transaction, commits and returns its result.
+Writer = Callable[[Callable[[sqlite3.Connection], Any]], Any]
+
+
+def read_csv(stream: TextIO) -> Iterator[Record]:
+    """Lazily read job records from CSV with a header row."""
+    reader = csv.DictReader(stream)
+    try:
+        for row in reader:
+            yield reader.line_num, row, None
+    except csv.Error as e:
+        yield reader.line_num, None, f"Invalid CSV: {e}"
+    except UnicodeDecodeError as e:
+        yield reader.line_num + 1, None, DECODE_ERROR.format(e.reason)
+
+
+def read_jsonl(stream: TextIO) -> Iterator[Record]:
+    """Lazily read job records from JSON Lines, skipping blank lines."""
+    line_num = 0
+    try:
+        for line_num, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_num, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_num, None, "Expected a JSON object"
+                continue
+            yield line_num, record, None
+    except UnicodeDecodeError as e:
+        yield line_num + 1, None, DECODE_ERROR.format(e.reason)
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Record]:
+    """Read job records from ``stream`` in the given import format."""
+    if fmt == "csv":
+        return read_csv(stream)
+    if fmt == "jsonl":
+        return read_jsonl(stream)
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def write_csv(rows: Iterable[sqlite3.Row]) -> Iterator[str]:
+    """Lazily render rows as CSV with a header row, one line at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([row[column] for column in EXPORT_COLUMNS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_ndjson(rows: Iterable[sqlite3.Row]) -> Iterator[str]:
+    """Lazily render rows as newline-delimited JSON objects."""
+    for row in rows:
+        yield json.dumps({column: row[column] for column in EXPORT_COLUMNS}) + "\n"
+
+
+def write_records(rows: Iterable[sqlite3.Row], fmt: str) -> Iterator[str]:
+    """Render job rows in the given export format."""
+    if fmt == "csv":
+        return write_csv(rows)
+    if fmt == "ndjson":
+        return write_ndjson(rows)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def parse_timestamp(value: Any) -> Optional[str]:
+    """Normalise an optional timestamp to the database's 'YYYY-MM-DD HH:MM:SS' form."""
+    if value is None or value == "":
+        return None
+    parsed = datetime.fromisoformat(str(value).strip())
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def validate_job(record: dict[str, Any]) -> tuple[Optional[tuple], Optional[str]]:
+    """Validate one record, returning INSERT parameters or an error message."""
+    fields = [record.get(name) for name in ("company", "position", "status")]
+    # JSON Lines can carry numbers, lists or objects, which must not be stringified.
+    if any(value is not None and not isinstance(value, str) for value in fields):
+        return None, "Company, position and status must be strings!"
+    company, position, status = [(value or "").strip() for value in fields]
+    if not company or not position:
+        return None, "Company and position are required!"
+    if status not in JOB_STATUSES:
+        return None, "Invalid status!"
+    try:
+        created_at = parse_timestamp(record.get("created_at"))
+        last_modified = parse_timestamp(record.get("last_modified"))
+    except ValueError:
+        return None, "Invalid timestamp!"
+    return (company, position, status, created_at, last_modified), None
+
+
+@contextmanager
+def bulk_import(db: sqlite3.Connection) -> Iterator[None]:
+    """Insert jobs in the block without the per-row insert triggers, then catch up.
+
+    The triggers are dropped and recreated inside a transaction, which the
+    caller commits, so other connections never see them missing. If the block
+    raises, the caller must roll back, which restores them.
+    """
+    if not db.in_transaction:
+        # DDL would otherwise run in autocommit mode. IMMEDIATE takes the
+        # write lock, so no other writer can add jobs above ``last_id``.
+        db.execute("BEGIN IMMEDIATE")
+    triggers = db.execute(SELECT_TRIGGERS_SQL, (json.dumps(BULK_SKIPPED_TRIGGERS),)).fetchall()
+    for name, _ in triggers:
+        db.execute(f"DROP TRIGGER {name}")
+    last_id = db.execute(LAST_JOB_ID_SQL).fetchone()[0]
+    yield
+    db.execute(BUMP_VERSION_SQL)
+    for sql in CATCH_UP_SQL:
+        db.execute(sql, (last_id,))
+    for _, sql in triggers:
+        db.execute(sql)
+
+
+def import_jobs(
+    db: Optional[sqlite3.Connection],
+    records: Iterable[Record],
+    batch_size: int = 5000,
+    max_errors: int = 100,
+    write: Optional[Writer] = None,
+) -> dict[str, Any]:
+    """Insert records in batches, committing once per batch.
+
+    Invalid rows are reported and skipped without aborting the import. Only
+    the first ``max_errors`` errors are returned in detail. Each batch is
+    committed on ``db`` unless ``write`` is given to apply it elsewhere, such
+    as through a write queue, in which case ``db`` may be None.
+    """
+    if db is None and write is None:
+        raise ValueError("import_jobs needs a connection or a writer")
+    result: dict[str, Any] = {"inserted": 0, "failed": 0, "errors": []}
+
+    def commit(apply: Callable[[sqlite3.Connection], Any]) -> Any:
+        with db:
+            return apply(db)
+
+    write = write or commit
+
+    def fail(line_num: int, error: str) -> None:
+        result["failed"] += 1
+        if len(result["errors"]) < max_errors:
+            result["errors"].append({"line": line_num, "error": error})
+
+    def flush(batch: list[tuple[int, tuple]]) -> None:
+        def insert_all(conn: sqlite3.Connection) -> None:
+            with bulk_import(conn):
+                conn.executemany(INSERT_JOB_SQL, [params for _, params in batch])
+
+        def insert_each(conn: sqlite3.Connection) -> list[tuple[int, str]]:
+            errors = []
+            with bulk_import(conn):
+                for line_num, params in batch:
+                    try:
+                        conn.execute(INSERT_JOB_SQL, params)
+                    except sqlite3.IntegrityError as e:
+                        errors.append((line_num, str(e)))
+            return errors
+
+        try:
+            write(insert_all)
+            result["inserted"] += len(batch)
+        except sqlite3.IntegrityError:
+            # Fall back to row-by-row so the offending rows can be reported.
+            errors = write(insert_each)
+            result["inserted"] += len(batch) - len(errors)
+            for line_num, error in errors:
+                fail(line_num, error)
+
+    batch: list[tuple[int, tuple]] = []
+    for line_num, record, error in records:
+        if record is not None:
+            params, error = validate_job(record)
+        if error is not None:
+            fail(line_num, error)
+            continue
+        batch.append((line_num, params))
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return result
@@ -0,0 +1,292 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Iterator, Optional
+
+from flask import g, has_app_context, has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, shared by every latency histogram.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+# Upper bounds on the number of writes committed together by the write queue.
+BATCH_SIZE_BUCKETS: tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """A Prometheus-style histogram with one set of buckets per label combination."""
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        """Record one observation. Callers hold the registry lock."""
+        series = self._series.get(labels)
+        if series is None:
+            # One counter per bucket, then the sum and the total count.
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def count(self, labels: Labels) -> int:
+        """Return how many observations have been recorded for ``labels``."""
+        series = self._series.get(labels)
+        return int(series[-1]) if series else 0
+
+    def render(self) -> list[str]:
+        """Render the histogram in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(
+                    f"{self.name}_bucket{format_labels(labels + (('le', repr(bound)),))} {int(count)}"
+                )
+            lines.append(
+                f"{self.name}_bucket{format_labels(labels + (('le', '+Inf'),))} {int(series[-1])}"
+            )
+            lines.append(f"{self.name}_sum{format_labels(labels)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {int(series[-1])}")
+        return lines
+
+
+class Counter:
+    """A Prometheus-style counter with one value per label combination."""
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        """Increment the counter. Callers hold the registry lock."""
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels) -> float:
+        """Return the current value for ``labels``."""
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        """Render the counter in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{format_labels(labels)} {value:g}")
+        return lines
+
+
+def format_labels(labels: Labels) -> str:
+    """Format label pairs as ``{name="value",...}``, escaping values."""
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def statement_kind(sql: str) -> str:
+    """Return the leading keyword of a statement, e.g. SELECT or UPDATE."""
+    keyword = sql.lstrip().split(None, 1)[:1]
+    return keyword[0].upper() if keyword else "UNKNOWN"
+
+
+def current_endpoint() -> str:
+    """Return the endpoint of the current request, or 'none' outside a request."""
+    if has_request_context() and request.endpoint:
+        return request.endpoint
+    return "none"
+
+
+class Metrics:
+    """Thread-safe registry of request, query, connection and commit metrics."""
+
+    def __init__(self, slow_query_ms: float = 0) -> None:
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self.requests = Histogram(
+            "jobtracker_request_duration_seconds",
+            "Time spent handling requests, by endpoint, method and status.",
+        )
+        self.request_queries = Counter(
+            "jobtracker_request_queries_total",
+            "SQL statements executed while handling requests, by endpoint.",
+        )
+        self.queries = Histogram(
+            "jobtracker_query_duration_seconds",
+            "Time spent executing SQL statements, by statement kind.",
+        )
+        self.slow_queries = Counter(
+            "jobtracker_slow_queries_total",
+            "SQL statements slower than SLOW_QUERY_MS, by statement kind.",
+        )
+        self.connections = Histogram(
+            "jobtracker_db_connect_seconds",
+            "Time spent opening and configuring database connections.",
+        )
+        self.commits = Histogram(
+            "jobtracker_db_commit_seconds", "Time spent committing transactions."
+        )
+        self.cache_lookups = Counter(
+            "jobtracker_cache_lookups_total", "Cache lookups, by cache and result."
+        )
+        self.write_batches = Histogram(
+            "jobtracker_write_batch_size",
+            "Writes committed together by the write queue.",
+            buckets=BATCH_SIZE_BUCKETS,
+        )
+        self.write_rejections = Counter(
+            "jobtracker_write_rejections_total", "Writes refused because the write queue was full."
+        )
+
+    def observe_request(self, endpoint: str, method: str, status: int, seconds: float, queries: int) -> None:
+        """Record a finished request and the number of statements it ran."""
+        with self._lock:
+            self.requests.observe(
+                (("endpoint", endpoint), ("method", method), ("status", str(status))), seconds
+            )
+            self.request_queries.inc((("endpoint", endpoint),), queries)
+
+    def observe_query(self, sql: str, seconds: float, rows: int = 1) -> None:
+        """Record one statement, logging it if it exceeded the slow-query threshold.
+
+        ``rows`` is the number of parameter sets an ``executemany`` ran; the
+        threshold applies to the average time per set.
+        """
+        kind = statement_kind(sql)
+        per_row = seconds / max(rows, 1)
+        slow = self.slow_query_ms > 0 and per_row * 1000 >= self.slow_query_ms
+        with self._lock:
+            self.queries.observe((("kind", kind),), seconds)
+            if slow:
+                self.slow_queries.inc((("kind", kind),))
+        if slow:
+            logger.warning(
+                "Slow query (%.1fms%s) in %s: %s",
+                per_row * 1000,
+                f" per row over {rows} rows" if rows > 1 else "",
+                current_endpoint(),
+                " ".join(sql.split()),
+            )
+        if has_app_context():
+            g.query_count = g.get("query_count", 0) + 1
+
+    def observe_connect(self, seconds: float, readonly: bool) -> None:
+        """Record the time taken to open a pooled connection."""
+        with self._lock:
+            self.connections.observe((("readonly", str(readonly).lower()),), seconds)
+
+    def observe_commit(self, seconds: float) -> None:
+        """Record the time taken by one commit."""
+        with self._lock:
+            self.commits.observe((), seconds)
+
+    def observe_cache(self, cache: str, hit: bool) -> None:
+        """Record one cache lookup as a hit or a miss."""
+        with self._lock:
+            self.cache_lookups.inc((("cache", cache), ("result", "hit" if hit else "miss")))
+
+    def observe_write_batch(self, size: int) -> None:
+        """Record the number of writes in one group commit."""
+        with self._lock:
+            self.write_batches.observe((), size)
+
+    def observe_write_rejected(self) -> None:
+        """Record a write turned away by a full write queue."""
+        with self._lock:
+            self.write_rejections.inc(())
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            lines: list[str] = []
+            for metric in (
+                self.requests,
+                self.request_queries,
+                self.queries,
+                self.slow_queries,
+                self.connections,
+                self.commits,
+                self.cache_lookups,
+                self.write_batches,
+                self.write_rejections,
+            ):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """A connection that reports statement and commit timings to ``metrics``.
+
+    Statements are timed up to the first result row, which is when SQLite
+    does the work of a seek; rows fetched lazily afterwards are not included.
+    """
+
+    metrics: Optional[Metrics] = None
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        if self.metrics is None:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.metrics.observe_query(sql, time.perf_counter() - start)
+
+    def executemany(self, sql: str, parameters: Iterable[Any], /) -> sqlite3.Cursor:
+        if self.metrics is None:
+            return super().executemany(sql, parameters)
+        rows = 0
+
+        def counted() -> Iterator[Any]:
+            nonlocal rows
+            for row in parameters:
+                rows += 1
+                yield row
+
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, counted())
+        finally:
+            self.metrics.observe_query(sql, time.perf_counter() - start, rows)
+
+    def executescript(self, sql_script: str, /) -> sqlite3.Cursor:
+        if self.metrics is None:
+            return super().executescript(sql_script)
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self.metrics.observe_query("SCRIPT", time.perf_counter() - start)
+
+    def commit(self) -> None:
+        if self.metrics is None:
+            return super().commit()
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            self.metrics.observe_commit(time.perf_counter() - start)
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> Any:
+        # ``with db:`` commits in C without going through commit().
+        if self.metrics is None or exc_type is not None:
+            return super().__exit__(exc_type, exc, tb)
+        start = time.perf_counter()
+        try:
+            return super().__exit__(exc_type, exc, tb)
+        finally:
+            self.metrics.observe_commit(time.perf_counter() - start)
@@ -0,0 +1,260 @@
+import sqlite3
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Optional
+from urllib.parse import quote
+
+COLUMNS: list[str] = ["id", "company", "position", "status", "last_modified"]
+SORTED_COLUMNS: list[str] = ["id", "company", "position", "status", "last_modified"]
+STATUSES: list[str] = ["Applied", "Interviewed", "Accepted", "Declined"]
+
+# Beyond this share of the rows, a batch of changes is applied by reloading
+# everything rather than by patching every index array one row at a time;
+# bench_read_model puts the break-even point at about 1% of the rows.
+RELOAD_FRACTION = 0.01
+
+
+class ReadModel:
+    """An in-memory copy of the job listing, kept current from the change feed.
+
+    Column values live in lists indexed by job id (ids come from
+    AUTOINCREMENT, so the lists are dense), and for every sortable column
+    there is an ``array('q')`` of ids sorted by ``(column, id)``: one over all
+    jobs and one per status. A filtered, sorted page is then a bisect for the
+    cursor and a slice, with the same keyset semantics as the SQL listing.
+
+    The model reads through a connection of its own, so ``PRAGMA
+    data_version`` changes whenever anyone else commits; only then are the
+    new entries of the job_changes log applied to the arrays.
+    """
+
+    def __init__(self, database: str) -> None:
+        self.database = database
+        self.loads = 0
+        self.seq: Optional[int] = None
+        self._data_version: Optional[int] = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._values: dict[str, list[Any]] = {column: [] for column in COLUMNS[1:]}
+        self._indexes: dict[tuple[Optional[str], str], array] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexes.get((None, "id"), ()))
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(
+                f"file:{quote(self.database)}?mode=ro", uri=True, check_same_thread=False
+            )
+        return self._db
+
+    def close(self) -> None:
+        """Close the model's connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _key(self, column: str) -> Optional[Callable[[int], tuple]]:
+        """Return the sort key of an id in the ``column`` index."""
+        if column == "id":
+            return None
+        values = self._values[column]
+        return lambda job_id: (values[job_id], job_id)
+
+    def _load(self, db: sqlite3.Connection) -> None:
+        """Read every job and build the index arrays from scratch."""
+        # One read transaction, so the rows and the change log position agree.
+        db.execute("BEGIN")
+        try:
+            self.seq = db.execute(
+                "SELECT COALESCE((SELECT MAX(seq) FROM job_changes), seq)"
+                " FROM job_changes_horizon WHERE id = 0"
+            ).fetchone()[0]
+            rows = db.execute(f"SELECT {', '.join(COLUMNS)} FROM jobs ORDER BY id").fetchall()
+        finally:
+            db.execute("COMMIT")
+
+        size = rows[-1][0] + 1 if rows else 0
+        values: dict[str, list[Any]] = {column: [None] * size for column in COLUMNS[1:]}
+        ids = array("q")
+        by_status: dict[str, array] = {status: array("q") for status in STATUSES}
+        for job_id, company, position, status, last_modified in rows:
+            values["company"][job_id] = sys.intern(company)
+            values["position"][job_id] = position
+            values["status"][job_id] = sys.intern(status)
+            values["last_modified"][job_id] = last_modified
+            ids.append(job_id)
+            by_status.setdefault(status, array("q")).append(job_id)
+        self._values = values
+
+        # Ids are already ascending and sorted() is stable, so sorting by the
+        # column alone leaves ties in id order: exactly ORDER BY column, id.
+        indexes: dict[tuple[Optional[str], str], array] = {}
+        for bucket, bucket_ids in [(None, ids), *by_status.items()]:
+            indexes[(bucket, "id")] = bucket_ids
+            for column in SORTED_COLUMNS[1:]:
+                if bucket is not None and column == "status":
+                    indexes[(bucket, column)] = bucket_ids
+                    continue
+                indexes[(bucket, column)] = array(
+                    "q", sorted(bucket_ids, key=values[column].__getitem__)
+                )
+        self._indexes = indexes
+        self.loads += 1
+
+    def _remove(self, job_id: int) -> None:
+        """Take a job out of every index it is in."""
+        status = self._values["status"][job_id]
+        for bucket in (None, status):
+            for column in SORTED_COLUMNS:
+                if bucket is not None and column == "status":
+                    continue  # the same array as the bucket's id index
+                index = self._indexes[(bucket, column)]
+                key = self._key(column)
+                target = job_id if key is None else key(job_id)
+                position = bisect_left(index, target, key=key)
+                del index[position]
+        for column in COLUMNS[1:]:
+            self._values[column][job_id] = None
+
+    def _insert(self, job: tuple) -> None:
+        """Store a job and add it to the indexes of its status."""
+        job_id, company, position, status, last_modified = job
+        missing = job_id + 1 - len(self._values["company"])
+        if missing > 0:
+            for column in COLUMNS[1:]:
+                self._values[column].extend([None] * missing)
+        self._values["company"][job_id] = sys.intern(company)
+        self._values["position"][job_id] = position
+        self._values["status"][job_id] = sys.intern(status)
+        self._values["last_modified"][job_id] = last_modified
+        for bucket in (None, status):
+            if (bucket, "id") not in self._indexes:
+                self._indexes[(bucket, "id")] = array("q")
+                for column in SORTED_COLUMNS[1:]:
+                    self._indexes[(bucket, column)] = (
+                        self._indexes[(bucket, "id")] if column == "status" else array("q")
+                    )
+            for column in SORTED_COLUMNS:
+                if bucket is not None and column == "status":
+                    continue  # the same array as the bucket's id index
+                index = self._indexes[(bucket, column)]
+                key = self._key(column)
+                target = job_id if key is None else key(job_id)
+                index.insert(bisect_left(index, target, key=key), job_id)
+
+    def refresh(self) -> None:
+        """Bring the model up to date if anything was committed since the last refresh."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        db = self._connect()
+        data_version = db.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version and self.seq is not None:
+            return
+        self._data_version = data_version
+        if self.seq is None:
+            self._load(db)
+            return
+
+        # One read transaction, so a prune committed after the horizon check
+        # cannot take tombstones out of the log before they are read.
+        db.execute("BEGIN")
+        try:
+            horizon, latest = db.execute(
+                "SELECT seq, COALESCE((SELECT MAX(seq) FROM job_changes), seq)"
+                " FROM job_changes_horizon WHERE id = 0"
+            ).fetchone()
+            # Missed tombstones, or a re-initialised database.
+            stale = self.seq < horizon or self.seq > latest
+            changes = [] if stale else db.execute(
+                "SELECT c.seq, c.job_id, j.id, j.company, j.position, j.status, j.last_modified"
+                " FROM job_changes c LEFT JOIN jobs j ON j.id = c.job_id"
+                " WHERE c.seq > ? ORDER BY c.seq",
+                (self.seq,),
+            ).fetchall()
+        finally:
+            db.execute("COMMIT")
+        if stale or len(changes) > len(self) * RELOAD_FRACTION + 64:
+            self._load(db)
+            return
+        statuses = self._values["status"]
+        for change in changes:
+            job_id = change[1]
+            if job_id < len(statuses) and statuses[job_id] is not None:
+                self._remove(job_id)
+            if change[2] is not None:
+                self._insert(change[2:])
+        if changes:
+            self.seq = changes[-1][0]
+
+    def page(
+        self,
+        status: Optional[str],
+        sort_by: str,
+        order: str,
+        key: Optional[list[Any]] = None,
+        backwards: bool = False,
+        limit: Optional[int] = None,
+    ) -> Optional[list[dict[str, Any]]]:
+        """Return a page of jobs in display order, like ``get_jobs`` without search.
+
+        ``key`` is a decoded cursor; rows come after it, or before it when
+        ``backwards``. Returns None if the model cannot answer, e.g. for a
+        cursor whose value cannot be compared with the column, so the caller
+        can fall back to SQL.
+        """
+        with self._lock:
+            try:
+                self._refresh()
+            except TypeError:
+                # A NULL in a sorted column cannot be ordered against strings;
+                # leave such databases to SQL and try a full load next time.
+                self.seq = None
+                return None
+            bucket = status if status and status != "All" else None
+            if sort_by not in SORTED_COLUMNS:
+                return None
+            index = self._indexes.get((bucket, sort_by))
+            if index is None:
+                return []
+            sort_key = self._key(sort_by)
+            single_key = sort_key is None or (bucket is not None and sort_by == "status")
+            if key is not None and single_key:
+                # Sorting by id, or by a status every row in the bucket shares.
+                sort_key, target = None, key[-1]
+            elif key is not None:
+                target = tuple(key)
+
+            descending = order == "desc"
+            try:
+                if key is None:
+                    if descending:
+                        ids = index[-limit:] if limit else index[:]
+                    else:
+                        ids = index[:limit] if limit else index[:]
+                elif descending == backwards:
+                    start = bisect_right(index, target, key=sort_key)
+                    ids = index[start : start + limit] if limit else index[start:]
+                else:
+                    end = bisect_left(index, target, key=sort_key)
+                    ids = index[max(0, end - limit) : end] if limit else index[:end]
+            except TypeError:
+                return None
+            if descending:
+                ids = reversed(ids)
+            values = self._values
+            return [
+                {
+                    "id": job_id,
+                    "company": values["company"][job_id],
+                    "position": values["position"][job_id],
+                    "status": values["status"][job_id],
+                    "last_modified": values["last_modified"][job_id],
+                }
+                for job_id in ids
+            ]
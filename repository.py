@@ -0,0 +1,67 @@
+import json
+import sqlite3
+from typing import Optional
+
+# Statements are kept as constants so every call passes the same SQL text and
+# sqlite3's per-connection statement cache (and the connection pool keeping
+# connections alive between requests) means each one is prepared only once.
+GET_JOB_SQL = "SELECT id, company, position, status, last_modified FROM jobs WHERE id = ?"
+ADD_JOB_SQL = "INSERT INTO jobs (company, position, status) VALUES (?, ?, ?) RETURNING id"
+UPDATE_JOB_SQL = (
+    "UPDATE jobs SET company = ?, position = ?, status = ?, last_modified = CURRENT_TIMESTAMP"
+    " WHERE id = ? RETURNING id, company, position, status, last_modified"
+)
+UPDATE_STATUS_SQL = (
+    "UPDATE jobs SET status = ?, last_modified = CURRENT_TIMESTAMP"
+    " WHERE id = ? RETURNING id, company, position, status, last_modified"
+)
+UPDATE_STATUSES_SQL = (
+    "UPDATE jobs SET status = updates.value, last_modified = CURRENT_TIMESTAMP"
+    " FROM json_each(?) AS updates WHERE jobs.id = CAST(updates.key AS INTEGER)"
+    " RETURNING jobs.id"
+)
+DELETE_JOB_SQL = "DELETE FROM jobs WHERE id = ? RETURNING id"
+
+
+class JobRepository:
+    """Single-job reads and writes, one statement each.
+
+    Writes use RETURNING, so a missing job is detected by the write itself
+    instead of a separate existence check. Committing is left to the caller.
+    Listing and search queries are built by ``build_jobs_query`` in app.py.
+    """
+
+    def __init__(self, db: sqlite3.Connection) -> None:
+        self.db = db
+
+    def _returning(self, sql: str, params: tuple) -> Optional[sqlite3.Row]:
+        # Exhaust the cursor so the statement is finished before any commit.
+        rows = self.db.execute(sql, params).fetchall()
+        return rows[0] if rows else None
+
+    def get(self, job_id: int) -> Optional[sqlite3.Row]:
+        """Return a job, or None if it does not exist."""
+        return self.db.execute(GET_JOB_SQL, (job_id,)).fetchone()
+
+    def add(self, company: str, position: str, status: str) -> int:
+        """Insert a job and return its id."""
+        return self._returning(ADD_JOB_SQL, (company, position, status))["id"]
+
+    def update(
+        self, job_id: int, company: str, position: str, status: str
+    ) -> Optional[sqlite3.Row]:
+        """Overwrite a job's fields, returning the updated job or None if it does not exist."""
+        return self._returning(UPDATE_JOB_SQL, (company, position, status, job_id))
+
+    def update_status(self, job_id: int, status: str) -> Optional[sqlite3.Row]:
+        """Set a job's status, returning the updated job or None if it does not exist."""
+        return self._returning(UPDATE_STATUS_SQL, (status, job_id))
+
+    def update_statuses(self, statuses: dict[int, str]) -> set[int]:
+        """Set the status of many jobs in one statement, returning the ids that exist."""
+        rows = self.db.execute(UPDATE_STATUSES_SQL, (json.dumps(statuses),)).fetchall()
+        return {row[0] for row in rows}
+
+    def delete(self, job_id: int) -> bool:
+        """Delete a job, returning whether it existed."""
+        return self._returning(DELETE_JOB_SQL, (job_id,)) is not None
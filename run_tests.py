@@ -1,8 +1,12 @@
+import argparse
 import subprocess
 import sys
 import os
 import importlib.util
-from typing import List, Tuple
+import shutil
+import tempfile
+import time
+from typing import List, Optional, Tuple
 
 TEST_FILE: str = "tests.py"
 COVERAGE_MODULE: str = "app"
@@ -132,8 +136,122 @@ def run_tests() -> bool:
         return False
 
 
+def collect_tests() -> List[str]:
+    """
+    Return the node ids of every test in the test file.
+    """
+    cmd: List[str] = [sys.executable, "-m", "pytest", TEST_FILE, "--collect-only", "-q"]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    return [line for line in result.stdout.splitlines() if "::" in line]
+
+
+def shard_tests(tests: List[str], workers: int) -> List[List[str]]:
+    """
+    Split tests into at most ``workers`` shards, dealing them out in turn so
+    the tests of one slow class are spread over the workers.
+    """
+    shards: List[List[str]] = [tests[i::workers] for i in range(workers)]
+    return [shard for shard in shards if shard]
+
+
+def time_serial_run() -> float:
+    """
+    Return the wall-clock seconds of a quiet serial run, as the speedup baseline.
+    """
+    cmd: List[str] = [sys.executable, "-m", "pytest", TEST_FILE, "-q", "-p", "no:cacheprovider"]
+    start: float = time.perf_counter()
+    subprocess.run(cmd, capture_output=True, text=True, check=False)
+    return time.perf_counter() - start
+
+
+def run_tests_parallel(workers: int, compare: bool = False) -> bool:
+    """
+    Run the tests in ``workers`` pytest processes at once and report the wall
+    clock time, and with ``compare`` the speedup over a serial run timed first.
+
+    Each worker gets a temporary directory of its own as TMPDIR, so the
+    databases its tests create never collide with another worker's.
+    """
+    print("\n" + "=" * 50)
+    print(f"Running Flask Job Tracker Tests on {workers} workers")
+    print("=" * 50)
+
+    tests: List[str] = collect_tests()
+    if not tests:
+        print("Error: No tests were collected.")
+        return False
+    shards: List[List[str]] = shard_tests(tests, workers)
+    print(f"Sharded {len(tests)} tests over {len(shards)} workers.")
+
+    serial: Optional[float] = None
+    if compare:
+        print("Timing a serial run for comparison...")
+        serial = time_serial_run()
+
+    start: float = time.perf_counter()
+    running: List[Tuple[subprocess.Popen, str]] = []
+    for shard in shards:
+        tmpdir: str = tempfile.mkdtemp(prefix="jobtracker-tests-")
+        cmd: List[str] = [
+            sys.executable,
+            "-m",
+            "pytest",
+            *shard,
+            "-q",
+            "--tb=short",
+            "--color=yes",
+            "-p",
+            "no:cacheprovider",
+        ]
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env={**os.environ, "TMPDIR": tmpdir},
+        )
+        running.append((process, tmpdir))
+
+    success: bool = True
+    outputs: List[str] = []
+    for process, tmpdir in running:
+        outputs.append(process.communicate()[0])
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        if process.returncode != 0:
+            success = False
+    wall: float = time.perf_counter() - start
+
+    for i, output in enumerate(outputs, 1):
+        print(f"\n--- Worker {i} ({len(shards[i - 1])} tests) ---")
+        print(output.strip())
+    print("\n" + "=" * 50)
+    print(f"{len(shards)} workers: {wall:.2f}s")
+    if serial is not None:
+        print(f"Serial: {serial:.2f}s, speedup: {serial / wall:.2f}x on {os.cpu_count()} CPUs")
+    print("=" * 50)
+    if not success:
+        print("Some tests failed! Please review the output above for details.")
+    return success
+
+
 def main() -> None:
     """Main function to run the tests."""
+    parser = argparse.ArgumentParser(description="Run the Flask Job Tracker tests.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of pytest processes to shard the tests across (default 1, serial)",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="with --workers, time a serial run first and report the speedup",
+    )
+    args = parser.parse_args()
+    if args.compare and args.workers <= 1:
+        parser.error("--compare requires --workers > 1")
+
     print("Flask Job Tracker - Testing")
     print("=" * 10 + "\n")
 
@@ -144,7 +262,10 @@ def main() -> None:
         print("\nAborting tests due to missing files or configuration.")
         sys.exit(1)
 
-    success: bool = run_tests()
+    if args.workers > 1:
+        success: bool = run_tests_parallel(args.workers, compare=args.compare)
+    else:
+        success = run_tests()
 
     if success:
         print("\nTests completed successfully!")
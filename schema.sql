@@ -1,4 +1,18 @@
+-- Lets `flask maintain-db` return the pages freed by archiving to the OS. It
+-- only takes effect on a file that has no tables yet and is not in WAL mode;
+-- `flask init-db` vacuums the fresh schema to apply it either way.
+PRAGMA auto_vacuum = INCREMENTAL;
+
 DROP TABLE IF EXISTS jobs;
+DROP TABLE IF EXISTS jobs_archive;
+DROP TABLE IF EXISTS db_version;
+DROP TABLE IF EXISTS jobs_fts;
+DROP TABLE IF EXISTS job_status_counts;
+DROP TABLE IF EXISTS job_changes;
+DROP TABLE IF EXISTS job_changes_horizon;
+DROP TABLE IF EXISTS job_status_history;
+DROP TABLE IF EXISTS job_transitions_daily;
+DROP TABLE IF EXISTS job_stage_durations;
 
 CREATE TABLE jobs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -9,7 +23,227 @@ CREATE TABLE jobs (
     last_modified TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- One index per listing shape that get_jobs generates. Every index ends with the
+-- implicit rowid, so (col) and (status, col) already match ORDER BY col, id and
+-- the (col, id) keyset seek without a temp B-tree sort. Check plans with
+-- `flask explain-queries`.
 CREATE INDEX idx_jobs_status ON jobs(status);
 CREATE INDEX idx_jobs_company ON jobs(company);
 CREATE INDEX idx_jobs_position ON jobs(position);
-CREATE INDEX idx_jobs_last_modified ON jobs(last_modified);
\ No newline at end of file
+CREATE INDEX idx_jobs_last_modified ON jobs(last_modified);
+CREATE INDEX idx_jobs_status_company ON jobs(status, company);
+CREATE INDEX idx_jobs_status_position ON jobs(status, position);
+CREATE INDEX idx_jobs_status_last_modified ON jobs(status, last_modified);
+
+-- Closed jobs moved out of jobs by `flask archive-jobs`, keeping their ids.
+-- Only read when a listing asks for include_archived, so it has no indexes
+-- beyond its primary key and its rows are in neither jobs_fts nor the
+-- status counts.
+CREATE TABLE jobs_archive (
+    id INTEGER PRIMARY KEY,
+    company TEXT NOT NULL,
+    position TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TIMESTAMP,
+    last_modified TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Change token bumped by every write to jobs, used for ETags and cache validation.
+CREATE TABLE db_version (
+    id INTEGER PRIMARY KEY CHECK(id = 0),
+    version INTEGER NOT NULL
+);
+
+-- Start from a random token so a re-initialised database never reuses the
+-- tokens (and so the ETags and cached pages) of the one it replaced.
+INSERT INTO db_version (id, version) VALUES (0, abs(random() >> 16));
+
+CREATE TRIGGER jobs_version_insert AFTER INSERT ON jobs
+BEGIN
+    UPDATE db_version SET version = version + 1 WHERE id = 0;
+END;
+
+CREATE TRIGGER jobs_version_update AFTER UPDATE ON jobs
+BEGIN
+    UPDATE db_version SET version = version + 1 WHERE id = 0;
+END;
+
+CREATE TRIGGER jobs_version_delete AFTER DELETE ON jobs
+BEGIN
+    UPDATE db_version SET version = version + 1 WHERE id = 0;
+END;
+
+-- Full-text index over company and position, kept in sync with jobs by triggers.
+CREATE VIRTUAL TABLE jobs_fts USING fts5(
+    company,
+    position,
+    content='jobs',
+    content_rowid='id',
+    prefix='2 3'
+);
+
+-- Rank company matches above position matches.
+INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0)');
+
+CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs
+BEGIN
+    INSERT INTO jobs_fts (rowid, company, position) VALUES (new.id, new.company, new.position);
+END;
+
+CREATE TRIGGER jobs_fts_delete AFTER DELETE ON jobs
+BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, company, position)
+    VALUES ('delete', old.id, old.company, old.position);
+END;
+
+CREATE TRIGGER jobs_fts_update AFTER UPDATE OF company, position ON jobs
+BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, company, position)
+    VALUES ('delete', old.id, old.company, old.position);
+    INSERT INTO jobs_fts (rowid, company, position) VALUES (new.id, new.company, new.position);
+END;
+
+-- Number of jobs per status, maintained by triggers so the filter tabs never scan jobs.
+CREATE TABLE job_status_counts (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT INTO job_status_counts (status, count)
+VALUES ('Applied', 0), ('Interviewed', 0), ('Accepted', 0), ('Declined', 0);
+
+CREATE TRIGGER jobs_counts_insert AFTER INSERT ON jobs
+BEGIN
+    UPDATE job_status_counts SET count = count + 1 WHERE status = new.status;
+END;
+
+CREATE TRIGGER jobs_counts_delete AFTER DELETE ON jobs
+BEGIN
+    UPDATE job_status_counts SET count = count - 1 WHERE status = old.status;
+END;
+
+CREATE TRIGGER jobs_counts_update AFTER UPDATE OF status ON jobs
+WHEN old.status != new.status
+BEGIN
+    UPDATE job_status_counts SET count = count - 1 WHERE status = old.status;
+    UPDATE job_status_counts SET count = count + 1 WHERE status = new.status;
+END;
+
+-- Change feed served by GET /changes. Each job keeps only its latest entry
+-- (INSERT OR REPLACE on the unique job_id), so the log is compacted as it is
+-- written and holds at most one row per job plus the tombstones of deleted jobs.
+CREATE TABLE job_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL UNIQUE,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX idx_job_changes_tombstones ON job_changes(seq) WHERE deleted = 1;
+
+-- Tombstones more than `retention` changes old are pruned. Clients that last
+-- synced at or before `seq` may have missed a delete and must reload.
+CREATE TABLE job_changes_horizon (
+    id INTEGER PRIMARY KEY CHECK(id = 0),
+    seq INTEGER NOT NULL,
+    retention INTEGER NOT NULL
+);
+
+-- Like db_version, start from a random sequence number so clients of a
+-- re-initialised database are told to reload instead of missing changes.
+INSERT INTO job_changes_horizon (id, seq, retention) VALUES (0, abs(random() >> 16), 10000);
+INSERT INTO sqlite_sequence (name, seq)
+SELECT 'job_changes', seq FROM job_changes_horizon WHERE id = 0;
+
+CREATE TRIGGER jobs_changes_insert AFTER INSERT ON jobs
+BEGIN
+    INSERT OR REPLACE INTO job_changes (job_id, deleted) VALUES (new.id, 0);
+END;
+
+CREATE TRIGGER jobs_changes_update AFTER UPDATE ON jobs
+BEGIN
+    INSERT OR REPLACE INTO job_changes (job_id, deleted) VALUES (new.id, 0);
+END;
+
+CREATE TRIGGER jobs_changes_delete AFTER DELETE ON jobs
+BEGIN
+    INSERT OR REPLACE INTO job_changes (job_id, deleted) VALUES (old.id, 1);
+END;
+
+CREATE TRIGGER job_changes_prune AFTER INSERT ON job_changes
+WHEN new.deleted = 1
+BEGIN
+    UPDATE job_changes_horizon
+    SET seq = MAX(seq, new.seq - retention)
+    WHERE id = 0;
+    DELETE FROM job_changes
+    WHERE deleted = 1 AND seq <= (SELECT seq FROM job_changes_horizon WHERE id = 0);
+END;
+
+-- Append-only log of status transitions, written by triggers in the same
+-- transaction as the change. from_status is NULL when a job is created, and
+-- stage_seconds is how long the job spent in from_status.
+CREATE TABLE job_status_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    from_status TEXT,
+    to_status TEXT NOT NULL,
+    changed_at TIMESTAMP NOT NULL,
+    stage_seconds INTEGER
+);
+
+CREATE INDEX idx_job_status_history_job ON job_status_history(job_id);
+
+CREATE TRIGGER jobs_history_insert AFTER INSERT ON jobs
+BEGIN
+    INSERT INTO job_status_history (job_id, from_status, to_status, changed_at)
+    VALUES (new.id, NULL, new.status, COALESCE(new.created_at, CURRENT_TIMESTAMP));
+END;
+
+CREATE TRIGGER jobs_history_update AFTER UPDATE OF status ON jobs
+WHEN old.status != new.status
+BEGIN
+    INSERT INTO job_status_history (job_id, from_status, to_status, changed_at, stage_seconds)
+    VALUES (
+        new.id,
+        old.status,
+        new.status,
+        CURRENT_TIMESTAMP,
+        MAX(0, CAST(ROUND((julianday(CURRENT_TIMESTAMP) - julianday(COALESCE(
+            (SELECT changed_at FROM job_status_history
+             WHERE job_id = new.id ORDER BY id DESC LIMIT 1),
+            old.created_at
+        ))) * 86400) AS INTEGER))
+    );
+END;
+
+-- Rollups behind GET /analytics, maintained incrementally from the history so
+-- the dashboard never reads it: transitions per day (from_status '' for new
+-- jobs), and per transition a histogram of whole days spent in the stage,
+-- capped at 365.
+CREATE TABLE job_transitions_daily (
+    day TEXT NOT NULL,
+    from_status TEXT NOT NULL,
+    to_status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, from_status, to_status)
+) WITHOUT ROWID;
+
+CREATE TABLE job_stage_durations (
+    from_status TEXT NOT NULL,
+    to_status TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (from_status, to_status, days)
+) WITHOUT ROWID;
+
+CREATE TRIGGER job_status_history_rollup AFTER INSERT ON job_status_history
+BEGIN
+    INSERT INTO job_transitions_daily (day, from_status, to_status, count)
+    VALUES (date(new.changed_at), COALESCE(new.from_status, ''), new.to_status, 1)
+    ON CONFLICT (day, from_status, to_status) DO UPDATE SET count = count + 1;
+    INSERT INTO job_stage_durations (from_status, to_status, days, count)
+    SELECT new.from_status, new.to_status, MIN(new.stage_seconds / 86400, 365), 1
+    WHERE new.stage_seconds IS NOT NULL
+    ON CONFLICT (from_status, to_status, days) DO UPDATE SET count = count + 1;
+END;
@@ -1,8 +1,28 @@
 import pytest
 import sqlite3
+import gzip
 import os
+import re
 import tempfile
-from app import app, get_db
+import threading
+from app import (
+    create_app,
+    get_db,
+    get_jobs_page,
+    build_fts_query,
+    format_datetime_filter,
+    format_datetimes,
+    format_timestamp,
+    get_read_model,
+)
+from archive import maintain
+from jobs_io import BULK_SKIPPED_TRIGGERS
+from caching import LRUCache
+import app as app_module
+from db import close_pools
+import write_queue as write_queue_module
+from write_queue import WriteQueue, WriteQueueClosed, close_write_queues, get_write_queue
+from metrics import Metrics
 import json
 from typing import List, Dict, Any, Optional, Generator
 from flask import Flask
@@ -10,25 +30,60 @@ from flask.testing import FlaskClient
 from werkzeug.wrappers import Response as WerkzeugResponse
 
 
+def remove_database(db_fd: int, db_path: str) -> None:
+    """Close and delete a temporary database along with its WAL and shared-memory files."""
+    os.close(db_fd)
+    for path in (db_path, db_path + "-wal", db_path + "-shm"):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+@pytest.fixture(scope="session")
+def template_db() -> Generator[str, None, None]:
+    """Build the schema once per test process, for every test to clone."""
+    db_fd: int
+    db_path: str
+    db_fd, db_path = tempfile.mkstemp()
+    flask_app: Flask = create_app(
+        {"DATABASE": db_path, "TESTING": True, "SECRET_KEY": "test-secret-key"}
+    )
+    with flask_app.app_context():
+        flask_app.test_cli_runner().invoke(args=["init-db"])
+    close_pools(flask_app)
+    yield db_path
+
+    remove_database(db_fd, db_path)
+
+
 @pytest.fixture
-def client() -> Generator[FlaskClient, None, None]:
-    """Create a test client with a temp database."""
+def app(template_db: str) -> Generator[Flask, None, None]:
+    """Create an app with a temp database cloned from the template."""
     db_fd: int
     db_path: str
     db_fd, db_path = tempfile.mkstemp()
-    app.config["DATABASE"] = db_path
-    app.config["TESTING"] = True
-    app.config["SECRET_KEY"] = "test-secret-key"
+    # The backup API copies the pages as they are, which is much cheaper than
+    # running schema.sql (and the VACUUM init-db follows it with) every time.
+    with sqlite3.connect(template_db) as source, sqlite3.connect(db_path) as target:
+        source.backup(target)
+    source.close()
+    target.close()
+    flask_app: Flask = create_app(
+        {"DATABASE": db_path, "TESTING": True, "SECRET_KEY": "test-secret-key"}
+    )
+    yield flask_app
 
-    flask_app: Flask = app
+    close_write_queues(flask_app)
+    close_pools(flask_app)
+    for model in flask_app.extensions["read_models"].values():
+        model.close()
+    remove_database(db_fd, db_path)
 
-    with flask_app.test_client() as current_client:
-        with flask_app.app_context():
-            app.test_cli_runner().invoke(args=["init-db"])
-        yield current_client
 
-    os.close(db_fd)
-    os.unlink(flask_app.config["DATABASE"])
+@pytest.fixture
+def client(app: Flask) -> Generator[FlaskClient, None, None]:
+    """Create a test client for the app."""
+    with app.test_client() as current_client:
+        yield current_client
 
 
 @pytest.fixture
@@ -92,7 +147,7 @@ class TestJobEditing:
         status: str = "Applied",
     ) -> Optional[int]:
         """Helper method to add a test job directly to the database and return its ID."""
-        flask_app: Flask = app
+        flask_app: Flask = client.application
         with flask_app.app_context():
             db: sqlite3.Connection = get_db()
             db.execute(
@@ -140,7 +195,7 @@ class TestJobDeletion:
         status: str = "Applied",
     ) -> Optional[int]:
         """Helper method to add a test job directly to the database and return its ID."""
-        flask_app: Flask = app
+        flask_app: Flask = client.application
         with flask_app.app_context():
             db: sqlite3.Connection = get_db()
             db.execute(
@@ -181,7 +236,7 @@ class TestStatusUpdate:
         status: str = "Applied",
     ) -> Optional[int]:
         """Helper method to add a test job directly to the database and return its ID."""
-        flask_app: Flask = app
+        flask_app: Flask = client.application
         with flask_app.app_context():
             db: sqlite3.Connection = get_db()
             db.execute(
@@ -211,7 +266,7 @@ class TestStatusUpdate:
         data: Dict[str, Any] = json.loads(response.data)
         assert data["message"] == "Status updated successfully"
 
-        flask_app: Flask = app
+        flask_app: Flask = client.application
         with flask_app.app_context():
             db: sqlite3.Connection = get_db()
             cursor: sqlite3.Cursor = db.execute(
@@ -221,6 +276,49 @@ class TestStatusUpdate:
             assert job is not None
             assert job["status"] == "Interviewed"
 
+    def test_update_status_batch(self, client: FlaskClient) -> None:
+        """Test updating several statuses in one request with per-id results."""
+        first: Optional[int] = self.add_test_job(client, company="Amazon")
+        second: Optional[int] = self.add_test_job(client, company="Atlassian")
+
+        response: WerkzeugResponse = client.post(
+            "/update_status/batch",
+            json={
+                "updates": [
+                    {"id": first, "status": "Interviewed"},
+                    {"id": second, "status": "Declined"},
+                    {"id": 9999, "status": "Accepted"},
+                    {"id": first, "status": "Ghosted"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        data: Dict[str, Any] = json.loads(response.data)
+        assert data["updated"] == 2
+        assert [result.get("error") for result in data["results"]] == [
+            None,
+            None,
+            "Not found",
+            "Invalid status",
+        ]
+
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            db: sqlite3.Connection = get_db()
+            statuses: Dict[int, str] = {
+                row["id"]: row["status"] for row in db.execute("SELECT id, status FROM jobs")
+            }
+        assert statuses == {first: "Interviewed", second: "Declined"}
+
+    def test_update_status_batch_rejects_non_list(self, client: FlaskClient) -> None:
+        """Test a malformed batch payload is rejected."""
+        response: WerkzeugResponse = client.post(
+            "/update_status/batch", json={"updates": "nope"}
+        )
+
+        assert response.status_code == 400
+
 
 class TestFiltering:
     """Test job filtering and sorting functionality."""
@@ -265,5 +363,1606 @@ class TestFiltering:
         assert amazon_position < google_position
 
 
+class TestPagination:
+    """Test keyset pagination of the job list."""
+
+    def add_jobs(self, client: FlaskClient, count: int) -> None:
+        """Add numbered jobs directly to the database."""
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            db: sqlite3.Connection = get_db()
+            db.executemany(
+                "INSERT INTO jobs (company, position, status) VALUES (?, ?, ?)",
+                [(f"Company {i:02d}", "Engineer", "Applied") for i in range(count)],
+            )
+            db.commit()
+
+    def test_pages_cover_every_job_once(self, client: FlaskClient) -> None:
+        """Test following next cursors visits every job exactly once in order."""
+        self.add_jobs(client, 25)
+        seen: List[str] = []
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            cursor: Optional[str] = None
+            while True:
+                jobs, cursor, _ = get_jobs_page(
+                    sort_by="company", order="desc", after=cursor, per_page=10
+                )
+                seen.extend(job["company"] for job in jobs)
+                if cursor is None:
+                    break
+
+        assert seen == [f"Company {i:02d}" for i in reversed(range(25))]
+
+    def test_previous_cursor_returns_previous_page(self, client: FlaskClient) -> None:
+        """Test the previous cursor leads back to the page before."""
+        self.add_jobs(client, 25)
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            first, next_cursor, prev_cursor = get_jobs_page(sort_by="company", per_page=10)
+            assert prev_cursor is None
+            second, _, prev_cursor = get_jobs_page(
+                sort_by="company", after=next_cursor, per_page=10
+            )
+            back, _, _ = get_jobs_page(sort_by="company", before=prev_cursor, per_page=10)
+
+        assert [job["id"] for job in back] == [job["id"] for job in first]
+        assert second[0]["company"] == "Company 10"
+
+    def test_pages_through_duplicate_sort_values(self, client: FlaskClient) -> None:
+        """Test paging on a column with many equal values in both directions."""
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            db: sqlite3.Connection = get_db()
+            db.executemany(
+                "INSERT INTO jobs (company, position, status) VALUES (?, ?, ?)",
+                [(f"Company {i:02d}", "Engineer", ("Applied", "Declined")[i % 2]) for i in range(30)],
+            )
+            db.commit()
+            expected: List[int] = [
+                row["id"]
+                for row in db.execute("SELECT id FROM jobs ORDER BY status DESC, id DESC")
+            ]
+
+            for status in ["All", "Declined"]:
+                seen: List[int] = []
+                cursor: Optional[str] = None
+                while True:
+                    jobs, cursor, _ = get_jobs_page(
+                        status, sort_by="status", order="desc", after=cursor, per_page=4
+                    )
+                    seen.extend(job["id"] for job in jobs)
+                    if cursor is None:
+                        break
+                subset: List[int] = [
+                    job_id for job_id in expected if status == "All" or job_id % 2 == 0
+                ]
+                assert seen == subset
+
+            cursor = None
+            pages: List[List[int]] = []
+            for _ in range(4):
+                jobs, cursor, prev_cursor = get_jobs_page(
+                    sort_by="status", order="desc", after=cursor, per_page=4
+                )
+                pages.append([job["id"] for job in jobs])
+            back, _, _ = get_jobs_page(
+                sort_by="status", order="desc", before=prev_cursor, per_page=4
+            )
+            assert [job["id"] for job in back] == pages[2]
+
+    def test_index_renders_next_link(self, client: FlaskClient) -> None:
+        """Test the index page limits rows and links to the next page."""
+        self.add_jobs(client, 5)
+        response: WerkzeugResponse = client.get("/?per_page=2")
+
+        assert response.status_code == 200
+        assert b"Company 01" in response.data
+        assert b"Company 02" not in response.data
+        assert b"after=" in response.data
+
+
+class TestStreaming:
+    """Test the streaming mode of the index page."""
+
+    def test_stream_renders_every_job(self, client: FlaskClient) -> None:
+        """Test streaming mode ignores paging and renders all matching jobs."""
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            db: sqlite3.Connection = get_db()
+            db.executemany(
+                "INSERT INTO jobs (company, position, status) VALUES (?, ?, ?)",
+                [(f"Company {i:03d}", "Engineer", "Applied") for i in range(120)],
+            )
+            db.commit()
+
+        response: WerkzeugResponse = client.get("/?stream=1&per_page=10")
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert b"Company 000" in response.data
+        assert b"Company 119" in response.data
+
+    def test_stream_consumes_flash_message(self, client: FlaskClient) -> None:
+        """Test a flash shown in a streamed page is not shown again."""
+        client.post(
+            "/add",
+            data={"company": "Google", "position": "Engineer", "status": "Applied"},
+        )
+
+        first: WerkzeugResponse = client.get("/?stream=1")
+        second: WerkzeugResponse = client.get("/?stream=1")
+
+        assert b"Job application added successfully!" in first.data
+        assert b"Job application added successfully!" not in second.data
+
+
+class TestConnectionPool:
+    """Test pooled, tuned database connections."""
+
+    def test_connection_is_reused(self, client: FlaskClient) -> None:
+        """Test a released connection is handed out again."""
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            first: sqlite3.Connection = get_db()
+        with flask_app.app_context():
+            second: sqlite3.Connection = get_db()
+
+        assert first is second
+
+    def test_pragmas_are_applied(self, client: FlaskClient) -> None:
+        """Test connections use WAL mode and a busy timeout."""
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            db: sqlite3.Connection = get_db()
+            assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert db.execute("PRAGMA synchronous").fetchone()[0] == 1
+            assert db.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+    def test_get_requests_use_read_only_connection(self, client: FlaskClient) -> None:
+        """Test GET requests cannot write through their connection."""
+        flask_app: Flask = client.application
+        with flask_app.test_request_context("/", method="GET"):
+            db: sqlite3.Connection = get_db()
+            with pytest.raises(sqlite3.OperationalError):
+                db.execute(
+                    "INSERT INTO jobs (company, position, status) VALUES ('a', 'b', 'Applied')"
+                )
+
+
+class TestDatetimeFormatting:
+    """Test the cached timezone formatting helpers."""
+
+    def test_format_in_named_timezone(self) -> None:
+        """Test a UTC timestamp is converted to the requested zone."""
+        assert (
+            format_timestamp("2025-06-02 10:00:00", "Australia/Adelaide")
+            == "2025/06/02 19:30:00 ACST+0930"
+        )
+
+    def test_unknown_timezone_falls_back_to_utc(self) -> None:
+        """Test an unknown zone name formats the timestamp as UTC."""
+        assert (
+            format_timestamp("2025-06-02 10:00:00", "Not/AZone")
+            == "2025/06/02 10:00:00 UTC"
+        )
+
+    def test_cache_size_is_read_when_the_app_is_created(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test FORMAT_CACHE_SIZE from the environment or .env, loaded by create_app, is used."""
+        monkeypatch.setenv("FORMAT_CACHE_SIZE", "7")
+        create_app({"SECRET_KEY": "test"})
+        for day in range(1, 11):
+            format_timestamp(f"2025-06-{day:02} 10:00:00", "UTC")
+
+        assert app_module._format_cached.cache_info().currsize == 7
+        create_app({"SECRET_KEY": "test", "FORMAT_CACHE_SIZE": 4096})
+        assert app_module._format_cached.cache_info().maxsize == 4096
+
+    def test_bulk_matches_filter(self, app: Flask) -> None:
+        """Test the bulk path agrees with the per-row filter and skips empty values."""
+        timestamps: List[Optional[str]] = [
+            "2025-06-02 10:00:00",
+            None,
+            "2025-06-02 10:00:00",
+            "2024-12-25 23:59:59",
+        ]
+        with app.app_context():
+            formatted: Dict[str, str] = format_datetimes(timestamps)
+
+            assert len(formatted) == 2
+            for timestamp, value in formatted.items():
+                assert value == format_datetime_filter(timestamp)
+            assert format_datetime_filter(None) == ""
+
+    def test_bulk_handles_daylight_saving_change(self) -> None:
+        """Test the bulk path picks the right offset either side of a DST change."""
+        formatted: Dict[str, str] = format_datetimes(
+            ["2025-04-05 16:29:59", "2025-04-05 16:30:00"], "Australia/Adelaide"
+        )
+
+        assert formatted["2025-04-05 16:29:59"] == "2025/04/06 02:59:59 ACDT+1030"
+        assert formatted["2025-04-05 16:30:00"] == "2025/04/06 02:00:00 ACST+0930"
+
+
+class TestBulkImport:
+    """Test bulk importing jobs from CSV and JSON Lines."""
+
+    def count_jobs(self, client: FlaskClient) -> int:
+        """Return the number of jobs in the database."""
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            return get_db().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def test_bulk_csv_reports_invalid_rows(self, client: FlaskClient) -> None:
+        """Test invalid CSV rows are reported without aborting the import."""
+        body: str = (
+            "company,position,status,created_at\n"
+            "Google,Software Engineer,Applied,2024-01-02 03:04:05\n"
+            "Amazon,Data Analyst,Ghosted,\n"
+            "Meta,Test Engineer,Declined,\n"
+        )
+        response: WerkzeugResponse = client.post(
+            "/jobs/bulk", data=body, content_type="text/csv"
+        )
+
+        assert response.status_code == 200
+        data: Dict[str, Any] = json.loads(response.data)
+        assert data["inserted"] == 2
+        assert data["failed"] == 1
+        assert data["errors"] == [{"line": 3, "error": "Invalid status!"}]
+        assert self.count_jobs(client) == 2
+
+    def test_bulk_jsonl_upload(self, client: FlaskClient) -> None:
+        """Test importing an uploaded JSON Lines file in small batches."""
+        import io
+
+        lines: str = "\n".join(
+            json.dumps({"company": f"Company {i}", "position": "Engineer", "status": "Applied"})
+            for i in range(7)
+        )
+        client.application.config["IMPORT_BATCH_SIZE"] = 3
+        try:
+            response: WerkzeugResponse = client.post(
+                "/jobs/bulk",
+                data={"file": (io.BytesIO((lines + "\nnot json\n").encode()), "jobs.jsonl")},
+                content_type="multipart/form-data",
+            )
+        finally:
+            client.application.config["IMPORT_BATCH_SIZE"] = 5000
+
+        data: Dict[str, Any] = json.loads(response.data)
+        assert data["inserted"] == 7
+        assert data["failed"] == 1
+        assert self.count_jobs(client) == 7
+
+    def test_bulk_rejects_non_string_fields(self, client: FlaskClient) -> None:
+        """Test JSON values that are not strings are reported rather than stringified."""
+        records: List[Dict[str, Any]] = [
+            {"company": ["a"], "position": "Engineer", "status": "Applied"},
+            {"company": 0, "position": "Engineer", "status": "Applied"},
+            {"company": "Google", "position": {"title": "SRE"}, "status": "Applied"},
+            {"company": "Google", "position": "SRE", "status": None},
+            {"company": "Google", "position": "SRE", "status": "Applied"},
+        ]
+        body: str = "\n".join(json.dumps(record) for record in records)
+
+        response: WerkzeugResponse = client.post(
+            "/jobs/bulk", data=body, content_type="application/x-ndjson"
+        )
+
+        data: Dict[str, Any] = json.loads(response.data)
+        assert data["inserted"] == 1
+        assert [error["line"] for error in data["errors"]] == [1, 2, 3, 4]
+        assert {error["error"] for error in data["errors"][:3]} == {
+            "Company, position and status must be strings!"
+        }
+        assert data["errors"][3]["error"] == "Invalid status!"
+        assert self.count_jobs(client) == 1
+
+    def test_bulk_stops_at_invalid_utf8(self, client: FlaskClient) -> None:
+        """Test undecodable bytes end the import with an error instead of a 500."""
+        rows: str = "".join(f"Company {i},Engineer,Applied\n" for i in range(500))
+        body: bytes = (
+            b"company,position,status\n" + rows.encode() + b"\xff\xfe,Engineer,Applied\n"
+        )
+        client.application.config["IMPORT_BATCH_SIZE"] = 100
+
+        response: WerkzeugResponse = client.post("/jobs/bulk", data=body, content_type="text/csv")
+
+        assert response.status_code == 200
+        data: Dict[str, Any] = json.loads(response.data)
+        # Text is decoded in chunks, so the rows sharing a chunk with the bad
+        # bytes are not imported either.
+        assert 0 < data["inserted"] < 500
+        assert data["failed"] == 1
+        assert data["errors"][0]["line"] == data["inserted"] + 2
+        assert "Invalid UTF-8" in data["errors"][0]["error"]
+        assert self.count_jobs(client) == data["inserted"]
+
+    def test_bulk_import_uses_write_queue(self, client: FlaskClient) -> None:
+        """Test each import batch is committed by the writer thread when the queue is on."""
+        lines: str = "\n".join(
+            json.dumps({"company": f"Company {i}", "position": "Engineer", "status": "Applied"})
+            for i in range(7)
+        )
+        client.application.config.update(WRITE_QUEUE=True, IMPORT_BATCH_SIZE=3)
+        checkouts: List[bool] = []
+
+        @client.application.teardown_appcontext
+        def record_checkout(e: Optional[BaseException]) -> None:
+            checkouts.append("db" in app_module.g)
+
+        response: WerkzeugResponse = client.post(
+            "/jobs/bulk", data=lines, content_type="application/jsonl"
+        )
+
+        assert checkouts[0] is False  # the request never took a pooled connection
+        assert json.loads(response.data)["inserted"] == 7
+        assert client.application.extensions["metrics"].write_batches.count(()) == 3
+        assert self.count_jobs(client) == 7
+
+    def test_bulk_rejects_unknown_format(self, client: FlaskClient) -> None:
+        """Test an unrecognised body format is rejected."""
+        response: WerkzeugResponse = client.post(
+            "/jobs/bulk", data="company", content_type="text/plain"
+        )
+
+        assert response.status_code == 400
+
+    def test_import_jobs_cli(self, client: FlaskClient, tmp_path: Any) -> None:
+        """Test the import-jobs CLI command reads a CSV file."""
+        source = tmp_path / "jobs.csv"
+        source.write_text(
+            "company,position,status\nGoogle,Software Engineer,Applied\n", encoding="utf-8"
+        )
+
+        result = client.application.test_cli_runner().invoke(args=["import-jobs", str(source)])
+
+        assert "Imported 1 jobs, 0 failed." in result.output
+        assert self.count_jobs(client) == 1
+
+    def test_import_catches_up_on_skipped_triggers(self, app: Flask, client: FlaskClient) -> None:
+        """Test imported batches update everything the per-row insert triggers would."""
+        client.post("/add", data={"company": "Netflix", "position": "SRE", "status": "Declined"})
+        since: int = client.get("/changes").get_json()["seq"]
+        with app.app_context():
+            version: int = get_db().execute("SELECT version FROM db_version").fetchone()[0]
+        body: str = (
+            "company,position,status,created_at\n"
+            "Google,Software Engineer,Applied,2024-01-02 03:04:05\n"
+            "Amazon,Data Analyst,Ghosted,\n"
+            "Meta,Test Engineer,Declined,2024-01-02 09:00:00\n"
+            "Canva,Designer,Applied,2024-01-03 10:00:00\n"
+            "Atlassian,Engineer,Interviewed,\n"
+        )
+        app.config["IMPORT_BATCH_SIZE"] = 2
+        response: WerkzeugResponse = client.post("/jobs/bulk", data=body, content_type="text/csv")
+
+        assert response.get_json()["inserted"] == 4
+
+        assert client.get("/stats").get_json() == {
+            "All": 5,
+            "Applied": 2,
+            "Interviewed": 1,
+            "Accepted": 0,
+            "Declined": 2,
+        }
+        assert [job["company"] for job in client.get("/jobs?q=canva").get_json()["jobs"]] == [
+            "Canva"
+        ]
+        changes: List[Dict[str, Any]] = client.get(f"/changes?since={since}").get_json()["changes"]
+        assert sorted(change["id"] for change in changes) == [2, 3, 4, 5]
+        with app.app_context():
+            db = get_db(readonly=False)
+            assert db.execute("SELECT version FROM db_version").fetchone()[0] != version
+            assert {
+                row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            } >= set(BULK_SKIPPED_TRIGGERS)
+            # Raises if the search index disagrees with jobs.
+            db.execute("INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('integrity-check', 1)")
+            assert [
+                tuple(row)
+                for row in db.execute(
+                    "SELECT job_id, from_status, to_status FROM job_status_history ORDER BY id"
+                )
+            ] == [
+                (1, None, "Declined"),
+                (2, None, "Applied"),
+                (3, None, "Declined"),
+                (4, None, "Applied"),
+                (5, None, "Interviewed"),
+            ]
+            rollups = db.execute("SELECT * FROM job_transitions_daily ORDER BY 1, 2, 3").fetchall()
+        app.test_cli_runner().invoke(args=["rebuild-analytics"])
+        with app.app_context():
+            rebuilt = get_db().execute(
+                "SELECT * FROM job_transitions_daily ORDER BY 1, 2, 3"
+            ).fetchall()
+        assert [tuple(row) for row in rollups] == [tuple(row) for row in rebuilt]
+        assert ("2024-01-02", "", "Applied", 1) in [tuple(row) for row in rebuilt]
+
+
+class TestJobsApi:
+    """Test the JSON job list and its conditional GET support."""
+
+    def test_list_jobs_json(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test the JSON list honours status filtering and sorting."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+
+        response: WerkzeugResponse = client.get("/jobs?sort=company&order=desc")
+        data: Dict[str, Any] = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert [job["company"] for job in data["jobs"]] == ["Microsoft", "Google", "Amazon"]
+        assert data["next_cursor"] is None
+
+        response = client.get("/jobs?status=Applied")
+        data = json.loads(response.data)
+        assert [job["company"] for job in data["jobs"]] == ["Google"]
+
+    def test_get_job_json(self, client: FlaskClient) -> None:
+        """Test a single job is returned as JSON and unknown ids get 404."""
+        client.post(
+            "/add", data={"company": "Google", "position": "Engineer", "status": "Applied"}
+        )
+
+        response: WerkzeugResponse = client.get("/job/1")
+        data: Dict[str, Any] = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data["company"] == "Google"
+        assert data["status"] == "Applied"
+        assert client.get("/job/999").status_code == 404
+
+    def test_etag_not_modified_until_write(self, client: FlaskClient) -> None:
+        """Test a matching If-None-Match gets 304 until the jobs change."""
+        first: WerkzeugResponse = client.get("/jobs")
+        etag: Optional[str] = first.get_etag()[0]
+        assert etag
+
+        cached: WerkzeugResponse = client.get("/jobs", headers={"If-None-Match": f'"{etag}"'})
+        assert cached.status_code == 304
+        assert cached.data == b""
+
+        client.post(
+            "/add", data={"company": "Google", "position": "Engineer", "status": "Applied"}
+        )
+        changed: WerkzeugResponse = client.get("/jobs", headers={"If-None-Match": f'"{etag}"'})
+        assert changed.status_code == 200
+        assert changed.get_etag()[0] != etag
+
+
+class TestSearch:
+    """Test full-text search over company and position."""
+
+    def add_jobs(self, client: FlaskClient, jobs: List[Dict[str, str]]) -> None:
+        """Add jobs through the form."""
+        for job in jobs:
+            client.post("/add", data=job)
+
+    def search(self, client: FlaskClient, q: str, **params: str) -> List[str]:
+        """Return the companies matching a search through the JSON API."""
+        response: WerkzeugResponse = client.get("/jobs", query_string={"q": q, **params})
+        return [job["company"] for job in json.loads(response.data)["jobs"]]
+
+    def test_build_fts_query(self) -> None:
+        """Test user input is turned into prefix and phrase terms."""
+        assert build_fts_query('goo "data analyst"') == '"goo"* "data analyst"'
+        assert build_fts_query('AND "') is not None
+        assert build_fts_query("   ") is None
+        assert build_fts_query('c++ data-analyst "x\x00y"') == '"c"* "data analyst"* "x y"'
+        assert build_fts_query("\x00 ~") is None
+
+    def test_prefix_and_phrase_search(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test prefix and phrase searches match the expected jobs."""
+        self.add_jobs(client, sample_jobs)
+
+        assert self.search(client, "goo") == ["Google"]
+        assert self.search(client, "engineer") == ["Google"]
+        assert self.search(client, '"data analyst"') == ["Microsoft"]
+        assert self.search(client, '"analyst data"') == []
+        assert self.search(client, "dev", status="Applied") == []
+        assert self.search(client, "\x00") == ["Amazon", "Google", "Microsoft"]
+        assert client.get("/?q=goo%00").status_code == 200
+        assert client.get("/jobs/export?q=%00%22").status_code == 200
+
+    def test_search_ranks_company_matches_first(self, client: FlaskClient) -> None:
+        """Test relevance ordering, when asked for, prefers company matches."""
+        self.add_jobs(
+            client,
+            [
+                {"company": "Acme", "position": "Stripe Integrations", "status": "Applied"},
+                {"company": "Stripe", "position": "Engineer", "status": "Applied"},
+            ],
+        )
+
+        assert self.search(client, "stripe", sort="rank") == ["Stripe", "Acme"]
+        assert self.search(client, "stripe") == ["Acme", "Stripe"]
+        assert self.search(client, "stripe", sort="company") == ["Acme", "Stripe"]
+
+    def test_search_pages_in_id_order(self, client: FlaskClient) -> None:
+        """Test keyset pages of a search walk the matches forwards and backwards."""
+        self.add_jobs(
+            client,
+            [
+                {"company": company, "position": "Engineer", "status": "Applied"}
+                for company in ["Stripe", "Canva", "Atlassian"]
+            ],
+        )
+        first: Dict[str, Any] = client.get("/jobs?q=e&per_page=2").get_json()
+        second: Dict[str, Any] = client.get(
+            f"/jobs?q=e&per_page=2&after={first['next_cursor']}"
+        ).get_json()
+        back: Dict[str, Any] = client.get(
+            f"/jobs?q=e&per_page=2&before={second['prev_cursor']}"
+        ).get_json()
+
+        assert [job["id"] for job in first["jobs"] + second["jobs"]] == [1, 2, 3]
+        assert back["jobs"] == first["jobs"]
+
+    def test_search_follows_edits_and_deletes(self, client: FlaskClient) -> None:
+        """Test the search index is kept in sync by the triggers."""
+        self.add_jobs(
+            client, [{"company": "Google", "position": "Engineer", "status": "Applied"}]
+        )
+        client.post(
+            "/1/edit", data={"company": "Canva", "position": "Engineer", "status": "Applied"}
+        )
+        assert self.search(client, "google") == []
+        assert self.search(client, "canva") == ["Canva"]
+
+        client.post("/1/delete")
+        assert self.search(client, "canva") == []
+
+    def test_index_search_box(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test the index page filters by the q parameter."""
+        self.add_jobs(client, sample_jobs)
+
+        response: WerkzeugResponse = client.get("/?q=micro")
+
+        assert b"Microsoft" in response.data
+        assert b"Amazon" not in response.data
+
+
+class TestStatusCounts:
+    """Test the trigger-maintained status counters."""
+
+    def get_stats(self, client: FlaskClient) -> Dict[str, int]:
+        """Fetch the counters from the stats endpoint."""
+        return json.loads(client.get("/stats").data)
+
+    def test_counts_follow_writes(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test adding, updating and deleting jobs keeps the counts right."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        assert self.get_stats(client) == {
+            "Applied": 1,
+            "Interviewed": 1,
+            "Accepted": 0,
+            "Declined": 1,
+            "All": 3,
+        }
+
+        client.post("/update_status/2", json={"status": "Accepted"})
+        client.post("/3/delete")
+        stats: Dict[str, int] = self.get_stats(client)
+        assert stats["Applied"] == 0
+        assert stats["Accepted"] == 1
+        assert stats["Interviewed"] == 0
+        assert stats["All"] == 2
+
+    def test_index_shows_tab_counts(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test the status tabs show their counts."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+
+        response: WerkzeugResponse = client.get("/")
+
+        assert b'<span class="tag is-rounded ml-2">3</span>' in response.data
+
+    def test_rebuild_fixes_drift(self, client: FlaskClient) -> None:
+        """Test the rebuild command reports and repairs drifted counters."""
+        client.post(
+            "/add", data={"company": "Google", "position": "Engineer", "status": "Applied"}
+        )
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            db: sqlite3.Connection = get_db()
+            db.execute("UPDATE job_status_counts SET count = 7 WHERE status = 'Declined'")
+            db.commit()
+
+        result = client.application.test_cli_runner().invoke(args=["rebuild-status-counts"])
+
+        assert "Declined: stored 7, actual 0" in result.output
+        assert self.get_stats(client)["Declined"] == 0
+        assert self.get_stats(client)["Applied"] == 1
+
+
+class TestQueryPlans:
+    """Test every listing query shape is served by an index."""
+
+    def test_explain_queries_passes(self, client: FlaskClient) -> None:
+        """Test the explain-queries check finds no scans or temp sorts."""
+        result = client.application.test_cli_runner().invoke(args=["explain-queries"])
+
+        assert result.exit_code == 0, result.output
+        assert "All listing queries use an index." in result.output
+
+    def test_explain_queries_fails_without_index(self, client: FlaskClient) -> None:
+        """Test dropping a composite index makes the check fail."""
+        flask_app: Flask = client.application
+        with flask_app.app_context():
+            db: sqlite3.Connection = get_db()
+            db.execute("DROP INDEX idx_jobs_status_company")
+            db.commit()
+
+        result = client.application.test_cli_runner().invoke(args=["explain-queries"])
+
+        assert result.exit_code != 0
+        assert "sort=company" in result.output
+
+
+class TestMetrics:
+    """Test request and query instrumentation and the /metrics endpoint."""
+
+    def test_metrics_records_requests_and_queries(self, client: FlaskClient) -> None:
+        """Test requests, statements, commits and connections show up in /metrics."""
+        client.post(
+            "/add", data={"company": "Google", "position": "Engineer", "status": "Applied"}
+        )
+        client.get("/job/1")
+
+        response: WerkzeugResponse = client.get("/metrics")
+        body: str = response.data.decode()
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert (
+            'jobtracker_request_duration_seconds_count{endpoint="jobs.get_job",method="GET",status="200"}'
+            in body
+        )
+        assert 'jobtracker_query_duration_seconds_count{kind="INSERT"}' in body
+        assert "jobtracker_db_commit_seconds_count" in body
+        assert 'jobtracker_db_connect_seconds_count{readonly="true"}' in body
+
+    def test_request_query_count(self, client: FlaskClient) -> None:
+        """Test statements are attributed to the endpoint that ran them."""
+        metrics: Metrics = client.application.extensions["metrics"]
+        labels = (("endpoint", "jobs.get_job"),)
+        before: float = metrics.request_queries.value(labels)
+
+        client.get("/job/999")
+
+        assert metrics.request_queries.value(labels) - before == 1
+
+    def test_slow_query_logged(
+        self, client: FlaskClient, caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test statements over the threshold are logged and counted."""
+        metrics: Metrics = client.application.extensions["metrics"]
+        monkeypatch.setattr(metrics, "slow_query_ms", 1e-9)
+        before: float = metrics.slow_queries.value((("kind", "SELECT"),))
+
+        with caplog.at_level("WARNING", logger="metrics"):
+            client.get("/stats")
+
+        assert metrics.slow_queries.value((("kind", "SELECT"),)) > before
+        assert "Slow query" in caplog.text
+        assert "in jobs.stats: SELECT status, count FROM job_status_counts" in caplog.text
+
+    def test_executemany_slow_check_is_per_row(
+        self, client: FlaskClient, caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a batch is compared against the threshold by its average time per row."""
+        metrics: Metrics = client.application.extensions["metrics"]
+        labels = (("kind", "INSERT"),)
+        sql = "INSERT INTO jobs (company, position, status) VALUES (?, ?, ?)"
+        monkeypatch.setattr(metrics, "slow_query_ms", 100)
+        slow_before: float = metrics.slow_queries.value(labels)
+        count_before: int = metrics.queries.count(labels)
+
+        with caplog.at_level("WARNING", logger="metrics"):
+            metrics.observe_query(sql, 1.0, rows=20)
+            assert metrics.slow_queries.value(labels) == slow_before
+            assert "Slow query" not in caplog.text
+
+            metrics.observe_query(sql, 1.0, rows=5)
+        assert metrics.slow_queries.value(labels) == slow_before + 1
+        assert "Slow query (200.0ms per row over 5 rows)" in caplog.text
+
+        with client.application.app_context():
+            db = get_db(readonly=False)
+            db.executemany(sql, (("Acme", f"Role {i}", "Applied") for i in range(20)))
+            db.rollback()
+        assert metrics.queries.count(labels) - count_before == 3
+
+class TestIndexCache:
+    """Test rendered index pages are cached and invalidated by writes."""
+
+    def cache_hits(self, client: FlaskClient) -> float:
+        """Return the number of index cache hits so far."""
+        metrics: Metrics = client.application.extensions["metrics"]
+        return metrics.cache_lookups.value((("cache", "index"), ("result", "hit")))
+
+    def test_repeat_request_served_from_cache(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test an unchanged page is rendered once and then served from the cache."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.get("/")  # consume the flashed message
+        first: WerkzeugResponse = client.get("/?sort=company")
+        hits: float = self.cache_hits(client)
+
+        second: WerkzeugResponse = client.get("/?sort=company")
+
+        assert self.cache_hits(client) == hits + 1
+        assert second.data == first.data
+        assert b"Microsoft" in second.data
+
+    def test_write_from_another_connection_invalidates(self, client: FlaskClient) -> None:
+        """Test a write made outside the app (e.g. another worker) is picked up."""
+        client.get("/")
+        hits: float = self.cache_hits(client)
+
+        db = sqlite3.connect(client.application.config["DATABASE"])
+        db.execute(
+            "INSERT INTO jobs (company, position, status) VALUES ('Netflix', 'SRE', 'Applied')"
+        )
+        db.commit()
+        db.close()
+        response: WerkzeugResponse = client.get("/")
+
+        assert self.cache_hits(client) == hits
+        assert b"Netflix" in response.data
+
+    def test_flashed_messages_bypass_cache(self, client: FlaskClient) -> None:
+        """Test a page showing a flash is neither served from nor stored in the cache."""
+        client.get("/")
+        client.post(
+            "/add", data={"company": "Google", "position": "Engineer", "status": "Applied"}
+        )
+
+        flashed: WerkzeugResponse = client.get("/")
+        after: WerkzeugResponse = client.get("/")
+
+        assert b"Job application added successfully!" in flashed.data
+        assert b"Job application added successfully!" not in after.data
+        assert b"Google" in after.data
+
+    def test_cache_bounded_by_total_size(
+        self, app: Flask, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test pages are evicted to stay under INDEX_CACHE_BYTES and oversized ones are skipped."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.get("/")  # consume the flashed message
+        statuses: List[str] = ["Applied", "Interviewed", "Declined"]
+        sizes: List[int] = [
+            len(client.get(f"/?status={status}").data.decode()) for status in statuses
+        ]
+        cache = LRUCache(128, maxbytes=sizes[1] + sizes[2], sizeof=lambda entry: len(entry[1]))
+        app.extensions["index_cache"] = cache
+
+        for status in statuses:
+            client.get(f"/?status={status}")
+
+        assert len(cache) == 2 and cache.currbytes == sizes[1] + sizes[2]
+        cache.maxbytes = sizes[0] - 1
+        cache.clear()
+        client.get("/?status=Applied")
+        assert len(cache) == 0
+
+
+class TestRowCache:
+    """Test rendered index rows are reused until the row changes."""
+
+    def row_hits(self, client: FlaskClient) -> float:
+        """Return the number of row cache hits so far."""
+        metrics: Metrics = client.application.extensions["metrics"]
+        return metrics.cache_lookups.value((("cache", "row"), ("result", "hit")))
+
+    def test_unchanged_rows_reused_after_write(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test a write re-renders only the row it changed."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.get("/")  # consume the flashed message
+        client.get("/?status=All")
+        hits: float = self.row_hits(client)
+
+        client.post("/update_status/2", json={"status": "Interviewed"})
+        response: WerkzeugResponse = client.get("/?status=All")
+
+        assert self.row_hits(client) == hits + 2
+        assert b'data-job-id="2" data-status="Interviewed"' in response.data
+
+    def test_change_within_same_second_rerenders(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test a change that keeps last_modified still shows the new values."""
+        client.post("/add", data=sample_jobs[1])
+        client.get("/")
+        client.get("/?status=All")
+
+        db = sqlite3.connect(client.application.config["DATABASE"])
+        db.execute("UPDATE jobs SET company = 'Alphabet', last_modified = last_modified")
+        db.commit()
+        db.close()
+        response: WerkzeugResponse = client.get("/?status=All")
+
+        assert b"Alphabet" in response.data
+        assert b"Google" not in response.data
+
+    def test_rows_evicted_mid_page_keep_their_time(self, app: Flask, client: FlaskClient) -> None:
+        """Test a row evicted after the page checked the cache still shows its time."""
+        app.config["INDEX_CACHE_SIZE"] = 0
+        app.extensions["row_cache"] = LRUCache(3)
+        for i in range(4):
+            client.post("/add", data={"company": f"C{i}", "position": "SRE", "status": "Applied"})
+        with app.app_context():
+            db = get_db(readonly=False)
+            db.execute("UPDATE jobs SET last_modified = datetime('now', -id || ' minutes')")
+            db.commit()
+        client.get("/?status=All")
+
+        page: str = client.get("/?status=All").data.decode()
+        times: List[str] = re.findall(r"</select>\s*</div>\s*</td>\s*<td>(.*?)</td>", page)
+
+        assert len(times) == 4
+        assert all(times)
+
+
+class TestCompression:
+    """Test response compression and fingerprinted static files."""
+
+    def test_large_html_and_json_gzipped(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test large enough responses are gzipped only for clients that accept it."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.get("/")
+
+        plain: WerkzeugResponse = client.get("/")
+        page: WerkzeugResponse = client.get("/", headers={"Accept-Encoding": "gzip"})
+        small: WerkzeugResponse = client.get("/stats", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in plain.headers
+        assert page.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in page.headers["Vary"]
+        assert gzip.decompress(page.data) == plain.data
+        assert "Content-Encoding" not in small.headers
+
+    def test_compressed_json_keeps_conditional_get(self, client: FlaskClient) -> None:
+        """Test the weak ETag of a gzipped /jobs response still yields 304."""
+        client.post("/add", data={"company": "Google", "position": "SRE", "status": "Applied"})
+        client.application.config["COMPRESS_MIN_SIZE"] = 0
+        headers: Dict[str, str] = {"Accept-Encoding": "gzip"}
+
+        first: WerkzeugResponse = client.get("/jobs", headers=headers)
+        second: WerkzeugResponse = client.get(
+            "/jobs", headers={**headers, "If-None-Match": first.headers["ETag"]}
+        )
+
+        assert first.headers["Content-Encoding"] == "gzip"
+        assert first.headers["ETag"].startswith("W/")
+        assert second.status_code == 304
+
+    def test_static_urls_fingerprinted_and_immutable(self, client: FlaskClient) -> None:
+        """Test static URLs carry a content hash and are cached for good only with it."""
+        page: str = client.get("/").data.decode()
+        url: str = re.search(r'href="(/static/style\.css\?v=[0-9a-f]+)"', page).group(1)
+
+        versioned: WerkzeugResponse = client.get(url, headers={"Accept-Encoding": "gzip"})
+        plain: WerkzeugResponse = client.get("/static/style.css")
+
+        assert "immutable" in versioned.headers["Cache-Control"]
+        assert versioned.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(versioned.data) == plain.data
+        assert "immutable" not in plain.headers.get("Cache-Control", "")
+        versioned.close()
+        plain.close()
+
+
+class TestWriteQueue:
+    """Test writes funnelled through the group-committing writer thread."""
+
+    def submit_together(self, write_queue: WriteQueue, operations: List[Any]) -> List[Any]:
+        """Submit operations from one thread each and return their results or exceptions."""
+        outcomes: List[Any] = [None] * len(operations)
+
+        def submit(i: int) -> None:
+            try:
+                outcomes[i] = write_queue.submit(operations[i])
+            except Exception as e:
+                outcomes[i] = e
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(operations))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_failing_write_rolled_back_alone(self, app: Flask) -> None:
+        """Test one group commit applies the good writes and rolls back the failing one."""
+        def connect() -> sqlite3.Connection:
+            db = sqlite3.connect(app.config["DATABASE"], check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            return db
+
+        metrics = Metrics()
+        write_queue = WriteQueue(connect, batch_delay=0.5, metrics=metrics)
+
+        def failing(jobs: Any) -> None:
+            jobs.add("Netflix", "SRE", "Applied")
+            raise ValueError("rejected")
+
+        outcomes = self.submit_together(
+            write_queue,
+            [
+                lambda jobs: jobs.add("Google", "Engineer", "Applied"),
+                failing,
+                lambda jobs: jobs.add("Amazon", "Engineer", "Applied"),
+            ],
+        )
+        write_queue.close()
+
+        assert sum(isinstance(outcome, ValueError) for outcome in outcomes) == 1
+        assert sum(isinstance(outcome, int) for outcome in outcomes) == 2
+        assert metrics.write_batches.count(()) == 1
+        with app.app_context():
+            companies = [row[0] for row in get_db().execute("SELECT company FROM jobs")]
+        assert sorted(companies) == ["Amazon", "Google"]
+
+    def test_routes_write_through_queue(self, app: Flask, client: FlaskClient) -> None:
+        """Test concurrent status updates all succeed and missing jobs still 404."""
+        app.config.update(WRITE_QUEUE=True, DB_BUSY_TIMEOUT=10)
+        for i in range(20):
+            client.post("/add", data={"company": f"C{i}", "position": "SRE", "status": "Applied"})
+
+        def update(job_id: int) -> int:
+            with app.test_client() as own_client:
+                return own_client.post(
+                    f"/update_status/{job_id}", json={"status": "Interviewed"}
+                ).status_code
+
+        statuses: List[int] = [0] * 20
+        threads = [
+            threading.Thread(target=lambda i=i: statuses.__setitem__(i, update(i + 1)))
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert statuses == [200] * 20
+        assert client.get("/stats").get_json()["Interviewed"] == 20
+        assert client.post("/update_status/999", json={"status": "Applied"}).status_code == 404
+
+    def test_evicted_queue_drains_and_writes_move_on(
+        self, app: Flask, client: FlaskClient, monkeypatch: pytest.MonkeyPatch, tmp_path: Any
+    ) -> None:
+        """Test eviction commits queued writes and a write racing it is not refused."""
+        app.config.update(WRITE_QUEUE=True, DB_MAX_POOLS=1)
+        database = app.config["DATABASE"]
+        stale = get_write_queue(app, database)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(jobs: Any) -> int:
+            started.set()
+            release.wait(5)
+            return jobs.add("Google", "SRE", "Applied")
+
+        outcomes: List[Any] = []
+        writer = threading.Thread(target=lambda: outcomes.append(stale.submit(blocking)))
+        writer.start()
+        started.wait(5)
+        evicting = threading.Thread(target=get_write_queue, args=(app, str(tmp_path / "other.db")))
+        evicting.start()
+        while not stale.closed:
+            threading.Event().wait(0.001)
+        release.set()
+        writer.join()
+        evicting.join()
+
+        assert outcomes == [1]
+        with pytest.raises(WriteQueueClosed):
+            stale.submit(lambda jobs: None)
+        # A request that looked the queue up just before it was evicted.
+        lookups = [stale]
+        real_get_write_queue = write_queue_module.get_write_queue
+        monkeypatch.setattr(
+            write_queue_module,
+            "get_write_queue",
+            lambda app, database: lookups.pop() if lookups else real_get_write_queue(app, database),
+        )
+        response: WerkzeugResponse = client.post(
+            "/add", data={"company": "Amazon", "position": "SRE", "status": "Applied"}
+        )
+        assert response.status_code == 302
+        assert client.get("/stats").get_json()["Applied"] == 2
+
+    def test_full_queue_answers_503(self, app: Flask, client: FlaskClient) -> None:
+        """Test a write that finds the queue full is refused with Retry-After."""
+        app.config.update(WRITE_QUEUE=True, WRITE_QUEUE_SIZE=1)
+        client.post("/add", data={"company": "Google", "position": "SRE", "status": "Applied"})
+        with app.app_context():
+            write_queue = app.extensions["write_queues"][app.config["DATABASE"]]
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(jobs: Any) -> None:
+            started.set()
+            release.wait(5)
+
+        blocker = threading.Thread(target=write_queue.submit, args=(blocking,))
+        blocker.start()
+        started.wait(5)
+        waiting = threading.Thread(target=write_queue.submit, args=(lambda jobs: None,))
+        waiting.start()
+        while write_queue._queue.qsize() < 1:
+            threading.Event().wait(0.001)
+
+        response: WerkzeugResponse = client.post("/update_status/1", json={"status": "Declined"})
+        release.set()
+        blocker.join()
+        waiting.join()
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert client.post("/update_status/1", json={"status": "Declined"}).status_code == 200
+
+
+class TestExport:
+    """Test streaming CSV and NDJSON exports."""
+
+    def test_export_csv(self, client: FlaskClient, sample_jobs: List[Dict[str, str]]) -> None:
+        """Test the CSV export has a header, created_at and honours sorting."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+
+        response: WerkzeugResponse = client.get("/jobs/export?sort=company&order=desc")
+        lines: List[str] = response.data.decode().splitlines()
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        assert "attachment" in response.headers["Content-Disposition"]
+        assert lines[0] == "id,company,position,status,created_at,last_modified"
+        assert [line.split(",")[1] for line in lines[1:]] == ["Microsoft", "Google", "Amazon"]
+
+    def test_export_ndjson_filtered(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test the NDJSON export honours status and search filters."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+
+        response: WerkzeugResponse = client.get("/jobs/export?format=ndjson&q=goo")
+        records: List[Dict[str, Any]] = [
+            json.loads(line) for line in response.data.decode().splitlines()
+        ]
+
+        assert response.mimetype == "application/x-ndjson"
+        assert [record["company"] for record in records] == ["Google"]
+        assert records[0]["created_at"]
+        assert "rank" not in records[0]
+
+        response = client.get("/jobs/export?format=ndjson&status=Declined")
+        assert [json.loads(line)["company"] for line in response.data.decode().splitlines()] == [
+            "Amazon"
+        ]
+        assert client.get("/jobs/export?format=xml").status_code == 400
+
+    def test_export_cli(self, client: FlaskClient, sample_jobs: List[Dict[str, str]]) -> None:
+        """Test the export-jobs command writes the same data as the endpoint."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+
+        result = client.application.test_cli_runner().invoke(args=["export-jobs", "--format", "ndjson"])
+
+        assert result.exit_code == 0, result.output
+        assert result.output == client.get("/jobs/export?format=ndjson").data.decode()
+
+
+class TestChangeFeed:
+    """Test the compacted change feed behind GET /changes."""
+
+    def test_changes_are_compacted_with_tombstones(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test each job appears once with its latest state and deletes leave tombstones."""
+        since: int = client.get("/changes").get_json()["seq"]
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.post("/update_status/1", json={"status": "Accepted"})
+        client.post("/update_status/1", json={"status": "Interviewed"})
+        client.post("/2/delete")
+
+        data: Dict[str, Any] = client.get(f"/changes?since={since}&html=1").get_json()
+        changes: List[Dict[str, Any]] = data["changes"]
+
+        assert [change["id"] for change in changes] == [3, 1, 2]
+        assert changes[1]["job"]["status"] == "Interviewed"
+        assert 'id="job-1"' in changes[1]["html"]
+        assert changes[2]["deleted"] is True
+        assert changes[2]["job"] is None
+        assert data["seq"] == changes[-1]["seq"]
+        assert client.get(f"/changes?since={data['seq']}").get_json()["changes"] == []
+
+    def test_stale_client_must_reload(
+        self, app: Flask, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test a client behind the tombstone horizon, or ahead of the log, gets 410."""
+        with app.app_context():
+            db = get_db(readonly=False)
+            db.execute("UPDATE job_changes_horizon SET retention = 2")
+            db.commit()
+        since: int = client.get("/changes").get_json()["seq"]
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        for job_id in (1, 2, 3):
+            client.post(f"/{job_id}/delete")
+
+        assert client.get(f"/changes?since={since}").status_code == 410
+        latest: int = client.get("/changes").get_json()["seq"]
+        assert client.get(f"/changes?since={latest - 1}").status_code == 200
+        assert client.get(f"/changes?since={latest + 1}").status_code == 410
+
+    def test_long_poll_times_out_empty(self, client: FlaskClient) -> None:
+        """Test a long poll with nothing new returns an empty list after waiting."""
+        client.application.config["CHANGES_MAX_WAIT"] = 0.3
+        since: int = client.get("/changes").get_json()["seq"]
+
+        data: Dict[str, Any] = client.get(f"/changes?since={since}&wait=10").get_json()
+
+        assert data == {"changes": [], "seq": since, "more": False}
+
+    def test_index_exposes_change_seq(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test the index page embeds the feed position and row ids to patch."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.get("/")  # consume the flashed message
+        seq: int = client.get("/changes").get_json()["seq"]
+
+        response: WerkzeugResponse = client.get("/")
+
+        assert f'data-changes-seq="{seq}"'.encode() in response.data
+        assert b'id="job-2"' in response.data
+
+
+class TestAnalytics:
+    """Test the status history and the analytics rollups built from it."""
+
+    def test_status_changes_are_recorded(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test every status change, and only status changes, lands in the history."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.post("/update_status/2", json={"status": "Interviewed"})
+        client.post(
+            "/2/edit", data={"company": "Google", "position": "SRE", "status": "Interviewed"}
+        )
+        client.post(
+            "/2/edit", data={"company": "Google", "position": "SRE", "status": "Accepted"}
+        )
+
+        with client.application.app_context():
+            history = get_db().execute(
+                "SELECT from_status, to_status FROM job_status_history WHERE job_id = 2 ORDER BY id"
+            ).fetchall()
+        data: Dict[str, Any] = client.get("/analytics").get_json()
+
+        assert [tuple(row) for row in history] == [
+            (None, "Applied"),
+            ("Applied", "Interviewed"),
+            ("Interviewed", "Accepted"),
+        ]
+        totals: Dict[Any, int] = {}
+        for transition in data["transitions"]:
+            key = (transition["from"], transition["to"])
+            totals[key] = totals.get(key, 0) + transition["count"]
+        assert totals == {
+            (None, "Applied"): 1,
+            (None, "Declined"): 1,
+            (None, "Interviewed"): 1,
+            ("Applied", "Interviewed"): 1,
+            ("Interviewed", "Accepted"): 1,
+        }
+
+    def test_time_in_stage_percentiles(self, app: Flask, client: FlaskClient) -> None:
+        """Test time-in-stage percentiles come from the day histogram."""
+        with app.app_context():
+            db = get_db(readonly=False)
+            db.executemany(
+                "INSERT INTO job_status_history"
+                " (job_id, from_status, to_status, changed_at, stage_seconds)"
+                " VALUES (?, 'Applied', 'Interviewed', CURRENT_TIMESTAMP, ?)",
+                [(job_id, days * 86400 + 60) for job_id, days in enumerate(range(1, 11))],
+            )
+            db.commit()
+
+        data: Dict[str, Any] = client.get("/analytics").get_json()
+
+        assert data["time_in_stage"] == [
+            {
+                "from": "Applied",
+                "to": "Interviewed",
+                "count": 10,
+                "p50_days": 5,
+                "p90_days": 9,
+                "p95_days": 10,
+            }
+        ]
+        assert client.get("/analytics?days=0").status_code == 400
+
+    def test_rebuild_matches_triggers(
+        self, app: Flask, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test rebuilding the rollups from the history reproduces them exactly."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.post("/update_status/1", json={"status": "Applied"})
+        client.post("/update_status/2", json={"status": "Declined"})
+        before: Dict[str, Any] = client.get("/analytics").get_json()
+
+        result = app.test_cli_runner().invoke(args=["rebuild-analytics"])
+
+        assert result.exit_code == 0, result.output
+        assert client.get("/analytics").get_json() == before
+
+
+class TestQueryBudget:
+    """Test each write route stays within its budget of SQL statements."""
+
+    def statements(
+        self, client: FlaskClient, endpoint: str, method: str, url: str, **kwargs: Any
+    ) -> float:
+        """Return the number of statements ``endpoint`` ran to answer one request."""
+        metrics: Metrics = client.application.extensions["metrics"]
+        labels = (("endpoint", endpoint),)
+        before: float = metrics.request_queries.value(labels)
+        client.open(url, method=method, **kwargs)
+        return metrics.request_queries.value(labels) - before
+
+    def test_write_routes_use_one_statement(
+        self, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test adding, editing, updating and deleting a job each take a single statement."""
+        edit: Dict[str, str] = {"company": "Google", "position": "SRE", "status": "Accepted"}
+        budgets = [
+            ("jobs.add_job", "POST", "/add", {"data": sample_jobs[0]}),
+            ("jobs.add_job", "POST", "/add", {"data": sample_jobs[1]}),
+            ("jobs.edit_job", "POST", "/2/edit", {"data": edit}),
+            ("jobs.update_status", "POST", "/update_status/2", {"json": {"status": "Declined"}}),
+            (
+                "jobs.update_status_batch",
+                "POST",
+                "/update_status/batch",
+                {"json": [{"id": 1, "status": "Interviewed"}, {"id": 2, "status": "Applied"}]},
+            ),
+            ("jobs.get_job", "GET", "/job/2", {}),
+            ("jobs.delete_job", "POST", "/1/delete", {}),
+        ]
+        for endpoint, method, url, kwargs in budgets:
+            assert self.statements(client, endpoint, method, url, **kwargs) == 1, url
+
+    def test_missing_job_detected_by_the_write(self, client: FlaskClient) -> None:
+        """Test writes to a missing job return 404 without a separate existence check."""
+        assert self.statements(client, "jobs.delete_job", "POST", "/999/delete") == 1
+        assert (
+            self.statements(
+                client, "jobs.update_status", "POST", "/update_status/999", json={"status": "Applied"}
+            )
+            == 1
+        )
+        assert client.post("/999/delete").status_code == 404
+        assert client.post("/update_status/999", json={"status": "Applied"}).status_code == 404
+        edit: Dict[str, str] = {"company": "Google", "position": "SRE", "status": "Accepted"}
+        assert client.post("/999/edit", data=edit).status_code == 404
+
+
+class TestTenants:
+    """Test multi-tenant mode with one database per tenant."""
+
+    def provision(self, app: Flask, tenant: str, *args: str) -> str:
+        """Create a tenant with the CLI and return its access key."""
+        result = app.test_cli_runner().invoke(args=["create-tenant", tenant, *args])
+        assert result.exit_code == 0, result.output
+        return result.output.split()[-1]
+
+    def login(self, app: Flask, tenant: str, key: str) -> FlaskClient:
+        """Return a client logged in to ``tenant``."""
+        tenant_client: FlaskClient = app.test_client()
+        response = tenant_client.post("/login", json={"tenant": tenant, "key": key})
+        assert response.status_code == 200
+        return tenant_client
+
+    def test_tenants_are_isolated(self, app: Flask, tmp_path: Any) -> None:
+        """Test each provisioned tenant reads and writes only its own database."""
+        app.config["TENANT_DB_DIR"] = str(tmp_path)
+        alice = self.login(app, "alice", self.provision(app, "alice"))
+        bob = self.login(app, "bob", self.provision(app, "bob"))
+
+        alice.post("/add", data={"company": "Google", "position": "Engineer", "status": "Applied"})
+
+        assert [job["company"] for job in alice.get("/jobs").get_json()["jobs"]] == ["Google"]
+        assert bob.get("/jobs").get_json()["jobs"] == []
+        assert bob.get("/stats").get_json()["All"] == 0
+        assert b"Log out of alice" in alice.get("/").data
+
+    def test_requests_need_a_session(self, app: Flask, client: FlaskClient, tmp_path: Any) -> None:
+        """Test requests without a valid tenant session are refused and create nothing."""
+        app.config["TENANT_DB_DIR"] = str(tmp_path)
+        key: str = self.provision(app, "alice")
+
+        assert client.get("/jobs", headers={"X-Tenant-ID": "alice"}).status_code == 401
+        assert client.get("/", headers={"Accept": "text/html"}).location.endswith("/login")
+        assert client.post("/login", json={"tenant": "alice", "key": "guess"}).status_code == 401
+        assert client.post("/login", json={"tenant": "mallory", "key": key}).status_code == 401
+        assert client.get("/metrics").status_code == 200
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["alice.db", "alice.key"]
+
+    def test_rotating_key_ends_sessions(self, app: Flask, tmp_path: Any) -> None:
+        """Test a new key signs out sessions opened with the old one."""
+        app.config["TENANT_DB_DIR"] = str(tmp_path)
+        alice = self.login(app, "alice", self.provision(app, "alice"))
+
+        new_key: str = self.provision(app, "alice", "--rotate-key")
+
+        assert alice.get("/jobs").status_code == 401
+        assert self.login(app, "alice", new_key).get("/jobs").status_code == 200
+
+    def test_open_pools_are_bounded(self, app: Flask, tmp_path: Any) -> None:
+        """Test the least recently used tenant pools are closed beyond DB_MAX_POOLS."""
+        app.config["TENANT_DB_DIR"] = str(tmp_path)
+        app.config["DB_MAX_POOLS"] = 2
+        clients: Dict[str, FlaskClient] = {
+            tenant: self.login(app, tenant, self.provision(app, tenant))
+            for tenant in ("alice", "bob", "carol", "dave")
+        }
+        clients["alice"].post(
+            "/add", data={"company": "Google", "position": "Engineer", "status": "Applied"}
+        )
+        alice_pool = app.extensions["db_pools"][(str(tmp_path / "alice.db"), False)]
+        for tenant in ("bob", "carol", "dave"):
+            clients[tenant].get("/stats")
+
+        assert len(app.extensions["db_pools"]) == 2
+        assert alice_pool.closed
+        assert clients["alice"].get("/stats").get_json()["All"] == 1
+
+
+class TestReadModel:
+    """Test the in-memory read model answers listings exactly like SQL."""
+
+    def walk(
+        self, app: Flask, read_model: bool, status: str, sort_by: str, order: str
+    ) -> List[Any]:
+        """Return every page of a listing, forwards and then one page back."""
+        app.config["READ_MODEL"] = read_model
+        pages: List[Any] = []
+        with app.test_request_context("/"):
+            jobs, next_cursor, prev_cursor = get_jobs_page(status, sort_by, order, per_page=2)
+            pages.append([dict(job) for job in jobs])
+            while next_cursor:
+                jobs, next_cursor, prev_cursor = get_jobs_page(
+                    status, sort_by, order, after=next_cursor, per_page=2
+                )
+                pages.append([dict(job) for job in jobs])
+            if prev_cursor:
+                jobs, _, _ = get_jobs_page(status, sort_by, order, before=prev_cursor, per_page=2)
+                pages.append([dict(job) for job in jobs])
+        return pages
+
+    def test_pages_match_sql(self, app: Flask, client: FlaskClient) -> None:
+        """Test every filter, sort and order pages identically with and without the model."""
+        for company, status in [
+            ("Google", "Applied"),
+            ("Amazon", "Declined"),
+            ("Google", "Interviewed"),
+            ("apple", "Applied"),
+            ("Canva", "Applied"),
+        ]:
+            client.post("/add", data={"company": company, "position": "SWE", "status": status})
+
+        for status in ["All", "Applied"]:
+            for sort_by in ["id", "company", "status", "last_modified"]:
+                for order in ["asc", "desc"]:
+                    expected = self.walk(app, False, status, sort_by, order)
+                    assert self.walk(app, True, status, sort_by, order) == expected
+
+    def test_refreshes_incrementally(self, app: Flask, client: FlaskClient) -> None:
+        """Test writes from any connection are applied from the change log, not by reloading."""
+        app.config["READ_MODEL"] = True
+        for company in ["Google", "Amazon", "Canva"]:
+            client.post("/add", data={"company": company, "position": "SWE", "status": "Applied"})
+        client.get("/jobs")
+
+        db = sqlite3.connect(app.config["DATABASE"])
+        db.execute("UPDATE jobs SET company = 'Zendesk' WHERE id = 1")
+        db.execute("DELETE FROM jobs WHERE id = 2")
+        db.execute(
+            "INSERT INTO jobs (company, position, status) VALUES ('Atlassian', 'PM', 'Declined')"
+        )
+        db.commit()
+        db.close()
+        jobs: List[Dict[str, Any]] = client.get("/jobs?sort=company").get_json()["jobs"]
+
+        assert [job["company"] for job in jobs] == ["Atlassian", "Canva", "Zendesk"]
+        with app.app_context():
+            assert get_read_model().loads == 1
+
+    def test_refresh_reads_horizon_and_changes_together(
+        self, app: Flask, client: FlaskClient
+    ) -> None:
+        """Test a prune committed between the horizon check and the change read loses nothing."""
+        app.config["READ_MODEL"] = True
+        for company in ["Google", "Amazon", "Canva"]:
+            client.post("/add", data={"company": company, "position": "SWE", "status": "Applied"})
+        client.get("/jobs")
+        writer = sqlite3.connect(app.config["DATABASE"], isolation_level=None)
+        writer.execute("UPDATE job_changes_horizon SET retention = 1")
+        writer.execute("DELETE FROM jobs WHERE id = 1")
+
+        class Interleaved(sqlite3.Connection):
+            """Delete another job, pruning the first tombstone, right after the horizon check."""
+
+            def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+                cursor = super().execute(sql, parameters)
+                if "FROM job_changes_horizon" in sql:
+                    writer.execute("DELETE FROM jobs WHERE id = 2")
+                return cursor
+
+        with app.app_context():
+            model = get_read_model()
+            model.close()
+            model._db = sqlite3.connect(
+                f"file:{app.config['DATABASE']}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                factory=Interleaved,
+            )
+            model._data_version = None
+            model.refresh()  # sees the first delete; the second commits meanwhile
+            jobs: List[Dict[str, Any]] = model.page(None, "id", "asc")
+            model.close()
+        writer.close()
+
+        assert model.loads == 1
+        assert [job["company"] for job in jobs] == ["Canva"]
+
+    def test_reloads_after_reinit(self, app: Flask, client: FlaskClient) -> None:
+        """Test a re-initialised database is detected and loaded from scratch."""
+        app.config["READ_MODEL"] = True
+        client.post("/add", data={"company": "Google", "position": "SWE", "status": "Applied"})
+        client.get("/jobs")
+
+        app.test_cli_runner().invoke(args=["init-db"])
+
+        assert client.get("/jobs").get_json()["jobs"] == []
+        with app.app_context():
+            assert get_read_model().loads == 2
+
+
+class TestArchive:
+    """Test archiving closed jobs and database maintenance."""
+
+    def archive(
+        self, app: Flask, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> Any:
+        """Add the sample jobs, age all but Google's and archive the closed ones."""
+        for job in sample_jobs:
+            client.post("/add", data=job)
+        client.post("/add", data={"company": "Canva", "position": "SRE", "status": "Accepted"})
+        with app.app_context():
+            db = get_db(readonly=False)
+            db.execute(
+                "UPDATE jobs SET last_modified = datetime('now', '-90 days')"
+                " WHERE company != 'Canva'"
+            )
+            db.commit()
+        return app.test_cli_runner().invoke(
+            args=["archive-jobs", "--older-than", "30", "--batch-size", "1"]
+        )
+
+    def test_archive_moves_stale_closed_jobs(
+        self, app: Flask, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test only closed jobs older than the cutoff leave jobs, in batches."""
+        result = self.archive(app, client, sample_jobs)
+
+        assert result.exit_code == 0, result.output
+        assert "Archived 1 jobs." in result.output
+        jobs: List[Dict[str, Any]] = client.get("/jobs").get_json()["jobs"]
+        assert sorted(job["company"] for job in jobs) == ["Canva", "Google", "Microsoft"]
+        assert client.get("/stats").get_json()["Declined"] == 0
+        with app.app_context():
+            archived = get_db().execute(
+                "SELECT id, company, created_at FROM jobs_archive"
+            ).fetchall()
+        assert [(row["id"], row["company"]) for row in archived] == [(1, "Amazon")]
+        assert archived[0]["created_at"]
+
+    def test_include_archived(
+        self, app: Flask, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test listings and exports add the archive only when asked to."""
+        self.archive(app, client, sample_jobs)
+
+        jobs: List[Dict[str, Any]] = client.get(
+            "/jobs?include_archived=1&sort=company&per_page=2"
+        ).get_json()
+        following: Dict[str, Any] = client.get(
+            f"/jobs?include_archived=1&sort=company&per_page=2&after={jobs['next_cursor']}"
+        ).get_json()
+        export: str = client.get("/jobs/export?include_archived=1&status=Declined").data.decode()
+
+        assert [job["company"] for job in jobs["jobs"] + following["jobs"]] == [
+            "Amazon",
+            "Canva",
+            "Google",
+            "Microsoft",
+        ]
+        assert "Amazon" in export
+        assert "Amazon" not in client.get("/jobs/export?status=Declined").data.decode()
+        assert b"Amazon" in client.get("/?include_archived=1").data
+        assert b"Amazon" not in client.get("/").data
+
+    def test_archived_rows_are_read_only(
+        self, app: Flask, client: FlaskClient, sample_jobs: List[Dict[str, str]]
+    ) -> None:
+        """Test archived rows show a badge instead of controls that would 404."""
+        self.archive(app, client, sample_jobs)
+
+        for url in ["/?include_archived=1", "/?include_archived=1&stream=1"]:
+            page = client.get(url).data.decode()
+            archived = re.search(r'<tr id="job-1".*?</tr>', page, re.S).group(0)
+            current = re.search(r'<tr id="job-2".*?</tr>', page, re.S).group(0)
+            assert "Archived" in archived
+            assert "/1/edit" not in archived and "/1/delete" not in archived
+            assert "job-status-select" not in archived
+            assert "/2/edit" in current and "Archived" not in current
+        jobs = client.get("/jobs?include_archived=1").get_json()["jobs"]
+        assert {job["company"]: job["archived"] for job in jobs}["Amazon"] == 1
+
+    def test_maintain_db(self, app: Flask) -> None:
+        """Test the maintenance command runs and incremental vacuum is enabled by init-db."""
+        result = app.test_cli_runner().invoke(args=["maintain-db"])
+
+        assert result.exit_code == 0, result.output
+        assert "Freed" in result.output
+        with app.app_context():
+            assert get_db(readonly=False).execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def test_maintain_never_reports_negative_savings(self, app: Flask) -> None:
+        """Test pages added by ANALYZE to a fresh database do not count as freed."""
+        with app.app_context():
+            db = get_db(readonly=False)
+            before = db.execute("PRAGMA page_count").fetchone()[0]
+            result = maintain(db)
+
+            assert db.execute("PRAGMA page_count").fetchone()[0] > before
+        assert result["freed_bytes"] == 0
+
+
 if __name__ == "__main__":
     pytest.main(["-v", "--tb=short", __file__])
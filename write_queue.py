@@ -0,0 +1,208 @@
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from flask import Flask
+
+from db import get_pool
+from repository import JobRepository
+
+Operation = Callable[[JobRepository], Any]
+
+
+class WriteQueueFull(Exception):
+    """Raised when a write cannot be queued; the client should retry later."""
+
+
+class WriteQueueClosed(Exception):
+    """Raised by ``submit`` on a queue that has been closed, e.g. after eviction."""
+
+
+class WriteQueue:
+    """Applies writes to one database from a single thread, committing them in groups.
+
+    Requests hand their write to ``submit`` as a function of a
+    ``JobRepository`` and wait for its result. The writer thread takes up to
+    ``batch_size`` queued writes, waiting at most ``batch_delay`` seconds for
+    more after the first, and runs them in one ``BEGIN IMMEDIATE``
+    transaction, each inside a savepoint so a failing write is rolled back
+    without its neighbours. Only this thread ever asks for the write lock, so
+    requests no longer race for it, and one commit (one WAL sync) covers the
+    whole group. When ``maxsize`` writes are already waiting, ``submit``
+    raises ``WriteQueueFull`` instead of queueing more.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        maxsize: int = 1000,
+        batch_size: int = 100,
+        batch_delay: float = 0.002,
+        metrics: Optional[Any] = None,
+    ) -> None:
+        self.batch_size = max(batch_size, 1)
+        self.batch_delay = batch_delay
+        self.metrics = metrics
+        self.closed = False
+        # Opened here rather than by the writer, so a failure reaches the caller.
+        self._db = connect()
+        # Guards ``closed``, so nothing is queued behind the stop marker.
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[Optional[tuple[Operation, Future]]] = queue.Queue(
+            maxsize=max(maxsize, 1)
+        )
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Operation) -> Any:
+        """Queue ``operation``, wait until its group is committed and return its result.
+
+        An exception raised by the operation, or by the commit, is re-raised here.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self.closed:
+                raise WriteQueueClosed("The write queue is closed")
+            try:
+                self._queue.put_nowait((operation, future))
+            except queue.Full:
+                if self.metrics is not None:
+                    self.metrics.observe_write_rejected()
+                raise WriteQueueFull("Too many writes are waiting") from None
+        return future.result()
+
+    def close(self) -> None:
+        """Stop the writer once the writes already queued are committed."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def _take_batch(self) -> tuple[list[tuple[Operation, Future]], bool]:
+        """Block for one write, then gather more until the batch is full or the delay is up.
+
+        Also returns whether the queue was closed.
+        """
+        item = self._queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.batch_delay
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        db = self._db
+        repository = JobRepository(db)
+        try:
+            closed = False
+            while not closed:
+                batch, closed = self._take_batch()
+                if batch:
+                    self._apply(db, repository, batch)
+        finally:
+            db.close()
+
+    def _apply(
+        self,
+        db: sqlite3.Connection,
+        repository: JobRepository,
+        batch: list[tuple[Operation, Future]],
+    ) -> None:
+        """Run a batch in one transaction and hand every caller its outcome."""
+        outcomes: list[tuple[bool, Any]] = []
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            for operation, _ in batch:
+                db.execute("SAVEPOINT write")
+                try:
+                    outcomes.append((True, operation(repository)))
+                except Exception as e:
+                    db.execute("ROLLBACK TO write")
+                    outcomes.append((False, e))
+                db.execute("RELEASE write")
+            db.commit()
+        except Exception as e:
+            # Nothing in the batch was committed, so every caller sees the error.
+            if db.in_transaction:
+                db.rollback()
+            outcomes = [(False, e)] * len(batch)
+        if self.metrics is not None:
+            self.metrics.observe_write_batch(len(batch))
+        for (_, future), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(app: Flask, database: str) -> WriteQueue:
+    """Return the app's write queue for ``database``, starting it on first use.
+
+    Like connection pools, at most ``DB_MAX_POOLS`` queues are kept; the
+    least recently used is closed to make room, after committing the writes
+    already queued on it.
+    """
+    queues: OrderedDict[str, WriteQueue] = app.extensions.setdefault(
+        "write_queues", OrderedDict()
+    )
+    with _queues_lock:
+        write_queue = queues.get(database)
+        if write_queue is not None and not write_queue.closed:
+            queues.move_to_end(database)
+            return write_queue
+        pool = get_pool(app, database, readonly=False)
+        write_queue = WriteQueue(
+            pool.connect,
+            maxsize=app.config["WRITE_QUEUE_SIZE"],
+            batch_size=app.config["WRITE_BATCH_SIZE"],
+            batch_delay=app.config["WRITE_BATCH_DELAY_MS"] / 1000,
+            metrics=app.extensions.get("metrics"),
+        )
+        queues[database] = write_queue
+        evicted = []
+        while len(queues) > max(app.config["DB_MAX_POOLS"], 1):
+            evicted.append(queues.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return write_queue
+
+
+def submit_write(app: Flask, database: str, operation: Operation) -> Any:
+    """Apply ``operation`` through the write queue of ``database`` and return its result.
+
+    A queue can be evicted between being looked up and being submitted to.
+    It has drained by then, so the write moves on to the database's new queue
+    instead of being refused.
+    """
+    while True:
+        try:
+            return get_write_queue(app, database).submit(operation)
+        except WriteQueueClosed:
+            continue
+
+
+def close_write_queues(app: Flask) -> None:
+    """Stop every write queue of the app after it drains."""
+    queues: OrderedDict[str, WriteQueue] = app.extensions.get("write_queues", OrderedDict())
+    with _queues_lock:
+        closing = list(queues.values())
+        queues.clear()
+    for write_queue in closing:
+        write_queue.close()